@@ -16,12 +16,19 @@ setup(
         "pytest>=8.3.2",
         "selenium>=4.25.0",
         "requests>=2.32.3",
+        "httpx>=0.28.1",
         "beautifulsoup4>=4.12.3",
         "plotly>=5.0.0",
         "ipywidgets>=8.0.0",
         "nest-asyncio>=1.5.0",
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=14.0.0",
+        ],
+        "zstd": [
+            "zstandard>=0.22.0",
+        ],
         "dev": [
             "pytest",
             "black",
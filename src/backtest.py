@@ -0,0 +1,258 @@
+"""
+Backtests the arb strategy over every recorded market in parallel: each
+market events file is replayed in a worker process through the real
+OrderBookStore and calculate_orders, and the results are aggregated into
+one report.
+
+With --latency-ms, the orders of each opportunity are also run through a
+FillSimulator, which reports the edge they would actually have realized.
+
+Nothing is written back to data/ besides the message cache of each file,
+which later backtests replay from; the report is printed, and optionally
+saved as JSON.
+
+Usage:
+    make backtest
+    python -m src.backtest --workers 4 --json backtest.json
+    python -m src.backtest --latency-ms 250
+    python -m src.backtest '20250701'
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple
+from src.main import parse_market_events
+from src.models import OrderBookStore
+from src.fill_simulator import FillSimulator, FillStats, order_pnl, order_key
+from src.strategies import calculate_orders
+from src.replay import DATA_DIR, EVENTS_SUFFIX, find_event_files, market_book_store
+from src.utils import CSVMessageProcessor, VirtualClock, set_clock, get_clock
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BacktestResult:
+    csv_file_path: str
+    market_slug: str
+    worker: int
+    """PID of the worker process the file was replayed in"""
+    message_groups: int = 0
+    events: int = 0
+    errors: int = 0
+    """Message groups that could not be applied to the books"""
+    opportunities: int = 0
+    """Book updates that produced a new, different set of arb orders"""
+    orders: int = 0
+    pnl: float = 0.0
+    """Theoretical profit of the orders of every opportunity, had each pair filled"""
+    seconds: float = 0.0
+    skipped: Optional[str] = None
+    fills: Optional[FillStats] = None
+    """How the orders filled, when run with a fill simulator"""
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class WorkerStats:
+    files: int = 0
+    events: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BacktestReport:
+    results: List[BacktestResult]
+    seconds: float
+    workers: Dict[int, WorkerStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for result in self.results:
+            if result.skipped is None:
+                stats = self.workers.setdefault(result.worker, WorkerStats())
+                stats.files += 1
+                stats.events += result.events
+                stats.seconds += result.seconds
+
+    @property
+    def opportunities(self) -> int:
+        return sum(result.opportunities for result in self.results)
+
+    @property
+    def orders(self) -> int:
+        return sum(result.orders for result in self.results)
+
+    @property
+    def pnl(self) -> float:
+        return sum(result.pnl for result in self.results)
+
+    @property
+    def events(self) -> int:
+        return sum(result.events for result in self.results)
+
+    @property
+    def realized_pnl(self) -> Optional[float]:
+        fills = [result.fills for result in self.results if result.fills is not None]
+        return sum(stats.realized_edge for stats in fills) if fills else None
+
+    def asdict(self):
+        return {
+            'seconds': self.seconds,
+            'events': self.events,
+            'opportunities': self.opportunities,
+            'orders': self.orders,
+            'pnl': self.pnl,
+            'realized_pnl': self.realized_pnl,
+            'results': [{**asdict(result), 'events_per_second': result.events_per_second} for result in self.results],
+            'workers': {str(pid): {**asdict(stats), 'events_per_second': stats.events_per_second} for pid, stats in self.workers.items()},
+        }
+
+
+def backtest_file(csv_file_path: str, latency_ms: Optional[int] = None) -> BacktestResult:
+    """
+    Replays one market events file through its books and the arb strategy,
+    simulating fills `latency_ms` after each opportunity when given
+    """
+    book_store = market_book_store(csv_file_path)
+    result = BacktestResult(csv_file_path, book_store.market_slug, os.getpid())
+    if book_store.market_id is None:
+        result.skipped = "no market ID"
+        return result
+    if len(book_store.books) != 2:
+        result.skipped = f"{len(book_store.books)} outcomes"
+        return result
+
+    processor = CSVMessageProcessor(csv_file_path, [], streaming=True, cache=True)
+    simulator = FillSimulator(book_store, latency_ms) if latency_ms is not None else None
+    clock = VirtualClock()
+    previous_clock = get_clock()
+    set_clock(clock)
+    try:
+        _replay(processor, book_store, clock, result, simulator)
+    finally:
+        set_clock(previous_clock)
+
+    if simulator is not None:
+        result.fills = simulator.stats
+
+    return result
+
+
+def _replay(processor: CSVMessageProcessor,
+            book_store: OrderBookStore,
+            clock: VirtualClock,
+            result: BacktestResult,
+            simulator: Optional[FillSimulator]):
+    book_a, book_b = book_store.books
+    last_orders: Tuple = ()
+
+    start = time.perf_counter()
+    for messages in processor.websocket_message_groups():
+        timestamp = messages[0]['timestamp']
+        clock.advance_to(timestamp)
+        if simulator is not None:
+            simulator.advance(timestamp)
+
+        result.message_groups += 1
+        try:
+            market_events = parse_market_events(book_store, messages)
+            book_store.update_book(market_events)
+        except (KeyError, ValueError):
+            result.errors += 1
+            continue
+
+        result.events += len(market_events)
+
+        orders = calculate_orders(book_a, book_b)
+        key = order_key(orders)
+        if orders and key != last_orders:
+            result.opportunities += 1
+            result.orders += len(orders)
+            result.pnl += order_pnl(orders)
+            if simulator is not None:
+                simulator.submit(orders, timestamp)
+        last_orders = key
+
+    if simulator is not None:
+        simulator.finish()
+
+    result.seconds = time.perf_counter() - start
+
+
+def run_backtest(csv_file_paths: List[str], max_workers: Optional[int] = None, latency_ms: Optional[int] = None) -> BacktestReport:
+    """Backtests each file in its own task on a pool of max_workers processes (default: one per CPU)"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(partial(backtest_file, latency_ms=latency_ms), csv_file_paths))
+
+    return BacktestReport(results, time.perf_counter() - start)
+
+
+def print_report(report: BacktestReport):
+    print(f"{'market':<32} {'events':>8} {'opps':>6} {'orders':>7} {'pnl':>10} {'events/s':>10}")
+    for result in report.results:
+        if result.skipped is not None:
+            print(f"{result.market_slug:<32} skipped: {result.skipped}")
+            continue
+        line = (f"{result.market_slug:<32} {result.events:>8} {result.opportunities:>6} {result.orders:>7} "
+                f"{result.pnl:>10.2f} {result.events_per_second:>10.0f}")
+        if result.fills is not None:
+            line += (f"  filled {result.fills.filled}/{result.fills.orders}, killed {result.fills.killed}, "
+                     f"realized {result.fills.realized_edge:.2f}, "
+                     f"unhedged {result.fills.unhedged_size:.0f} costing {result.fills.unhedged_cost:.2f}")
+        print(line)
+
+    print()
+    for pid, stats in sorted(report.workers.items()):
+        print(f"worker {pid}: {stats.files} files, {stats.events} events, {stats.events_per_second:.0f} events/s")
+
+    print()
+    print(f"{len(report.results)} markets, {report.events} events, {report.opportunities} opportunities, "
+          f"{report.orders} orders, theoretical PnL ${report.pnl:.2f} in {report.seconds:.2f}s")
+    if report.realized_pnl is not None:
+        print(f"Realized PnL after fill simulation ${report.realized_pnl:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the arb strategy over recorded markets in parallel")
+    parser.add_argument(
+        "pattern",
+        nargs='?',
+        default=f"*{EVENTS_SUFFIX}",
+        help="A date (YYYYMMDD) or a glob of market event files (default: every file in data/)"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory dates and bare globs are matched in (default: data)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--json", default=None, help="Also save the report as JSON to this path")
+    parser.add_argument("--latency-ms", type=int, default=None, help="Simulate fills with this order-to-exchange latency")
+    args = parser.parse_args()
+
+    csv_file_paths = find_event_files(args.pattern, args.data_dir)
+    if not csv_file_paths:
+        print(f"No market event files match {args.pattern}")
+        return
+
+    report = run_backtest(csv_file_paths, max_workers=args.workers, latency_ms=args.latency_ms)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(report.asdict(), json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Benchmarks order submission against the mock CLOB (src/mock_clob.py), so
+batching, concurrency and rate limits can be tuned without touching the
+exchange:
+
+    place_orders            PolymarketService.place_multiple_orders, batches of
+                            --batch-size sent one after another on pooled
+                            connections
+    place_orders_async      PolymarketService.place_multiple_orders_async, every
+                            batch in flight at once, up to --concurrency
+    order_service           PolymarketOrderService.execute_orders_from_list, which
+                            signs the orders and submits batches of --batch-size
+                            concurrently behind its rate limiter
+    order_service_presigned the same with every order signed ahead of time
+
+Each scenario reports its throughput in orders per second, the p50/p99
+latency of its requests, how many of them failed and how many orders the
+mock CLOB accepted. The PolymarketService scenarios send orders that are
+already signed, so they measure submission alone. Batches default to
+CLOB_MAX_BATCH_ORDERS orders, which is also as many as the mock CLOB
+accepts, like the exchange; larger ones fail.
+
+Usage:
+    make bench FILE=orders
+    PYTHONPATH=src python -m src.benchmarks.bench_orders --orders 400 --latency-ms 80 --concurrency 8
+    PYTHONPATH=src python -m src.benchmarks.bench_orders --error-rate 0.05 --fill-rate 0.8 --rate-limit 1000
+    CLOB_MAX_BATCH_ORDERS=15 PYTHONPATH=src python -m src.benchmarks.bench_orders
+"""
+
+import argparse
+import asyncio
+import logging
+import secrets
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from config import config
+from services.http_client import HttpClient
+from services.polymarket_batch_order import PolymarketOrderService
+from services.polymarket_service import PolymarketService
+from services.rate_limiter import TokenBucket
+from src.mock_clob import MockClobServer, MockClobSettings
+from src.models import Order, OrderSide, OrderType
+
+ORDERS = 200
+LATENCY_MS = 50.0
+CONCURRENCY = 4
+ASSET_IDS = ['1001', '1002']
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    orders: int
+    requests: int
+    seconds: float
+    failed_requests: int
+    """Requests that errored, e.g. the mock CLOB's injected 500s"""
+    accepted: int
+    """Orders the mock CLOB reported as placed"""
+    p50_ms: Optional[float]
+    p99_ms: Optional[float]
+
+    @property
+    def orders_per_second(self) -> float:
+        return self.orders / self.seconds if self.seconds else 0.0
+
+
+def make_orders(count: int) -> List[Order]:
+    """Arb legs alternating between two assets, no two alike so each is signed separately"""
+    return [
+        Order(
+            market_slug='bench-market', market_id=1, asset_id=ASSET_IDS[i % 2], outcome_name=['Yes', 'No'][i % 2],
+            side=OrderSide.BUY, order_type=OrderType.FOK,
+            price=round(0.01 * (1 + i // 2 % 98), 2), size=float(10 + i // 196), timestamp=0
+        )
+        for i in range(count)
+    ]
+
+
+def _signed_payloads(orders: List[Order]) -> List[Dict]:
+    """What PolymarketService.place_* expects: orders signed elsewhere"""
+    return [
+        {
+            'order': {
+                'salt': i, 'maker': '0x' + '11' * 20, 'signer': '0x' + '22' * 20, 'taker': '0x' + '00' * 20,
+                'tokenId': order.asset_id, 'makerAmount': str(int(order.price * order.size * 1e6)),
+                'takerAmount': str(int(order.size * 1e6)), 'expiration': '0', 'nonce': '0', 'feeRateBps': '0',
+                'side': order.side.value, 'signatureType': 2, 'signature': '0x' + '33' * 65,
+            },
+            'owner': 'bench-api-key',
+        }
+        for i, order in enumerate(orders)
+    ]
+
+
+@contextmanager
+def targeting(server: MockClobServer):
+    """Points the services at the mock CLOB through POLYMARKET_CLOB_API, with a throwaway wallet"""
+    settings = {
+        'POLYMARKET_CLOB_API': server.url,
+        'POLYMARKET_PRIVATE_KEY': '0x' + secrets.token_hex(32),
+        'POLYMARKET_PROXY_ADDRESS': '0x' + '11' * 20,
+    }
+    previous = {name: getattr(config, name) for name in settings}
+    for name, value in settings.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+
+def _percentiles(latencies_ms: List[float]) -> List[Optional[float]]:
+    if not latencies_ms:
+        return [None, None]
+    return [float(value) for value in np.percentile(latencies_ms, [50, 99])]
+
+
+def _outcomes(results: List) -> List[int]:
+    """[failed requests, accepted orders] of PolymarketService.place_multiple_orders results"""
+    failed, accepted = 0, 0
+    for result in results:
+        if isinstance(result, list):
+            accepted += sum(1 for r in result if r.get('success'))
+        else:
+            failed += 1
+    return [failed, accepted]
+
+
+def _batches(payloads: List[Dict], batch_size: int) -> List[List[Dict]]:
+    return [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+
+
+def _run_place_orders(orders: List[Order], concurrency: int, rate_limiter: Optional[TokenBucket], batch_size: int) -> ScenarioResult:
+    http_client = HttpClient(max_connections=concurrency, max_concurrency=concurrency)
+    service = PolymarketService(http_client=http_client, max_batch_orders=batch_size)
+    batches = _batches(_signed_payloads(orders), service.max_batch_orders)
+
+    latencies_ms, results = [], []
+    start = time.perf_counter()
+    for batch in batches:
+        batch_start = time.perf_counter()
+        results.append(service.place_multiple_orders(batch, 'FOK'))
+        latencies_ms.append((time.perf_counter() - batch_start) * 1000)
+    seconds = time.perf_counter() - start
+    http_client.close()
+
+    return ScenarioResult('place_orders', len(orders), len(batches), seconds, *_outcomes(results), *_percentiles(latencies_ms))
+
+
+def _run_place_orders_async(orders: List[Order], concurrency: int, rate_limiter: Optional[TokenBucket], batch_size: int) -> ScenarioResult:
+    http_client = HttpClient(max_connections=concurrency, max_concurrency=concurrency)
+    service = PolymarketService(http_client=http_client, max_batch_orders=batch_size)
+    batches = _batches(_signed_payloads(orders), service.max_batch_orders)
+    latencies_ms = []
+
+    async def place(batch):
+        batch_start = time.perf_counter()
+        result = await service.place_multiple_orders_async(batch, 'FOK')
+        latencies_ms.append((time.perf_counter() - batch_start) * 1000)
+        return result
+
+    async def run():
+        try:
+            return await asyncio.gather(*(place(batch) for batch in batches))
+        finally:
+            await http_client.aclose()
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    seconds = time.perf_counter() - start
+
+    # Latencies include the wait for a free slot, as an order placed in a burst would see
+    return ScenarioResult('place_orders_async', len(orders), len(batches), seconds, *_outcomes(results), *_percentiles(latencies_ms))
+
+
+def _order_service_run(presigned: bool) -> Callable:
+    def run(orders: List[Order], concurrency: int, rate_limiter: Optional[TokenBucket], batch_size: int) -> ScenarioResult:
+        service = PolymarketOrderService(max_batch_size=batch_size,
+                                         max_concurrent_batches=concurrency)
+        if rate_limiter is not None:
+            service.rate_limiter = rate_limiter
+
+        # Market tick sizes and fee rates are fetched once, before any opportunity
+        for asset_id in ASSET_IDS:
+            service.client.get_tick_size(asset_id)
+            service.client.get_fee_rate_bps(asset_id)
+
+        if presigned:
+            service.signer.max_presigned = len(orders)
+            service.presign_orders(orders)
+            for future in list(service.signer.presigned.values()):
+                future.result()
+
+        start = time.perf_counter()
+        summary = service.execute_orders_from_list(orders)
+        seconds = time.perf_counter() - start
+
+        service.close()
+        stats = service.batch_stats
+        name = 'order_service_presigned' if presigned else 'order_service'
+        return ScenarioResult(name, len(orders), stats.batches, seconds, stats.failed_batches, summary['accepted_orders'],
+                              *_percentiles(list(stats.latencies_ms)))
+    return run
+
+
+SCENARIOS: Dict[str, Callable] = {
+    'place_orders': _run_place_orders,
+    'place_orders_async': _run_place_orders_async,
+    'order_service': _order_service_run(presigned=False),
+    'order_service_presigned': _order_service_run(presigned=True),
+}
+
+
+def bench_scenario(scenario: str,
+                   settings: MockClobSettings,
+                   orders: int = ORDERS,
+                   concurrency: int = CONCURRENCY,
+                   rate_limit: Optional[float] = None,
+                   burst: Optional[int] = None,
+                   batch_size: Optional[int] = None) -> ScenarioResult:
+    """
+    Runs a scenario against its own mock CLOB; the rate limit only applies to
+    the order service. batch_size defaults to CLOB_MAX_BATCH_ORDERS, the mock
+    CLOB's own limit unless its settings say otherwise.
+    """
+    if batch_size is None:
+        batch_size = config.CLOB_MAX_BATCH_ORDERS
+    rate_limiter = None
+    if rate_limit is not None:
+        rate_limiter = TokenBucket(rate_limit, burst if burst is not None else config.CLOB_ORDERS_BURST)
+
+    with MockClobServer(settings) as server, targeting(server):
+        return SCENARIOS[scenario](make_orders(orders), concurrency, rate_limiter, batch_size)
+
+
+def print_results(results: List[ScenarioResult]):
+    print(f"{'scenario':<24} {'orders':>7} {'requests':>9} {'failed':>7} {'seconds':>8} {'orders/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'accepted':>9}")
+    for result in results:
+        p50 = f"{result.p50_ms:>8.1f}" if result.p50_ms is not None else f"{'-':>8}"
+        p99 = f"{result.p99_ms:>8.1f}" if result.p99_ms is not None else f"{'-':>8}"
+        print(f"{result.scenario:<24} {result.orders:>7} {result.requests:>9} {result.failed_requests:>7} {result.seconds:>8.2f} "
+              f"{result.orders_per_second:>9.0f} {p50} {p99} {result.accepted:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order submission against a local mock CLOB")
+    parser.add_argument("--scenarios", nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help="Scenarios to run (default: all)")
+    parser.add_argument("--orders", type=int, default=ORDERS, help=f"Orders each scenario places (default: {ORDERS})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help=f"Requests in flight at once (default: {CONCURRENCY})")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Order service requests per second (default: CLOB_ORDERS_RATE_LIMIT)")
+    parser.add_argument("--burst", type=int, default=None, help="Order service request burst (default: CLOB_ORDERS_BURST)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"Orders per batch request (default: CLOB_MAX_BATCH_ORDERS, {config.CLOB_MAX_BATCH_ORDERS})")
+    parser.add_argument("--latency-ms", type=float, default=LATENCY_MS, help=f"Mock CLOB latency per request (default: {LATENCY_MS:g})")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Up to this much more latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests the mock CLOB fails")
+    parser.add_argument("--fill-rate", type=float, default=1.0, help="Share of orders the mock CLOB fills")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the mock CLOB's errors and fills")
+    args = parser.parse_args()
+
+    # Every request and batch is logged, and every injected error and killed
+    # order logged as an error; the results count them instead
+    logging.disable(logging.ERROR)
+
+    settings = MockClobSettings(args.latency_ms, args.jitter_ms, args.error_rate, args.fill_rate, args.seed)
+    print(f"Placing {args.orders} orders per scenario against a mock CLOB answering in "
+          f"{args.latency_ms:g}ms (+{args.jitter_ms:g}ms jitter), {args.concurrency} requests at once")
+    results = [
+        bench_scenario(scenario, settings, args.orders, args.concurrency, args.rate_limit, args.burst, args.batch_size)
+        for scenario in args.scenarios
+    ]
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
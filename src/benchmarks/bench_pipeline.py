@@ -0,0 +1,453 @@
+"""
+Benchmarks each stage of the market event pipeline on the recorded market
+events in data/, one message group (websocket message) at a time:
+
+    json_decode            json.loads of the message as the websocket delivers it
+    market_event_from_dict MarketEvent.from_dict of each event, via parse_market_events
+    update_book            OrderBookStore.update_book
+    calculate_orders       calculate_orders after each update
+    write_marketEvents     the market events DAO
+    write_orderBookStore   the book DAO, every level and with a delta encoder
+    write_orders           the orders DAO
+    csv_replay             CSVMessageProcessor reading and regrouping the files,
+                           and replaying them from the message cache
+    pipeline               the whole live handler as main builds it, from JSON to
+                           written orders
+
+Each stage reports throughput, per-message latency percentiles and the
+peak memory it allocated (measured in a second, traced pass, so tracing
+doesn't slow the timed one). Results are compared with a saved baseline
+and stages that lost more than --threshold of their throughput, or grew
+their peak memory by as much, are flagged as regressions; the run then
+exits with status 1. Baselines are per machine: save one with
+--save-baseline before making changes.
+
+DAO stages write into a temporary directory, never into data/. By default
+10000 message groups are sampled evenly across the markets; --max-groups 0
+benchmarks all of them.
+
+Usage:
+    make bench FILE=pipeline
+    make bench FILE=pipeline ARGS="--save-baseline"
+    PYTHONPATH=src python -m src.benchmarks.bench_pipeline --stages update_book calculate_orders --max-groups 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from src.main import parse_market_events, get_order_message_register, build_strategy_runner
+from src.models import MarketEvent, OrderBookStore, OrdersStore
+from src.daos import write_marketEvents, write_orderBookStore, write_orders, OrderBookDeltaEncoder
+from src.replay import DATA_DIR, EVENTS_SUFFIX, find_event_files, market_book_store
+from src.strategies import calculate_orders, ArbParameters, OrderEmitter, StrategyRunner
+from src.utils import CSVMessageProcessor, VirtualClock, set_clock, get_clock
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'pipeline.json')
+THRESHOLD = 0.2
+MAX_GROUPS = 10_000
+
+# Walks only the top of the books whatever their prices, so every update
+# yields a pair of orders for the orders DAO to write
+_ALWAYS_ORDER = ArbParameters(min_edge=-1.0, max_depth=1)
+
+
+@dataclass
+class Market:
+    """The recorded messages of one market, decoded up front so stages only time themselves"""
+    csv_file_path: str
+    payloads: List[str]
+    """Each message group as the JSON the websocket delivers"""
+    message_groups: List[List[Dict[str, Any]]]
+
+    def book_store(self) -> OrderBookStore:
+        return market_book_store(self.csv_file_path)
+
+    def market_events(self, book_store: OrderBookStore) -> List[List[MarketEvent]]:
+        return [parse_market_events(book_store, messages) for messages in self.message_groups]
+
+
+class _Discard(list):
+    """Latencies of the traced pass, which aren't kept so they don't count towards its memory"""
+
+    def append(self, latency: int):
+        pass
+
+
+@dataclass
+class StageResult:
+    stage: str
+    items: int
+    unit: str
+    seconds: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+    peak_memory_kb: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items per second"""
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def load_markets(csv_file_paths: List[str], max_groups: Optional[int] = MAX_GROUPS) -> List[Market]:
+    """
+    Reads the message groups of every two-outcome market with a market ID,
+    taking an even share of max_groups from each (all of them when None)
+    """
+    book_stores = [(path, market_book_store(path)) for path in csv_file_paths]
+    book_stores = [(path, book_store) for path, book_store in book_stores if book_store.market_id is not None and len(book_store.books) == 2]
+    per_market = -(-max_groups // len(book_stores)) if max_groups and book_stores else None
+
+    markets = []
+    for csv_file_path, book_store in book_stores:
+        message_groups = []
+        for messages in CSVMessageProcessor(csv_file_path, [], streaming=True).websocket_message_groups():
+            if per_market is not None and len(message_groups) >= per_market:
+                break
+            message_groups.append(messages)
+
+        markets.append(Market(csv_file_path, [json.dumps(messages) for messages in message_groups], message_groups))
+
+    return markets
+
+
+def _datetime(messages: List[Dict[str, Any]]) -> datetime:
+    return datetime.fromtimestamp(messages[0]['timestamp'] / 1000)
+
+
+# Every stage is prepare(markets) -> state, untimed, then run(state, latencies) -> items,
+# appending the nanoseconds each message took to latencies
+
+def _prepare_json_decode(markets: List[Market]) -> List[str]:
+    return [payload for market in markets for payload in market.payloads]
+
+
+def _run_json_decode(payloads: List[str], latencies: List[int]) -> int:
+    items = 0
+    for payload in payloads:
+        start = perf_counter_ns()
+        messages = json.loads(payload)
+        latencies.append(perf_counter_ns() - start)
+        items += len(messages)
+    return items
+
+
+def _prepare_market_event_from_dict(markets: List[Market]) -> List[Tuple[OrderBookStore, Market]]:
+    return [(market.book_store(), market) for market in markets]
+
+
+def _run_market_event_from_dict(state: List[Tuple[OrderBookStore, Market]], latencies: List[int]) -> int:
+    items = 0
+    for book_store, market in state:
+        for messages in market.message_groups:
+            start = perf_counter_ns()
+            market_events = parse_market_events(book_store, messages)
+            latencies.append(perf_counter_ns() - start)
+            items += len(market_events)
+    return items
+
+
+def _prepare_update_book(markets: List[Market]) -> List[Tuple[OrderBookStore, List[List[MarketEvent]]]]:
+    state = []
+    for market in markets:
+        book_store = market.book_store()
+        state.append((book_store, market.market_events(book_store)))
+    return state
+
+
+def _run_update_book(state: List[Tuple[OrderBookStore, List[List[MarketEvent]]]], latencies: List[int]) -> int:
+    items = 0
+    for book_store, groups in state:
+        for market_events in groups:
+            start = perf_counter_ns()
+            book_store.update_book(market_events)
+            latencies.append(perf_counter_ns() - start)
+            items += len(market_events)
+    return items
+
+
+def _run_calculate_orders(state: List[Tuple[OrderBookStore, List[List[MarketEvent]]]], latencies: List[int]) -> int:
+    items = 0
+    for book_store, groups in state:
+        book_a, book_b = book_store.books
+        for market_events in groups:
+            book_store.update_book(market_events)
+            start = perf_counter_ns()
+            calculate_orders(book_a, book_b)
+            latencies.append(perf_counter_ns() - start)
+            items += 1
+    return items
+
+
+def _prepare_write_marketEvents(markets: List[Market]) -> List[Tuple[OrderBookStore, List[List[MarketEvent]], List[datetime]]]:
+    state = []
+    for market in markets:
+        book_store = market.book_store()
+        state.append((book_store, market.market_events(book_store), [_datetime(messages) for messages in market.message_groups]))
+    return state
+
+
+def _run_write_marketEvents(state, latencies: List[int]) -> int:
+    items = 0
+    for book_store, groups, datetimes in state:
+        for market_events, at in zip(groups, datetimes):
+            start = perf_counter_ns()
+            write_marketEvents(book_store.market_slug, book_store.market_id, market_events, at, test_mode=True)
+            latencies.append(perf_counter_ns() - start)
+            items += len(market_events)
+    return items
+
+
+def _write_orderBookStore_run(encoded: bool) -> Callable:
+    def run(state, latencies: List[int]) -> int:
+        items = 0
+        for book_store, groups, datetimes in state:
+            encoder = OrderBookDeltaEncoder() if encoded else None
+            for market_events, at in zip(groups, datetimes):
+                book_store.update_book(market_events)
+                start = perf_counter_ns()
+                write_orderBookStore(book_store.market_slug, book_store, at, test_mode=True, encoder=encoder)
+                latencies.append(perf_counter_ns() - start)
+                items += 1
+        return items
+
+    return run
+
+
+def _run_write_orders(state, latencies: List[int]) -> int:
+    items = 0
+    for book_store, groups, datetimes in state:
+        book_a, book_b = book_store.books
+        for market_events, at in zip(groups, datetimes):
+            book_store.update_book(market_events)
+            orders = calculate_orders(book_a, book_b, _ALWAYS_ORDER)
+            start = perf_counter_ns()
+            write_orders(book_store.market_slug, orders, at, test_mode=True)
+            latencies.append(perf_counter_ns() - start)
+            items += len(orders)
+    return items
+
+
+def _prepare_csv_replay(markets: List[Market]) -> List[str]:
+    # Copies, so the message cache is written next to them rather than in data/
+    return [shutil.copy(market.csv_file_path, os.getcwd()) for market in markets]
+
+
+def _replay_run(cache: bool) -> Callable:
+    def run(csv_file_paths: List[str], latencies: List[int]) -> int:
+        items = 0
+        for csv_file_path in csv_file_paths:
+            message_groups = CSVMessageProcessor(csv_file_path, [], streaming=True, cache=cache).websocket_message_groups()
+            while True:
+                start = perf_counter_ns()
+                messages = next(message_groups, None)
+                if messages is None:
+                    break
+                latencies.append(perf_counter_ns() - start)
+                items += len(messages)
+        return items
+
+    return run
+
+
+def _prepare_csv_replay_cached(markets: List[Market]) -> List[str]:
+    csv_file_paths = _prepare_csv_replay(markets)
+    _replay_run(cache=True)(csv_file_paths, _Discard())
+    return csv_file_paths
+
+
+def _prepare_pipeline(markets: List[Market]) -> List[Tuple[Callable, List[str], StrategyRunner]]:
+    # The handler main builds for each market
+    state = []
+    for market in markets:
+        strategy_runner = build_strategy_runner()
+        handler = get_order_message_register(market.book_store(), OrdersStore(), test_mode=True, order_emitter=OrderEmitter(), strategy_runner=strategy_runner, book_encoder=OrderBookDeltaEncoder())
+        state.append((handler, market.payloads, strategy_runner))
+    return state
+
+
+def _run_pipeline(state: List[Tuple[Callable, List[str], StrategyRunner]], latencies: List[int]) -> int:
+    items = 0
+    clock = get_clock()
+    for handler, payloads, strategy_runner in state:
+        for payload in payloads:
+            start = perf_counter_ns()
+            messages = json.loads(payload)
+            clock.advance_to(messages[0]['timestamp'])
+            handler(messages)
+            latencies.append(perf_counter_ns() - start)
+            items += len(messages)
+        # Worker strategies finish their queued runs within the stage's time
+        strategy_runner.shutdown()
+    return items
+
+
+# name -> (unit, prepare, run)
+STAGES: Dict[str, Tuple[str, Callable, Callable]] = {
+    'json_decode': ('messages', _prepare_json_decode, _run_json_decode),
+    'market_event_from_dict': ('events', _prepare_market_event_from_dict, _run_market_event_from_dict),
+    'update_book': ('events', _prepare_update_book, _run_update_book),
+    'calculate_orders': ('updates', _prepare_update_book, _run_calculate_orders),
+    'write_marketEvents': ('events', _prepare_write_marketEvents, _run_write_marketEvents),
+    'write_orderBookStore': ('updates', _prepare_write_marketEvents, _write_orderBookStore_run(encoded=False)),
+    'write_orderBookStore_delta': ('updates', _prepare_write_marketEvents, _write_orderBookStore_run(encoded=True)),
+    'write_orders': ('orders', _prepare_write_marketEvents, _run_write_orders),
+    'csv_replay': ('messages', _prepare_csv_replay, _replay_run(cache=False)),
+    'csv_replay_cached': ('messages', _prepare_csv_replay_cached, _replay_run(cache=True)),
+    'pipeline': ('messages', _prepare_pipeline, _run_pipeline),
+}
+
+
+def bench_stage(stage: str, markets: List[Market]) -> StageResult:
+    """Times a stage, then reruns it under tracemalloc for its peak memory, each in a fresh working directory"""
+    unit, prepare, run = STAGES[stage]
+
+    latencies: List[int] = []
+    with _scratch_dir():
+        state = prepare(markets)
+        start = time.perf_counter()
+        items = run(state, latencies)
+        seconds = time.perf_counter() - start
+
+    with _scratch_dir():
+        state = prepare(markets)
+        tracemalloc.start()
+        try:
+            run(state, _Discard())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    p50, p90, p99, slowest = np.percentile(latencies, [50, 90, 99, 100]) / 1000 if latencies else (0.0, 0.0, 0.0, 0.0)
+    return StageResult(stage, items, unit, seconds, float(p50), float(p90), float(p99), float(slowest), peak / 1024)
+
+
+class _scratch_dir:
+    """Runs a stage in a temporary working directory, on a virtual clock, removing both afterwards"""
+
+    def __enter__(self):
+        self.cwd = os.getcwd()
+        self.path = tempfile.mkdtemp(prefix='bench-pipeline-')
+        os.chdir(self.path)
+        self.previous_clock = get_clock()
+        set_clock(VirtualClock())
+
+    def __exit__(self, *exc_info):
+        set_clock(self.previous_clock)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def compare(results: List[StageResult], baseline: Dict[str, Any], threshold: float = THRESHOLD) -> Dict[str, List[str]]:
+    """Regressions of each stage against the baseline: lost throughput or grown peak memory beyond threshold"""
+    regressions: Dict[str, List[str]] = {}
+    stages = baseline.get('stages', {})
+    for result in results:
+        saved = stages.get(result.stage)
+        if saved is None:
+            continue
+
+        found = []
+        if saved['throughput'] and result.throughput < saved['throughput'] * (1 - threshold):
+            found.append(f"throughput {result.throughput:,.0f} < {saved['throughput']:,.0f} {result.unit}/s")
+        if saved['peak_memory_kb'] and result.peak_memory_kb > saved['peak_memory_kb'] * (1 + threshold):
+            found.append(f"peak memory {result.peak_memory_kb:,.0f} > {saved['peak_memory_kb']:,.0f} KB")
+        if found:
+            regressions[result.stage] = found
+
+    return regressions
+
+
+def baseline_dict(results: List[StageResult], markets: List[Market]) -> Dict[str, Any]:
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'files': sorted(os.path.basename(market.csv_file_path) for market in markets),
+        'message_groups': sum(len(market.message_groups) for market in markets),
+        'stages': {result.stage: {**asdict(result), 'throughput': result.throughput} for result in results},
+    }
+
+
+def print_results(results: List[StageResult], regressions: Dict[str, List[str]]):
+    print(f"{'stage':<27} {'items':>8} {'unit':<9} {'per second':>12} {'p50 us':>9} {'p90 us':>9} "
+          f"{'p99 us':>9} {'max us':>10} {'peak KB':>9}")
+    for result in results:
+        flag = "  REGRESSION" if result.stage in regressions else ""
+        print(f"{result.stage:<27} {result.items:>8} {result.unit:<9} {result.throughput:>12,.0f} {result.p50_us:>9.1f} "
+              f"{result.p90_us:>9.1f} {result.p99_us:>9.1f} {result.max_us:>10.1f} {result.peak_memory_kb:>9,.0f}{flag}")
+
+    for stage, found in regressions.items():
+        for regression in found:
+            print(f"{stage}: {regression}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the market event pipeline on recorded data")
+    parser.add_argument(
+        "pattern",
+        nargs='?',
+        default=f"*{EVENTS_SUFFIX}",
+        help="A date (YYYYMMDD) or a glob of market event files (default: every file in data/)"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory dates and bare globs are matched in (default: data)")
+    parser.add_argument("--stages", nargs='+', choices=list(STAGES), default=list(STAGES), help="Stages to run (default: all)")
+    parser.add_argument("--max-groups", type=int, default=MAX_GROUPS, help="Message groups to benchmark, spread over the markets, 0 for all (default: 10000)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file (default: src/benchmarks/baselines/pipeline.json)")
+    parser.add_argument("--save-baseline", action='store_true', help="Save these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Fraction a stage may regress by before it's flagged (default: 0.2)")
+    args = parser.parse_args()
+
+    # The DAOs log every write, and every pass over the data warns of its malformed rows
+    logging.disable(logging.WARNING)
+
+    csv_file_paths = [os.path.abspath(path) for path in find_event_files(args.pattern, args.data_dir)]
+    markets = load_markets(csv_file_paths, args.max_groups or None)
+    if not markets:
+        print(f"No market event files with market IDs match {args.pattern}")
+        return
+
+    print(f"Benchmarking {sum(len(market.message_groups) for market in markets)} message groups of {len(markets)} markets")
+    results = [bench_stage(stage, markets) for stage in args.stages]
+
+    regressions: Dict[str, List[str]] = {}
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+
+    print_results(results, regressions)
+
+    if baseline is not None:
+        if baseline['files'] != sorted(os.path.basename(market.csv_file_path) for market in markets):
+            print(f"Warning: the baseline from {baseline['created']} was measured on other files")
+        print(f"Compared with the baseline from {baseline['created']}: "
+              f"{len(regressions)} of {len(results)} stages regressed by more than {args.threshold:.0%}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline_dict(results, markets), baseline_file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmarks the polymarket arb matcher on deep order books, both evaluating
+from scratch and when the examined levels are unchanged (cache hit).
+
+Usage:
+    make bench FILE=polymarket_arb
+    PYTHONPATH=src python -m src.benchmarks.bench_polymarket_arb
+"""
+
+import time
+from typing import Callable, List, Tuple
+from src.models import SyntheticOrder, OrderSide, SyntheticOrderBook
+from src.strategies.polymarket_arb import calculate_orders, _match_orders, OrderBuilder
+
+DEPTHS = [10, 100, 1_000, 10_000]
+
+
+def build_books(depth: int) -> Tuple[SyntheticOrderBook, SyntheticOrderBook]:
+    """
+    Builds two ask ladders of `depth` levels where every level pair sums
+    below $1, so the matcher has to walk the full depth of both books.
+    Sizes alternate so both the "a smaller" and "b smaller" branches run.
+    """
+    book_a = SyntheticOrderBook("bench-market", 1, "YES", "asset-yes", 0)
+    book_b = SyntheticOrderBook("bench-market", 1, "NO", "asset-no", 0)
+
+    book_a.replace_entries([
+        SyntheticOrder(side=OrderSide.SELL, price=0.30 + i * 1e-5, size=10 + (i % 3))
+        for i in range(depth)
+    ])
+    book_b.replace_entries([
+        SyntheticOrder(side=OrderSide.SELL, price=0.40 + i * 1e-5, size=10 + (i % 5))
+        for i in range(depth)
+    ])
+
+    return book_a, book_b
+
+
+def _time(func: Callable[[], List], min_seconds: float) -> Tuple[int, float, int]:
+    iterations = 0
+    result: List = []
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        result = func()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    return iterations, elapsed / iterations, len(result)
+
+
+def bench(depth: int, min_seconds: float = 0.5) -> Tuple[float, float, int]:
+    """Returns (seconds per uncached call, seconds per cached call, orders emitted) for one depth."""
+    book_a, book_b = build_books(depth)
+    orders_a, orders_b = book_a.sorted_orders(), book_b.sorted_orders()
+    builder_a = OrderBuilder(book_a.market_slug, book_a.market_id, book_a.outcome_name, book_a.asset_id)
+    builder_b = OrderBuilder(book_b.market_slug, book_b.market_id, book_b.outcome_name, book_b.asset_id)
+
+    _, uncached, num_orders = _time(lambda: _match_orders(orders_a, builder_a, orders_b, builder_b, 0)[0], min_seconds)
+    _, cached, _ = _time(lambda: calculate_orders(book_a, book_b), min_seconds)
+
+    return uncached, cached, num_orders
+
+
+def main():
+    print(f"{'depth':>8} {'match us/call':>14} {'cached us/call':>15} {'orders':>8}")
+    for depth in DEPTHS:
+        uncached, cached, num_orders = bench(depth)
+        print(f"{depth:>8} {uncached * 1e6:>14.1f} {cached * 1e6:>15.1f} {num_orders:>8}")
+
+
+if __name__ == "__main__":
+    main()
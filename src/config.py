@@ -27,6 +27,38 @@ class Config:
     POLYMARKET_CLOB_API: str = os.getenv('POLYMARKET_CLOB_API', 'https://clob.polymarket.com')
     POLYMARKET_WEBSOCKET_URL: str = os.getenv('POLYMARKET_WEBSOCKET_URL', 'wss://ws-subscriptions-clob.polymarket.com')
     
+    # HTTP Client Configuration
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '10'))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP_MAX_CONCURRENCY: int = int(os.getenv('HTTP_MAX_CONCURRENCY', '10'))
+    HTTP_TIMEOUT: float = float(os.getenv('HTTP_TIMEOUT', '10'))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    
+    # Order Signing Configuration
+    ORDER_SIGNING_WORKERS: int = int(os.getenv('ORDER_SIGNING_WORKERS', '4'))
+    ORDER_MAX_PRESIGNED: int = int(os.getenv('ORDER_MAX_PRESIGNED', '64'))
+    ORDER_PRESIGNING_WORKERS: int = int(os.getenv('ORDER_PRESIGNING_WORKERS', '1'))
+    
+    # Order Submission Configuration (requests to POST /orders, per the CLOB's documented limits)
+    CLOB_ORDERS_RATE_LIMIT: float = float(os.getenv('CLOB_ORDERS_RATE_LIMIT', '25'))
+    CLOB_ORDERS_BURST: int = int(os.getenv('CLOB_ORDERS_BURST', '50'))
+    CLOB_MAX_CONCURRENT_BATCHES: int = int(os.getenv('CLOB_MAX_CONCURRENT_BATCHES', '4'))
+    # Orders per POST /orders request: what the services send and the mock CLOB accepts
+    CLOB_MAX_BATCH_ORDERS: int = int(os.getenv('CLOB_MAX_BATCH_ORDERS', '5'))
+    
+    # Orders Store Configuration (orders kept in memory per market)
+    ORDERS_STORE_MAX_ORDERS: int = int(os.getenv('ORDERS_STORE_MAX_ORDERS', '10000'))
+    ORDERS_STORE_MAX_AGE_MS: Optional[int] = int(os.getenv('ORDERS_STORE_MAX_AGE_MS')) if os.getenv('ORDERS_STORE_MAX_AGE_MS') else None
+    
+    # Strategy Configuration
+    ARB_EXECUTION_MODE: str = os.getenv('ARB_EXECUTION_MODE', 'inline')  # inline or worker
+    ARB_LATENCY_BUDGET_MS: float = float(os.getenv('ARB_LATENCY_BUDGET_MS', '5'))
+    # ladder pairs ask levels one at a time (calculate_orders), depth sizes one order per outcome on the cumulative depth (ArbSizer)
+    ARB_SIZING: str = os.getenv('ARB_SIZING', 'ladder')
+    # Sign the arb's likely orders ahead of time in live mode; needs Polymarket credentials
+    PRESIGN_ORDERS: bool = os.getenv('PRESIGN_ORDERS', 'False').lower() in ('true', '1', 'yes')
+    
     # Proxy Configuration
     PROXY_USERNAME: Optional[str] = os.getenv('PROXY_USERNAME')
     PROXY_PASSWORD: Optional[str] = os.getenv('PROXY_PASSWORD')
@@ -1,6 +1,16 @@
 from .market_dao import write_marketEvents
-from .orderbook_dao import write_orderBookStore
+from .orderbook_dao import write_orderBookStore, OrderBookDeltaEncoder, replay_orderBookStore, read_orderBookStore
 from .order_dao import write_orders
 from .metadata_dao import write_metadata
+from .csv_writer import BufferedCSVWriter, set_csv_writer, get_csv_writer
+from .parquet_store import BufferedParquetWriter, convert_csv, read_dataset
+from .rotating_writer import RotatingCompressedWriter
+from .sqlite_store import SQLiteEventStore, query
+from .event_file import EventFile, EventFileWriter, set_event_file_writer, get_event_file_writer, convert_csv_to_event_file, write_event_file
 
-__all__ = ['write_marketEvents','write_orderBookStore', 'write_orders', 'write_metadata']
+__all__ = ['write_marketEvents','write_orderBookStore', 'write_orders', 'write_metadata',
+           'OrderBookDeltaEncoder', 'replay_orderBookStore', 'read_orderBookStore',
+           'BufferedCSVWriter', 'set_csv_writer', 'get_csv_writer',
+           'BufferedParquetWriter', 'convert_csv', 'read_dataset',
+           'RotatingCompressedWriter', 'SQLiteEventStore', 'query',
+           'EventFile', 'EventFileWriter', 'set_event_file_writer', 'get_event_file_writer', 'convert_csv_to_event_file', 'write_event_file']
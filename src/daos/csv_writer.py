@@ -0,0 +1,139 @@
+import os
+import csv
+import threading
+from typing import Dict, Any, IO, List, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCSVWriter:
+    """
+    Shared CSV writer for the DAOs that keeps file handles open and batches
+    rows in memory, so the message handler only appends to a list.
+
+    Rows are written from a background thread once `max_rows` are buffered
+    across all files or every `flush_interval` seconds, whichever comes
+    first. close() writes whatever is left and closes every file.
+
+    Files are set up with a header row the first time they are written, in
+    the same format as the DAOs' own _setup_csv.
+    """
+
+    def __init__(self, max_rows: int = 1000, flush_interval: float = 1.0):
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+
+        self._buffers: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+        self._buffered = 0
+        self._files: Dict[str, Tuple[IO, csv.DictWriter]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="csv-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, csv_filename: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        if self._closed:
+            raise RuntimeError("BufferedCSVWriter is closed")
+
+        with self._lock:
+            buffer = self._buffers.get(csv_filename)
+            if buffer is None:
+                self._buffers[csv_filename] = (field_names, list(rows))
+            else:
+                buffer[1].extend(rows)
+            self._buffered += len(rows)
+            full = self._buffered >= self.max_rows
+
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """Writes every buffered row and flushes the open files"""
+        # Held from taking the buffers to writing them, so concurrent flushes
+        # (the background thread and close) write their batches in order
+        with self._flush_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, {}
+                self._buffered = 0
+
+            for csv_filename, (field_names, rows) in buffers.items():
+                try:
+                    self._write_rows(csv_filename, field_names, rows)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(rows)} rows to {csv_filename}: {e}")
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+        with self._flush_lock:
+            self._close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write_rows(self, csv_filename: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        csvfile, writer = self._open(csv_filename, field_names)
+        writer.writerows(rows)
+        csvfile.flush()
+
+    def _close_files(self):
+        for csvfile, _ in self._files.values():
+            csvfile.close()
+        self._files = {}
+
+    def _open(self, csv_filename: str, field_names: List[str]) -> Tuple[IO, csv.DictWriter]:
+        opened = self._files.get(csv_filename)
+        if opened is not None:
+            return opened
+
+        directory = os.path.dirname(csv_filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        new_file = not os.path.isfile(csv_filename)
+        csvfile = open(csv_filename, 'a', newline='')
+        if new_file:
+            logger.info(f"Setting up CSV file: {csv_filename}")
+            csv.writer(csvfile, delimiter=',').writerow(field_names)
+
+        writer = csv.DictWriter(csvfile,
+                                delimiter=',',
+                                quotechar='|',
+                                quoting=csv.QUOTE_MINIMAL,
+                                fieldnames=field_names
+                            )
+        self._files[csv_filename] = (csvfile, writer)
+        return csvfile, writer
+
+
+_csv_writer: Optional[BufferedCSVWriter] = None
+
+
+def set_csv_writer(writer: Optional[BufferedCSVWriter]):
+    """Routes every DAO write through `writer`, or back to direct writes with None"""
+    global _csv_writer
+    _csv_writer = writer
+
+
+def get_csv_writer() -> Optional[BufferedCSVWriter]:
+    return _csv_writer
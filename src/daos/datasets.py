@@ -0,0 +1,47 @@
+import os
+from enum import Enum
+from typing import Any, Tuple
+
+from . import market_dao, orderbook_dao, order_dao, metadata_dao
+
+# Datasets keyed on the suffix of their CSV file name
+DATASETS = {
+    'polymarket-market-events': market_dao.FIELD_NAMES,
+    'synthetic-order-book': orderbook_dao.FIELD_NAMES,
+    'synthetic-order-book-delta': orderbook_dao.DELTA_FIELD_NAMES,
+    'orders': order_dao.FIELD_NAMES,
+    'market-metadata': metadata_dao.FIELD_NAMES,
+}
+
+TEST_SUFFIX = '_test'
+
+
+def parse_csv_filename(csv_filename: str) -> Tuple[str, str, str]:
+    """
+    Splits a DAO file name such as 20250617_mlb-cle-sf-2025-06-17_orders_test.csv
+    into its (date, market_slug, dataset) partition, here
+    ('20250617', 'mlb-cle-sf-2025-06-17', 'orders_test').
+    """
+    stem = os.path.splitext(os.path.basename(csv_filename))[0]
+    test = stem.endswith(TEST_SUFFIX)
+    stem = stem.removesuffix(TEST_SUFFIX)
+
+    parts = stem.split('_')
+    if len(parts) != 3 or parts[2] not in DATASETS:
+        raise ValueError(f"Not a market data file name: {csv_filename}")
+
+    date, market_slug, dataset = parts
+    return date, market_slug, dataset + (TEST_SUFFIX if test else '')
+
+
+def dataset_fields(dataset: str):
+    return DATASETS[dataset.removesuffix(TEST_SUFFIX)]
+
+
+def plain_value(value: Any) -> Any:
+    """Row value as stored outside of CSV: enums by value, empty strings as None"""
+    if isinstance(value, Enum):
+        return value.value
+    if value == '':
+        return None
+    return value
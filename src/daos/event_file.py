@@ -0,0 +1,301 @@
+import os
+import json
+from typing import Dict, Any, IO, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.utils.compressed_files import iter_csv_rows
+from .csv_writer import BufferedCSVWriter
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'SDEV'
+VERSION = 1
+HEADER_SIZE = 16
+
+# One fixed-width little-endian record per event row
+EVENT_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('price', '<f8'),
+    ('size', '<f8'),
+    ('asset', '<u2'),
+    ('event_type', 'u1'),
+    ('side', 'u1'),
+    ('_padding', 'V4'),
+])
+
+EVENT_TYPES = ('book', 'price_change')
+SIDES = ('BUY', 'SELL')
+
+# Book rows record their side as bid/ask, price changes as BUY/SELL
+_SIDE_CODES = {'BUY': 0, 'bid': 0, 'SELL': 1, 'ask': 1}
+_EVENT_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+# Fields of a market event row that end up in its record
+_ROW_FIELDS = ['timestamp', 'price', 'size', 'asset_id', 'event_type', 'side']
+
+
+def event_file_path(csv_filename: str) -> str:
+    """data/20250701_<slug>_polymarket-market-events.csv -> ...polymarket-market-events.events.bin"""
+    return f"{os.path.splitext(csv_filename)[0]}.events.bin"
+
+
+def assets_path(path: str) -> str:
+    """Asset table of an event file: asset index -> asset metadata"""
+    return f"{os.path.splitext(path)[0]}.assets.json"
+
+
+def _header() -> bytes:
+    return MAGIC + np.array([VERSION, EVENT_DTYPE.itemsize], dtype='<u4').tobytes() + bytes(HEADER_SIZE - 12)
+
+
+class EventFileWriter(BufferedCSVWriter):
+    """
+    Appends market event rows to binary event files alongside the CSV the
+    market DAO writes: fixed-width EVENT_DTYPE records after a 16 byte
+    header, with asset IDs replaced by an index into a small JSON asset
+    table next to the file.
+
+    Like BufferedCSVWriter, write() only buffers the rows, which are
+    encoded and written from a background thread, and file handles are
+    kept open. Rows are in the file once flush() or close() is called.
+    write_to() encodes and writes straight away, for batch conversions.
+    """
+
+    def __init__(self, max_rows: int = 1000, flush_interval: float = 1.0):
+        self._assets: Dict[str, List[Dict[str, Any]]] = {}
+        self._asset_indexes: Dict[str, Dict[str, int]] = {}
+        super().__init__(max_rows=max_rows, flush_interval=flush_interval)
+
+    def write(self, csv_filename: str, rows: List[Dict[str, Any]]):
+        super().write(event_file_path(csv_filename), _ROW_FIELDS, rows)
+
+    def write_to(self, path: str, rows: List[Dict[str, Any]]):
+        with self._flush_lock:
+            self._write_rows(path, _ROW_FIELDS, rows)
+
+    def create(self, path: str):
+        """Makes sure the event file and its asset table exist, even without any events"""
+        with self._flush_lock:
+            if path not in self._files:
+                self._open_event_file(path)
+            if not os.path.exists(assets_path(path)):
+                self._write_assets(path)
+
+    def _write_rows(self, path: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        eventfile = self._files.get(path)
+        if eventfile is None:
+            eventfile = self._open_event_file(path)
+
+        records = np.zeros(len(rows), dtype=EVENT_DTYPE)
+        records['timestamp'] = [int(row['timestamp']) for row in rows]
+        records['price'] = [float(row['price']) for row in rows]
+        records['size'] = [float(row['size']) for row in rows]
+        records['asset'] = [self._asset_index(path, row) for row in rows]
+        records['event_type'] = [_EVENT_TYPE_CODES[row['event_type']] for row in rows]
+        records['side'] = [_SIDE_CODES[row['side']] for row in rows]
+
+        eventfile.write(records.tobytes())
+        eventfile.flush()
+
+    def _close_files(self):
+        for eventfile in self._files.values():
+            eventfile.close()
+        self._files = {}
+
+    def _open_event_file(self, path: str) -> IO:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        new_file = not os.path.isfile(path)
+        eventfile = open(path, 'ab')
+        if new_file:
+            eventfile.write(_header())
+
+        assets = []
+        if os.path.isfile(assets_path(path)):
+            with open(assets_path(path), 'r') as assets_file:
+                assets = json.load(assets_file)
+
+        self._files[path] = eventfile
+        self._assets[path] = assets
+        self._asset_indexes[path] = {asset['asset_id']: index for index, asset in enumerate(assets)}
+        return eventfile
+
+    def _asset_index(self, path: str, row: Dict[str, Any]) -> int:
+        asset_id = str(row['asset_id'])
+        index = self._asset_indexes[path].get(asset_id)
+        if index is None:
+            index = len(self._assets[path])
+            self._assets[path].append({
+                'asset_id': asset_id,
+                'market_slug': row.get('market_slug'),
+                'market_id': row.get('market_id'),
+                'outcome_name': row.get('outcome_name'),
+            })
+            self._asset_indexes[path][asset_id] = index
+            self._write_assets(path)
+
+        return index
+
+    def _write_assets(self, path: str):
+        with open(assets_path(path), 'w') as assets_file:
+            json.dump(self._assets[path], assets_file)
+
+
+_event_file_writer: Optional[EventFileWriter] = None
+
+
+def set_event_file_writer(writer: Optional[EventFileWriter]):
+    """Also writes every market event to a binary event file through `writer`, or stops with None"""
+    global _event_file_writer
+    _event_file_writer = writer
+
+
+def get_event_file_writer() -> Optional[EventFileWriter]:
+    return _event_file_writer
+
+
+def convert_csv_to_event_file(csv_filename: str) -> str:
+    """Writes the event file for an existing market events CSV, returning its path"""
+    return write_event_file(event_file_path(csv_filename), iter_csv_rows(csv_filename))
+
+
+def is_event_row(row: Dict[str, Any]) -> bool:
+    """Whether a market event row can be stored in an event file: a timestamped book or price change"""
+    return bool(row.get('timestamp')) and row.get('event_type') in _EVENT_TYPE_CODES and row.get('side') in _SIDE_CODES
+
+
+def write_event_file(path: str, rows: Iterable[Dict[str, Any]]) -> str:
+    """
+    Writes market event rows to a new event file at `path`, replacing any
+    file there. Rows that aren't book or price change events are dropped.
+    The file and its asset table are written even when no rows are left.
+    """
+    for stale in [path, assets_path(path)]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    writer = EventFileWriter(flush_interval=60)
+    batch = []
+    for row in rows:
+        if is_event_row(row):
+            batch.append(row)
+        if len(batch) >= 10_000:
+            writer.write_to(path, batch)
+            batch = []
+    if batch:
+        writer.write_to(path, batch)
+    writer.create(path)
+    writer.close()
+
+    return path
+
+
+class EventFile:
+    """
+    Read-only memory map of a binary event file. The columns are NumPy
+    views straight onto the mapped file, so opening a file reads only its
+    header and the OS pages in what is touched.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as eventfile:
+            header = eventfile.read(HEADER_SIZE)
+        if header[:4] != MAGIC:
+            raise ValueError(f"Not an event file: {path}")
+        version, itemsize = np.frombuffer(header[4:12], dtype='<u4')
+        if version != VERSION or itemsize != EVENT_DTYPE.itemsize:
+            raise ValueError(f"Unsupported event file version {version} with {itemsize} byte records: {path}")
+
+        self.path = path
+        count = (os.path.getsize(path) - HEADER_SIZE) // EVENT_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=EVENT_DTYPE)
+
+        self.assets: List[Dict[str, Any]] = []
+        if os.path.exists(assets_path(path)):
+            with open(assets_path(path), 'r') as assets_file:
+                self.assets = json.load(assets_file)
+
+        self._groups: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.records['timestamp']
+
+    @property
+    def asset(self) -> np.ndarray:
+        return self.records['asset']
+
+    @property
+    def event_type(self) -> np.ndarray:
+        return self.records['event_type']
+
+    @property
+    def side(self) -> np.ndarray:
+        return self.records['side']
+
+    @property
+    def price(self) -> np.ndarray:
+        return self.records['price']
+
+    @property
+    def size(self) -> np.ndarray:
+        return self.records['size']
+
+    def asset_ids(self) -> List[str]:
+        return [asset['asset_id'] for asset in self.assets]
+
+    def group_bounds(self) -> np.ndarray:
+        """
+        Start offsets of each run of rows sharing a timestamp and event type,
+        i.e. each websocket message, followed by len(self)
+        """
+        if self._groups is None:
+            changes = np.flatnonzero((np.diff(self.timestamp) != 0) | (np.diff(self.event_type) != 0)) + 1
+            self._groups = np.concatenate(([0], changes, [len(self)])) if len(self) else np.zeros(1, dtype=np.int64)
+
+        return self._groups
+
+    def messages(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Replays the file as the websocket message lists CSVMessageProcessor
+        hands its handlers, one per run of (timestamp, event_type)
+        """
+        bounds = self.group_bounds().tolist()
+        asset_ids = self.asset_ids()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield self._message(asset_ids, self.records[start:end].tolist())
+
+    def _message(self, asset_ids: List[str], rows: List[tuple]) -> List[Dict[str, Any]]:
+        timestamp, _, _, _, event_type, _, _ = rows[0]
+        event_type = EVENT_TYPES[event_type]
+
+        # One message per asset, in order of first appearance
+        messages: Dict[int, Dict[str, Any]] = {}
+        for _, price, size, asset, _, side, _ in rows:
+            message = messages.get(asset)
+            if message is None:
+                # Event files don't keep the event hash
+                message = {'asset_id': asset_ids[asset], 'event_type': event_type, 'hash': '', 'timestamp': timestamp}
+                if event_type == 'book':
+                    message['asks'], message['bids'] = [], []
+                else:
+                    message['changes'] = []
+                messages[asset] = message
+
+            if event_type == 'book':
+                message['asks' if side == 1 else 'bids'].append({'price': str(price), 'size': str(size)})
+            else:
+                message['changes'].append({'price': str(price), 'size': str(size), 'side': SIDES[side]})
+
+        return list(messages.values())
@@ -3,6 +3,8 @@ import csv
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from src.models import MarketEvent
+from .csv_writer import get_csv_writer
+from .event_file import get_event_file_writer
 
 import logging
 
@@ -30,10 +32,19 @@ def write_marketEvents(market_slug: str, market_id: int, market_events: List[Mar
     try:
         if len(rows) > 0:
             _write_to_csv(csv_filename, rows)
+
+            event_file_writer = get_event_file_writer()
+            if event_file_writer is not None:
+                event_file_writer.write(csv_filename, rows)
     except Exception:
         logger.error(f"Failed to write rows in market_writer")
 
 def _write_to_csv(csv_filename, rows: List[Dict[str, Any]]):
+    csv_writer = get_csv_writer()
+    if csv_writer is not None:
+        csv_writer.write(csv_filename, FIELD_NAMES, rows)
+        return
+
     if not os.path.isfile(csv_filename):
         logger.info(f"Setting up CSV file: {csv_filename}")
         _setup_csv(csv_filename)
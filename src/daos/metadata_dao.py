@@ -5,6 +5,7 @@ from typing import Dict, Any, List
 import logging
 from models.synthetic_orderbook import SyntheticOrderBook
 from utils.datetime_utils import datetime_to_epoch
+from .csv_writer import get_csv_writer
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,13 @@ def _setup_csv(file_path: str) -> None:
         logger.info(f"Created new metadata CSV file: {file_path}")
 
 def _write_to_csv(file_path: str, rows: List[Dict[str, Any]]) -> None:
-    """Write rows to the CSV file."""
+    """Write rows to the CSV file, or to the shared writer, which sets up its own files."""
+    csv_writer = get_csv_writer()
+    if csv_writer is not None:
+        csv_writer.write(file_path, FIELD_NAMES, rows)
+        return
+
+    _setup_csv(file_path)
     with open(file_path, 'a', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=FIELD_NAMES, quotechar='|', quoting=csv.QUOTE_MINIMAL)
         writer.writerows(rows)
@@ -46,7 +53,6 @@ def write_metadata(
     """
     try:
         file_path = _get_file_path(market_slug, executed_at)
-        _setup_csv(file_path)
         
         # Convert executed_at to epoch timestamp
         executed_at_timestamp = datetime_to_epoch(executed_at)
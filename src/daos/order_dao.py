@@ -3,6 +3,7 @@ import csv
 from typing import List, Dict, Any
 from datetime import datetime
 from src.models import Order
+from .csv_writer import get_csv_writer
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +28,11 @@ def write_orders(market_slug: str, orders: List[Order], datetime: datetime, test
 
 # TODO: This can prob be abstracted into csv utils
 def _write_to_csv(csv_filename, rows: List[Dict[str, Any]]):
+    csv_writer = get_csv_writer()
+    if csv_writer is not None:
+        csv_writer.write(csv_filename, FIELD_NAMES, rows)
+        return
+
     if not os.path.isfile(csv_filename):
         logger.info(f"Setting up CSV file: {csv_filename}")
         _setup_csv(csv_filename)
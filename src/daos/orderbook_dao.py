@@ -1,6 +1,8 @@
-from src.models import OrderBookStore
+from src.models import OrderBookStore, SyntheticOrderBook, SyntheticOrder, OrderSide
+from src.utils.compressed_files import iter_csv_rows, find_segments
+from .csv_writer import get_csv_writer
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import os
 import csv
 
@@ -11,44 +13,170 @@ logger = logging.getLogger(__name__)
 
 FIELD_NAMES = ['market_slug', 'market_id', 'asset_id', 'outcome_name', 'price', 'size', 'side',  'timestamp']
 
-def write_orderBookStore(market_slug: str, orderBook_store: OrderBookStore, datetime: datetime, test_mode: bool = False):
+# Delta encoded books add the kind of each row and the per-asset update it belongs to
+DELTA_FIELD_NAMES = FIELD_NAMES + ['row_type', 'sequence']
+
+KEYFRAME = 'keyframe'
+DELTA = 'delta'
+
+
+class OrderBookDeltaEncoder:
+    """
+    Turns each book update into rows for only the levels that changed since
+    the last update written, with a full keyframe of the book every
+    `keyframe_interval` updates per asset.
+
+    Delta rows carry the new size of a level, 0 for a removed level. A
+    keyframe lists every level; a keyframe of an empty book is a single row
+    with no price or size. Rows of one update share its `sequence`.
+
+    Each file must be readable on its own, so the first update written to a
+    new file (e.g. the next day's) is always a keyframe.
+    """
+
+    def __init__(self, keyframe_interval: int = 100):
+        self.keyframe_interval = keyframe_interval
+        self.levels: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self.sequences: Dict[str, int] = {}
+        self.csv_filename: Optional[str] = None
+
+    def start_file(self, csv_filename: str):
+        """Starts every book over with a keyframe if the rows now go to another file"""
+        if csv_filename != self.csv_filename:
+            self.csv_filename = csv_filename
+            self.levels = {}
+
+    def encode(self, book: SyntheticOrderBook) -> List[Dict[str, Any]]:
+        rows = book.asdict_rows()
+        levels = {row['price']: row for row in rows}
+
+        sequence = self.sequences.get(book.asset_id, -1) + 1
+        previous = self.levels.get(book.asset_id)
+        self.levels[book.asset_id] = levels
+
+        if previous is None or sequence % self.keyframe_interval == 0:
+            self.sequences[book.asset_id] = sequence
+            if not rows:
+                rows = [{
+                    'market_slug': book.market_slug,
+                    'market_id': book.market_id,
+                    'asset_id': book.asset_id,
+                    'outcome_name': book.outcome_name,
+                    'timestamp': book.timestamp
+                }]
+            return [{**row, 'row_type': KEYFRAME, 'sequence': sequence} for row in rows]
+
+        changed = [row for price, row in levels.items()
+                   if price not in previous or previous[price]['size'] != row['size']]
+        removed = [{**row, 'size': 0, 'timestamp': book.timestamp}
+                   for price, row in previous.items() if price not in levels]
+
+        if not changed and not removed:
+            return []
+
+        self.sequences[book.asset_id] = sequence
+        return [{**row, 'row_type': DELTA, 'sequence': sequence} for row in changed + removed]
+
+
+def write_orderBookStore(market_slug: str, orderBook_store: OrderBookStore, datetime: datetime, test_mode: bool = False, encoder: Optional[OrderBookDeltaEncoder] = None):
+    """
+    Writes every level of every book, or with an encoder only what changed
+    since the last write, to the synthetic-order-book-delta file.
+    """
     test_suffix = "_test" if test_mode else ""
-    csv_filename = os.path.join('data', f"{datetime.strftime('%Y%m%d')}_{market_slug}_synthetic-order-book{test_suffix}.csv")
+    dataset = "synthetic-order-book" if encoder is None else "synthetic-order-book-delta"
+    csv_filename = os.path.join('data', f"{datetime.strftime('%Y%m%d')}_{market_slug}_{dataset}{test_suffix}.csv")
 
     rows = []
 
+    if encoder is not None:
+        encoder.start_file(csv_filename)
+
     for book in orderBook_store.books:
-        rows.extend(book.asdict_rows())
+        rows.extend(book.asdict_rows() if encoder is None else encoder.encode(book))
 
     if len(rows) == 0:
         return
 
     logger.info(f"Writing {len(rows)} synthetic orders for market -- {market_slug}")
 
-    _write_to_csv(csv_filename, rows)
-
+    _write_to_csv(csv_filename, rows, FIELD_NAMES if encoder is None else DELTA_FIELD_NAMES)
+
+
+def replay_orderBookStore(csv_filename: str, until: Optional[int] = None) -> Iterator[SyntheticOrderBook]:
+    """
+    Reads a synthetic-order-book-delta file, plain or written as rotated
+    compressed segments, yielding the full book of an asset after each
+    update, up to updates timestamped `until`. The yielded book is updated
+    in place by later updates; snapshot() it to keep it.
+    """
+    books: Dict[str, SyntheticOrderBook] = {}
+    current: Optional[Tuple[str, str]] = None
+    book = None
+
+    for row in iter_csv_rows(csv_filename, paths=find_segments(csv_filename, end=until), quotechar='|'):
+        # Each book's timestamps only move forward, so its later updates can be skipped
+        if until is not None and int(row['timestamp']) > until:
+            continue
+
+        update = (row['asset_id'], row['sequence'])
+        if update != current:
+            if book is not None:
+                yield book
+            current = update
+            book = books.get(row['asset_id'])
+            if book is None:
+                book = SyntheticOrderBook(row['market_slug'], int(row['market_id']), row['outcome_name'], row['asset_id'], int(row['timestamp']))
+                books[row['asset_id']] = book
+            if row['row_type'] == KEYFRAME:
+                book.replace_entries([])
+            book.set_timestamp(int(row['timestamp']))
+
+        if row['price']:
+            book.add_entries([SyntheticOrder(side=OrderSide(row['side']), price=float(row['price']), size=float(row['size']))])
+
+    if book is not None:
+        yield book
+
+
+def read_orderBookStore(csv_filename: str, timestamp: Optional[int] = None) -> Dict[str, SyntheticOrderBook]:
+    """
+    Reconstructs every asset's book as of `timestamp` (the end of the file
+    when None) from a synthetic-order-book-delta file, keyed by asset_id.
+    """
+    books = {}
+    for book in replay_orderBookStore(csv_filename, until=timestamp):
+        books[book.asset_id] = book
+
+    return {asset_id: book.snapshot() for asset_id, book in books.items()}
+
+
+def _write_to_csv(csv_filename, rows: List[Dict[str, Any]], field_names: List[str] = FIELD_NAMES):
+    csv_writer = get_csv_writer()
+    if csv_writer is not None:
+        csv_writer.write(csv_filename, field_names, rows)
+        return
 
-def _write_to_csv(csv_filename, rows: List[Dict[str, Any]]):
     if not os.path.isfile(csv_filename):
         logger.info(f"Setting up CSV file: {csv_filename}")
-        _setup_csv(csv_filename)
+        _setup_csv(csv_filename, field_names)
 
     with open(csv_filename, 'a', newline='') as csvfile:
         writer = csv.DictWriter(csvfile,
                                     delimiter=',',
                                     quotechar='|',
                                     quoting=csv.QUOTE_MINIMAL,
-                                    fieldnames=FIELD_NAMES
+                                    fieldnames=field_names
                                 )
         writer.writerows(rows)
 
 
 # TODO: Can abstract into util
-def _setup_csv(csv_filename: str):
+def _setup_csv(csv_filename: str, field_names: List[str] = FIELD_NAMES):
     data_dir = "data"
     os.makedirs(data_dir, exist_ok=True)
 
     with open(csv_filename, 'w', newline='') as csvfile:
         writer = csv.writer(csvfile, delimiter=',')
-        writer.writerow(FIELD_NAMES)
+        writer.writerow(field_names)
 
@@ -0,0 +1,247 @@
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from .csv_writer import BufferedCSVWriter
+from .datasets import parse_csv_filename, dataset_fields, plain_value
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as pa_ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARQUET_ROOT = os.path.join('data', 'parquet')
+
+# Columns that repeat a handful of values on every row are dictionary
+# encoded, so e.g. the 77 digit asset ID is stored once per row group
+_DICTIONARY_FIELDS = {'market_slug', 'asset_id', 'outcome_name', 'event_type', 'side', 'order_type', 'row_type'}
+_NUMERIC_FIELDS = {
+    'market_id': 'int64',
+    'price': 'float64',
+    'size': 'float64',
+    'timestamp': 'int64',
+    'sequence': 'int64',
+    'executed_at_timestamp': 'int64',
+    'game_start_timestamp': 'int64',
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The parquet backend requires pyarrow: pip install pyarrow")
+
+
+def _field_type(name: str):
+    if name in _NUMERIC_FIELDS:
+        return pa.type_for_alias(_NUMERIC_FIELDS[name])
+    if name in _DICTIONARY_FIELDS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def dataset_schema(dataset: str) -> "pa.Schema":
+    _require_pyarrow()
+    return pa.schema([(name, _field_type(name)) for name in dataset_fields(dataset)])
+
+
+def partition_dir(root: str, dataset: str, date: str, market_slug: str) -> str:
+    return os.path.join(root, dataset, f"date={date}", f"market_slug={market_slug}")
+
+
+def rows_to_table(dataset: str, rows: List[Dict[str, Any]]) -> "pa.Table":
+    """Builds a typed table from DAO rows, dropping the partition column"""
+    schema = dataset_schema(dataset)
+    columns = []
+    for field in schema:
+        values = [plain_value(row.get(field.name)) for row in rows]
+        columns.append(_to_array(values, field.type))
+
+    return _drop_partition_columns(pa.Table.from_arrays(columns, schema=schema))
+
+
+def _to_array(values: List[Any], type) -> "pa.Array":
+    try:
+        return pa.array(values, type=type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed or string-typed values, e.g. rows read back from a CSV
+        return _cast_strings(pa.array([None if value is None else str(value) for value in values], pa.string()), type)
+
+
+def _cast_strings(strings: "pa.Array", type) -> "pa.Array":
+    if pa.types.is_integer(type):
+        # Integers that went through a float, e.g. "552801.0"
+        return strings.cast(pa.float64()).cast(type)
+    return strings.cast(type)
+
+
+def _drop_partition_columns(table: "pa.Table") -> "pa.Table":
+    if 'market_slug' in table.column_names:
+        table = table.drop_columns(['market_slug'])
+    return table
+
+
+class _Part:
+    """A Parquet file being written, under a hidden name until it is closed"""
+
+    def __init__(self, directory: str, name: str, schema: "pa.Schema", compression: str):
+        self.path = os.path.join(directory, name)
+        self.temp_path = os.path.join(directory, f".{name}.inprogress")
+        self.writer = pq.ParquetWriter(self.temp_path, schema, compression=compression)
+        self.rows = 0
+        self.opened_at = time.monotonic()
+
+    def write(self, table: "pa.Table"):
+        self.writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        # The footer is only written on close, so the file becomes visible then
+        self.writer.close()
+        os.replace(self.temp_path, self.path)
+
+
+class BufferedParquetWriter(BufferedCSVWriter):
+    """
+    Drop-in replacement for BufferedCSVWriter that stores every DAO's rows
+    in compressed, typed Parquet instead of CSV.
+
+    Each CSV file the DAOs would write maps to a partition under `root`:
+
+        <root>/<dataset>/date=<YYYYMMDD>/market_slug=<slug>/part-<start>-<pid>-<n>.parquet
+
+    with a row group per flush. A part is closed, and so becomes readable,
+    once it holds `max_part_rows` rows or has been open `max_part_seconds`,
+    and the next flush starts a new one. Parts being written are hidden
+    (dot-prefixed) from read_dataset, so a crash loses at most the rows of
+    the open parts.
+
+    Select it with set_csv_writer(BufferedParquetWriter()).
+    """
+
+    def __init__(self,
+                 root: str = PARQUET_ROOT,
+                 max_rows: int = 10_000,
+                 flush_interval: float = 5.0,
+                 compression: str = 'zstd',
+                 max_part_rows: int = 100_000,
+                 max_part_seconds: float = 300.0):
+        _require_pyarrow()
+        self.root = root
+        self.compression = compression
+        self.max_part_rows = max_part_rows
+        self.max_part_seconds = max_part_seconds
+        self._part_prefix = f"part-{int(time.time() * 1000)}-{os.getpid()}"
+        self._parts_started = 0
+        super().__init__(max_rows=max_rows, flush_interval=flush_interval)
+
+    def flush(self):
+        super().flush()
+        # Parts of files no longer written to are closed once they are old enough
+        with self._flush_lock:
+            for csv_filename, part in list(self._files.items()):
+                if self._part_full(part):
+                    self._close_part(csv_filename)
+
+    def _write_rows(self, csv_filename: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        date, market_slug, dataset = parse_csv_filename(csv_filename)
+        table = rows_to_table(dataset, rows)
+
+        part = self._files.get(csv_filename)
+        if part is None:
+            directory = partition_dir(self.root, dataset, date, market_slug)
+            os.makedirs(directory, exist_ok=True)
+            part = _Part(directory, f"{self._part_prefix}-{self._parts_started:05d}.parquet", table.schema, self.compression)
+            self._parts_started += 1
+            self._files[csv_filename] = part
+
+        part.write(table)
+        if self._part_full(part):
+            self._close_part(csv_filename)
+
+    def _part_full(self, part: _Part) -> bool:
+        return part.rows >= self.max_part_rows or time.monotonic() - part.opened_at >= self.max_part_seconds
+
+    def _close_part(self, csv_filename: str):
+        part = self._files.pop(csv_filename)
+        try:
+            part.close()
+        except Exception as e:
+            logger.error(f"Failed to close Parquet part {part.path}: {e}")
+
+    def _close_files(self):
+        for csv_filename in list(self._files):
+            self._close_part(csv_filename)
+
+
+def convert_csv(csv_filename: str, root: str = PARQUET_ROOT, compression: str = 'zstd') -> str:
+    """
+    Converts one DAO CSV file into its Parquet partition, returning the path
+    written. Columns missing from older files are stored as nulls. Running
+    it again on the same file overwrites the earlier conversion.
+    """
+    _require_pyarrow()
+    date, market_slug, dataset = parse_csv_filename(csv_filename)
+    schema = dataset_schema(dataset)
+
+    # Rows mangled by interleaved writes are skipped rather than failing the file
+    skipped = []
+
+    def skip_invalid_row(row):
+        skipped.append(row.number)
+        return 'skip'
+
+    # Read every column as a string so older files with empty or float
+    # formatted IDs convert the same way as rows from the writer
+    table = pa_csv.read_csv(
+        csv_filename,
+        parse_options=pa_csv.ParseOptions(quote_char='|', invalid_row_handler=skip_invalid_row),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in schema.names},
+            include_columns=schema.names,
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        )
+    )
+    if skipped:
+        logger.warning(f"Skipped {len(skipped)} malformed rows in {csv_filename}")
+
+    columns = [_cast_strings(table.column(field.name).combine_chunks(), field.type) for field in schema]
+    table = _drop_partition_columns(pa.Table.from_arrays(columns, schema=schema))
+
+    directory = partition_dir(root, dataset, date, market_slug)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, os.path.splitext(os.path.basename(csv_filename))[0] + '.parquet')
+    pq.write_table(table, path, compression=compression)
+    return path
+
+
+def read_dataset(dataset: str,
+                 root: str = PARQUET_ROOT,
+                 date: Optional[str] = None,
+                 market_slug: Optional[str] = None,
+                 columns: Optional[List[str]] = None):
+    """
+    Reads a dataset into a pandas DataFrame, only opening the partitions
+    that match `date` and `market_slug` and only decoding `columns`.
+    """
+    _require_pyarrow()
+    partitioning = pa_ds.partitioning(
+        pa.schema([('date', pa.string()), ('market_slug', pa.string())]),
+        flavor='hive'
+    )
+    data = pa_ds.dataset(os.path.join(root, dataset), format='parquet', partitioning=partitioning)
+
+    expression = None
+    for name, value in [('date', date), ('market_slug', market_slug)]:
+        if value is not None:
+            condition = pa_ds.field(name) == value
+            expression = condition if expression is None else expression & condition
+
+    return data.to_table(columns=columns, filter=expression).to_pandas()
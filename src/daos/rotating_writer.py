@@ -0,0 +1,125 @@
+import os
+import csv
+import json
+import time
+from typing import Dict, Any, IO, List, Optional
+
+from .csv_writer import BufferedCSVWriter
+from src.utils.compressed_files import open_text, segment_path, segment_paths, segment_number, index_path, EXTENSIONS
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Segment:
+    def __init__(self, path: str, csvfile: IO, writer: csv.DictWriter):
+        self.path = path
+        self.csvfile = csvfile
+        self.writer = writer
+        self.opened_at = time.monotonic()
+        self.rows = 0
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+
+
+class RotatingCompressedWriter(BufferedCSVWriter):
+    """
+    Drop-in replacement for BufferedCSVWriter that writes every DAO file as
+    a series of compressed segments instead of one growing CSV:
+
+        data/20250701_<slug>_orders.00000.csv.gz
+        data/20250701_<slug>_orders.00001.csv.gz
+        data/20250701_<slug>_orders.segments.jsonl
+
+    A segment is closed and a new one started once its compressed size
+    reaches `max_segment_bytes` or it has been open `max_segment_seconds`.
+    Each segment is a complete CSV with its own header, and each flush is
+    a compressor sync point, so a segment can be read while being written.
+    Closed segments are appended to the .segments.jsonl index with the
+    range of timestamps they hold.
+
+    Readers such as CSVMessageProcessor take the original .csv path and
+    read the segments through utils.compressed_files.
+
+    Select it with set_csv_writer(RotatingCompressedWriter()).
+    """
+
+    def __init__(self,
+                 compression: str = 'gzip',
+                 max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_segment_seconds: float = 3600,
+                 max_rows: int = 1000,
+                 flush_interval: float = 1.0):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression {compression}, expected one of {list(EXTENSIONS)}")
+
+        self.compression = compression
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        super().__init__(max_rows=max_rows, flush_interval=flush_interval)
+
+    def _write_rows(self, csv_filename: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        segment = self._files.get(csv_filename)
+        if segment is not None and self._is_full(segment):
+            self._close_segment(csv_filename, segment)
+            segment = None
+        if segment is None:
+            segment = self._open_segment(csv_filename, field_names)
+            self._files[csv_filename] = segment
+
+        segment.writer.writerows(rows)
+        segment.csvfile.flush()
+
+        segment.rows += len(rows)
+        timestamps = [int(row['timestamp']) for row in rows if row.get('timestamp') not in (None, '')]
+        if timestamps:
+            first, last = min(timestamps), max(timestamps)
+            if segment.first_timestamp is None or first < segment.first_timestamp:
+                segment.first_timestamp = first
+            if segment.last_timestamp is None or last > segment.last_timestamp:
+                segment.last_timestamp = last
+
+    def _close_files(self):
+        for csv_filename, segment in self._files.items():
+            self._close_segment(csv_filename, segment)
+        self._files = {}
+
+    def _is_full(self, segment: _Segment) -> bool:
+        if time.monotonic() - segment.opened_at >= self.max_segment_seconds:
+            return True
+        return os.path.getsize(segment.path) >= self.max_segment_bytes
+
+    def _open_segment(self, csv_filename: str, field_names: List[str]) -> _Segment:
+        directory = os.path.dirname(csv_filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Carry on numbering after segments from earlier runs
+        segments = [path for path in segment_paths(csv_filename) if path != csv_filename]
+        number = segment_number(segments[-1]) + 1 if segments else 0
+        path = segment_path(csv_filename, number, self.compression)
+        logger.info(f"Opening segment: {path}")
+
+        csvfile = open_text(path, 'wt')
+        csv.writer(csvfile, delimiter=',').writerow(field_names)
+        writer = csv.DictWriter(csvfile,
+                                delimiter=',',
+                                quotechar='|',
+                                quoting=csv.QUOTE_MINIMAL,
+                                fieldnames=field_names
+                            )
+        return _Segment(path, csvfile, writer)
+
+    def _close_segment(self, csv_filename: str, segment: _Segment):
+        segment.csvfile.close()
+
+        entry = {
+            'segment': os.path.basename(segment.path),
+            'first_timestamp': segment.first_timestamp,
+            'last_timestamp': segment.last_timestamp,
+            'rows': segment.rows,
+            'bytes': os.path.getsize(segment.path),
+        }
+        with open(index_path(csv_filename), 'a') as index_file:
+            index_file.write(json.dumps(entry) + '\n')
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+from typing import Dict, Any, List, Optional
+
+from .csv_writer import BufferedCSVWriter
+from .datasets import DATASETS, TEST_SUFFIX, parse_csv_filename, dataset_fields, plain_value
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PATH = os.path.join('data', 'signaldrift.db')
+
+_COLUMN_TYPES = {
+    'market_id': 'INTEGER',
+    'price': 'REAL',
+    'size': 'REAL',
+    'timestamp': 'INTEGER',
+    'sequence': 'INTEGER',
+    'executed_at_timestamp': 'INTEGER',
+    'game_start_timestamp': 'INTEGER',
+}
+
+
+def table_name(dataset: str) -> str:
+    """polymarket-market-events_test -> polymarket_market_events_test"""
+    return dataset.replace('-', '_')
+
+
+def connect(db_path: str = SQLITE_PATH, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Opens the event store in WAL mode, so readers never block the writer and
+    several processes can write, waiting up to `timeout` seconds for the
+    write lock.
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def create_tables(connection: sqlite3.Connection):
+    """Creates a table per dataset, and its test twin, with its indexes"""
+    for dataset in DATASETS:
+        for name in [dataset, dataset + TEST_SUFFIX]:
+            _create_table(connection, name)
+    connection.commit()
+
+
+def _create_table(connection: sqlite3.Connection, dataset: str):
+    table = table_name(dataset)
+    fields = dataset_fields(dataset)
+    columns = ', '.join(f"{field} {_COLUMN_TYPES.get(field, 'TEXT')}" for field in fields)
+    connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (date TEXT NOT NULL, {columns})")
+
+    index_columns = [column for column in ['market_slug', 'asset_id', 'timestamp'] if column in fields]
+    connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_market_asset_time ON {table} ({', '.join(index_columns)})")
+    connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_date ON {table} (date)")
+
+
+class SQLiteEventStore(BufferedCSVWriter):
+    """
+    Drop-in replacement for BufferedCSVWriter that stores every DAO's rows
+    in a SQLite database instead of CSV files, one table per dataset with
+    the date of the file the row would have gone to.
+
+    Each flush inserts everything buffered in a single transaction. Tables
+    are indexed on (market_slug, asset_id, timestamp) and on date; see
+    query() for reading them back.
+
+    Select it with set_csv_writer(SQLiteEventStore()).
+    """
+
+    def __init__(self,
+                 db_path: str = SQLITE_PATH,
+                 max_rows: int = 1000,
+                 flush_interval: float = 1.0):
+        self.db_path = db_path
+        self._connection = connect(db_path)
+        create_tables(self._connection)
+        super().__init__(max_rows=max_rows, flush_interval=flush_interval)
+
+    def flush(self):
+        super().flush()
+        with self._flush_lock:
+            self._connection.commit()
+
+    def _write_rows(self, csv_filename: str, field_names: List[str], rows: List[Dict[str, Any]]):
+        date, _, dataset = parse_csv_filename(csv_filename)
+        fields = dataset_fields(dataset)
+
+        placeholders = ', '.join('?' * (len(fields) + 1))
+        self._connection.executemany(
+            f"INSERT INTO {table_name(dataset)} (date, {', '.join(fields)}) VALUES ({placeholders})",
+            [(date, *(plain_value(row.get(field)) for field in fields)) for row in rows]
+        )
+
+    def _close_files(self):
+        self._connection.close()
+
+
+def query(dataset: str,
+          db_path: str = SQLITE_PATH,
+          market_slug: Optional[str] = None,
+          asset_id: Optional[str] = None,
+          start: Optional[int] = None,
+          end: Optional[int] = None,
+          date: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Rows of a dataset matching every filter given, in timestamp order where
+    the dataset has one. start and end bound the timestamp inclusively and
+    date is YYYYMMDD, e.g. query('orders', date='20250701').
+    """
+    fields = dataset_fields(dataset)
+    conditions, parameters = [], []
+    for column, operator, value in [('market_slug', '=', market_slug),
+                                    ('asset_id', '=', asset_id),
+                                    ('timestamp', '>=', start),
+                                    ('timestamp', '<=', end),
+                                    ('date', '=', date)]:
+        if value is not None:
+            conditions.append(f"{column} {operator} ?")
+            parameters.append(value)
+
+    sql = f"SELECT * FROM {table_name(dataset)}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if 'timestamp' in fields:
+        sql += " ORDER BY timestamp"
+
+    connection = connect(db_path)
+    try:
+        return [dict(row) for row in connection.execute(sql, parameters)]
+    finally:
+        connection.close()
@@ -0,0 +1,218 @@
+"""
+Simulates how emitted orders would have filled: each order reaches the
+exchange a fixed latency after it was emitted and is matched against the
+book as it stood at that moment, net of the liquidity earlier simulated
+fills already took.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Tuple
+import numpy as np
+from src.models import Order, OrderType, OrderSide, OrderBookStore, SyntheticOrderBook, SyntheticOrder
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def order_pnl(orders: List[Order]) -> float:
+    """
+    Theoretical profit of arb orders: calculate_orders emits them in pairs
+    of the same size, one per outcome, each pair paying out $1 per share.
+    """
+    return sum(a.size * (1 - a.price - b.price) for a, b in zip(orders[::2], orders[1::2]))
+
+
+def order_key(orders: List[Order]) -> Tuple:
+    """What makes a set of orders a new opportunity rather than a repeat of the last one"""
+    return tuple((order.asset_id, order.price, order.size) for order in orders)
+
+
+@dataclass
+class Fill:
+    order: Order
+    arrival: int
+    """When the order reached the exchange, in epoch milliseconds"""
+    size: float = 0.0
+    cost: float = 0.0
+
+    @property
+    def price(self) -> float:
+        """Average price paid"""
+        return self.cost / self.size if self.size else 0.0
+
+    @property
+    def complete(self) -> bool:
+        return self.size >= self.order.size
+
+
+@dataclass
+class FillStats:
+    orders: int = 0
+    filled: int = 0
+    partially_filled: int = 0
+    killed: int = 0
+    """FOK orders the book could not fill in full"""
+    theoretical_edge: float = 0.0
+    """Profit of the arb pairs as emitted, had each filled at its price"""
+    realized_edge: float = 0.0
+    """Profit of the pairs as filled: the hedged size's payout less the cost of every share filled"""
+    unhedged_size: float = 0.0
+    """Shares filled on one leg of a pair without the other"""
+    unhedged_cost: float = 0.0
+    """What the unhedged shares cost, charged to realized_edge as their payout is not locked in"""
+
+
+@dataclass
+class _Submission:
+    orders: List[Order]
+    arrival: int
+    fills: List[Fill] = field(default_factory=list)
+
+
+class FillSimulator:
+    """
+    Matches BUY orders against the asks of a market's books `latency_ms`
+    after they are submitted.
+
+    Drive it from a replay: call advance(timestamp) before applying the
+    events at `timestamp` to the books, so orders arriving before them see
+    the book as it was, then submit() the orders the strategy emits and
+    finish() once the replay is done.
+
+    Matching reads the books' depth arrays, so finding the marketable
+    levels and the cost of a fill are binary searches rather than scans.
+    FOK orders fill in full or not at all; other order types take whatever
+    is marketable on arrival and the rest is not filled, as resting orders
+    are not modelled.
+
+    Liquidity taken by a fill stays consumed until an event replaces that
+    level of the book, since the exchange's size for it then already
+    reflects any trades.
+    """
+
+    def __init__(self, book_store: OrderBookStore, latency_ms: int = 0):
+        self.book_store = book_store
+        self.latency_ms = latency_ms
+        self.fills: List[Fill] = []
+        self.stats = FillStats()
+
+        self._pending: Deque[_Submission] = deque()
+        # Per asset: price -> (the level filled against, size taken from it)
+        self._consumed: Dict[str, Dict[float, Tuple[SyntheticOrder, float]]] = {}
+
+    def submit(self, orders: List[Order], timestamp: int):
+        """Sends the orders emitted at `timestamp`, pairs of arb legs as calculate_orders emits them"""
+        if not orders:
+            return
+
+        self.stats.orders += len(orders)
+        self.stats.theoretical_edge += order_pnl(orders)
+        self._pending.append(_Submission(orders, timestamp + self.latency_ms))
+
+    def advance(self, timestamp: int):
+        """Matches every order arriving before `timestamp` against the books as they are now"""
+        # Latency is constant, so submissions arrive in the order they were sent
+        while self._pending and self._pending[0].arrival < timestamp:
+            self._execute(self._pending.popleft())
+
+    def finish(self):
+        """Matches the orders still in flight against the final books"""
+        while self._pending:
+            self._execute(self._pending.popleft())
+
+    def _execute(self, submission: _Submission):
+        for order in submission.orders:
+            fill = Fill(order, submission.arrival)
+            if order.side == OrderSide.BUY:
+                fill.size, fill.cost = self._match(order)
+            else:
+                logger.warning(f"Only BUY orders are simulated, not filling {order}")
+
+            if fill.complete:
+                self.stats.filled += 1
+            elif fill.size:
+                self.stats.partially_filled += 1
+            elif order.order_type == OrderType.FOK:
+                self.stats.killed += 1
+
+            submission.fills.append(fill)
+            self.fills.append(fill)
+
+        for fill_a, fill_b in zip(submission.fills[::2], submission.fills[1::2]):
+            hedged = min(fill_a.size, fill_b.size)
+            unhedged = fill_a if fill_a.size > hedged else fill_b
+            unhedged_size = unhedged.size - hedged
+            unhedged_cost = unhedged_size * unhedged.price
+            self.stats.realized_edge += hedged * (1 - fill_a.price - fill_b.price) - unhedged_cost
+            self.stats.unhedged_size += unhedged_size
+            self.stats.unhedged_cost += unhedged_cost
+
+    def _match(self, order: Order) -> Tuple[float, float]:
+        book = self.book_store.lookup(order.asset_id)
+        prices, cum_sizes, cum_costs = book.depth_arrays()
+
+        # Levels at or below the limit price
+        marketable = int(np.searchsorted(prices, order.price, side='right'))
+        if not marketable:
+            return 0.0, 0.0
+
+        prices = prices[:marketable]
+        sizes = None
+        consumed = self._live_consumption(book, order.price)
+        if consumed:
+            sizes = np.diff(cum_sizes[:marketable], prepend=0.0)
+            levels = np.searchsorted(prices, [price for price, _ in consumed])
+            sizes[levels] = np.maximum(sizes[levels] - [size for _, size in consumed], 0.0)
+            cum_sizes = np.cumsum(sizes)
+            cum_costs = np.cumsum(prices * sizes)
+
+        available = cum_sizes[marketable - 1]
+        if order.order_type == OrderType.FOK and available < order.size:
+            return 0.0, 0.0
+
+        size = min(order.size, available)
+        if size <= 0:
+            return 0.0, 0.0
+
+        # The last level the fill reaches into
+        last = int(np.searchsorted(cum_sizes, size, side='left'))
+        size_before = cum_sizes[last - 1] if last else 0.0
+        cost_before = cum_costs[last - 1] if last else 0.0
+        cost = cost_before + (size - size_before) * prices[last]
+
+        if sizes is None:
+            sizes = np.diff(cum_sizes[:last + 1], prepend=0.0)
+        self._consume(book, prices[:last + 1], sizes[:last + 1], size - size_before)
+
+        return float(size), float(cost)
+
+    def _live_consumption(self, book: SyntheticOrderBook, limit: float) -> List[Tuple[float, float]]:
+        """(price, size taken) of the levels up to `limit` still holding liquidity earlier fills took"""
+        consumed = self._consumed.get(book.asset_id)
+        if not consumed:
+            return []
+
+        orders_lookup = book.orders_lookup
+        live, stale = [], []
+        for price, (level, size) in consumed.items():
+            if price > limit:
+                continue
+            # Levels an event has since replaced are back to the exchange's size
+            if orders_lookup.get(price) is level:
+                live.append((price, size))
+            else:
+                stale.append(price)
+        for price in stale:
+            del consumed[price]
+
+        return live
+
+    def _consume(self, book: SyntheticOrderBook, prices: np.ndarray, sizes: np.ndarray, last_size: float):
+        consumed = self._consumed.setdefault(book.asset_id, {})
+        for index, price in enumerate(prices.tolist()):
+            taken = last_size if index == len(prices) - 1 else float(sizes[index])
+            level = book.orders_lookup[price]
+            _, already = consumed.get(price, (level, 0.0))
+            consumed[price] = (level, already + taken)
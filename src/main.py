@@ -1,49 +1,107 @@
 from collections.abc import Callable
-from datetime import datetime
 from typing import Dict, Any, List, Optional
+import atexit
 import json
 import os
 import sys
+import threading
 import traceback
 import asyncio
-from src.strategies import calculate_orders
-from src.services import PolymarketService, PolymarketMarketEventsService
-from src.models import MarketEvent, SyntheticOrderBook, OrderBookStore, Order
-from src.daos import write_marketEvents, write_orderBookStore, write_orders, write_metadata
-from src.utils import datetime_to_epoch, CSVMessageProcessor
+from src.config import config
+from src.strategies import calculate_orders, likely_orders, ArbSizer, OrderEmitter, IntentStatus, StrategyRunner, ExecutionMode
+from src.services import PolymarketService, PolymarketMarketEventsService, get_http_client
+from src.models import MarketEvent, SyntheticOrderBook, OrderBookStore, OrdersStore, Order
+from src.daos import write_marketEvents, write_orderBookStore, write_orders, write_metadata, BufferedCSVWriter, BufferedParquetWriter, RotatingCompressedWriter, SQLiteEventStore, set_csv_writer, OrderBookDeltaEncoder, EventFileWriter, set_event_file_writer
+from src.utils import CSVMessageProcessor, VirtualClock, set_clock, get_clock
+from src.utils.compressed_files import segment_paths
 
-class OrdersStore:
-    def __init__(self):
-        self.orders = []
 
-    def add_order(self, order: Order):
-        self.orders.append(order)
-
-    def add_orders(self, orders: List[Order]):
-        self.orders.extend(orders)
+def parse_market_events(orderBook_store: OrderBookStore, events: List[Dict[str, Any]]) -> List[MarketEvent]:
+    """
+    Builds the book and price change events of a websocket message for a
+    market's books. Recorded messages, replayed from CSVs or event files,
+    don't keep the market's condition ID, so the slug stands in for it.
+    """
+    #TODO: Refactor, this is ugly
+    return [MarketEvent.from_dict(
+        {**market_eventdict,
+         "market": market_eventdict.get("market") or orderBook_store.market_slug,
+         "market_slug": orderBook_store.market_slug,
+         "market_id": orderBook_store.market_id,
+         "outcome_name": orderBook_store.lookup(market_eventdict["asset_id"]).outcome_name}
+    ) for market_eventdict in events
+    if market_eventdict["event_type"] == "book"
+        or market_eventdict["event_type"] == "price_change" ]
 
 
 # TODO: Could use the same pattern as OrderBuilder in polymarket_arb
-def get_order_message_register(orderBook_store: OrderBookStore, order_store: OrdersStore, test_mode: bool = False) -> Callable:
+def get_order_message_register(orderBook_store: OrderBookStore, order_store: OrdersStore, test_mode: bool = False, order_emitter: Optional[OrderEmitter] = None, strategy_runner: Optional[StrategyRunner] = None, book_encoder: Optional[OrderBookDeltaEncoder] = None, order_executor: Optional[Any] = None) -> Callable:
+    """
+    Builds the websocket message handler for a market. When an order_emitter
+    is given, only new or changed orders are stored and written, rather than
+    every order the strategy returns on every message.
+
+    Strategies run through strategy_runner when one is given, otherwise the
+    handler runs calculate_orders directly. Orders of the runner's worker
+    strategies are stored and written the same way, from their threads,
+    unless the runner already has an on_orders callback. The emitter keeps
+    each strategy's intents apart, so the handler only updates those of the
+    strategies that ran inline.
+
+    With a book_encoder, only the book levels that changed are written,
+    with periodic keyframes, instead of every level on every message.
+
+    With an order_executor (an OrderExecutor, see build_order_executor), the
+    arb's likely_orders are pre-signed after every update, so placing them
+    once an arb opens doesn't wait for signing.
+    """
+    # Worker strategies record their orders from their own threads
+    orders_lock = threading.Lock()
+
+    def record_orders(orders: List[Order], strategy_name: str = '') -> List[Order]:
+        """Stores a strategy's orders, through the emitter if any, returning those to write"""
+        if order_emitter is None:
+            with orders_lock:
+                order_store.add_orders(orders)
+            return orders
+
+        with orders_lock:
+            intents = order_emitter.update(orderBook_store.market_slug, orders, strategy_name)
+            for intent in intents:
+                order_store.add_order(intent.order, state=intent.status)
+        orders = [intent.order for intent in intents if intent.status != IntentStatus.CANCELLED]
+        cancelled = len(intents) - len(orders)
+        if cancelled:
+            print(f"Cancelled {cancelled} order intents for {orderBook_store.market_slug}")
+        return orders
+
+    def on_worker_orders(strategy_name: str, orders: List[Order]):
+        now = get_clock().now()
+        write_orders(
+            market_slug=orderBook_store.market_slug,
+            orders=record_orders(orders, strategy_name),
+            datetime=now,
+            test_mode=test_mode
+        )
+
+    if strategy_runner is not None and strategy_runner.on_orders is None:
+        strategy_runner.on_orders = on_worker_orders
+
     def handler(events: List[Dict[str, Any]]):
         try:
-            now = datetime.now()
-            #TODO: Refactor, this is ugly
-            market_events = [MarketEvent.from_dict(
-                {**market_eventdict,
-                 "market_slug": orderBook_store.market_slug,
-                 "market_id": orderBook_store.market_id,
-                 "outcome_name": orderBook_store.lookup(market_eventdict["asset_id"]).outcome_name}
-            ) for market_eventdict in events
-            if market_eventdict["event_type"] == "book"
-                or market_eventdict["event_type"] == "price_change" ]
+            now = get_clock().now()
+            market_events = parse_market_events(orderBook_store, events)
 
             book_store = orderBook_store.update_book(market_events)
             book_a, book_b = book_store.books
 
             # TODO: Rename to make it clear this is strategy execution
-            orders = calculate_orders(book_a, book_b)
-            order_store.add_orders(orders)
+            if strategy_runner is not None:
+                # Only inline strategies: worker ones record their own orders
+                strategy_orders = strategy_runner.on_book_update_by_strategy(book_a, book_b)
+                orders = [order for name, orders in strategy_orders.items() for order in record_orders(orders, name)]
+            else:
+                orders = record_orders(calculate_orders(book_a, book_b))
 
             write_marketEvents(
                 market_slug=book_store.market_slug,
@@ -56,7 +114,8 @@ def get_order_message_register(orderBook_store: OrderBookStore, order_store: Ord
                 market_slug=book_store.market_slug,
                 orderBook_store=book_store,
                 datetime=now,
-                test_mode=test_mode
+                test_mode=test_mode,
+                encoder=book_encoder
             )
             write_orders(
                 market_slug=book_store.market_slug,
@@ -64,6 +123,9 @@ def get_order_message_register(orderBook_store: OrderBookStore, order_store: Ord
                 datetime=now,
                 test_mode=test_mode
             )
+
+            if order_executor is not None:
+                order_executor.presign_polymarket_orders(likely_orders(book_a, book_b), source=book_store.market_slug)
         except Exception:
             print("ERROR ERROR ERROR")
             print(traceback.format_exc())
@@ -71,24 +133,86 @@ def get_order_message_register(orderBook_store: OrderBookStore, order_store: Ord
     return handler
 
 
-async def run_market_connection(market_slug: str, csv_file_path: Optional[str] = None):
+def build_strategy_runner() -> StrategyRunner:
+    """
+    The live strategies: the arb strategy, run inline in the message handler
+    or on its own worker thread as ARB_EXECUTION_MODE says, and timed against
+    ARB_LATENCY_BUDGET_MS. ARB_SIZING picks how it sizes orders: ladder pairs
+    ask levels one at a time with calculate_orders, depth sizes a single order
+    per outcome on both books' cumulative depth with ArbSizer.
+    """
+    sizing = config.ARB_SIZING.lower()
+    if sizing == 'ladder':
+        strategy = calculate_orders
+    elif sizing == 'depth':
+        strategy = ArbSizer()
+    else:
+        raise ValueError(f"Unknown ARB_SIZING {config.ARB_SIZING}, expected ladder or depth")
+
+    strategy_runner = StrategyRunner()
+    strategy_runner.register(
+        'polymarket_arb',
+        strategy,
+        latency_budget_ms=config.ARB_LATENCY_BUDGET_MS,
+        mode=ExecutionMode(config.ARB_EXECUTION_MODE.upper())
+    )
+    return strategy_runner
+
+
+def build_orders_store() -> OrdersStore:
+    """
+    A market's in-memory orders, bounded by ORDERS_STORE_MAX_ORDERS and
+    ORDERS_STORE_MAX_AGE_MS. Evicted orders aren't spilled anywhere, as the
+    handler already writes every order with write_orders when it stores it.
+    """
+    return OrdersStore(max_orders=config.ORDERS_STORE_MAX_ORDERS, max_age=config.ORDERS_STORE_MAX_AGE_MS)
+
+
+def build_order_executor() -> Optional[Any]:
+    """
+    The OrderExecutor live handlers pre-sign likely orders with when
+    PRESIGN_ORDERS is set, otherwise None. Pre-signing is opt-in, as it needs
+    py-clob-client and Polymarket credentials.
+    """
+    if not config.PRESIGN_ORDERS:
+        return None
+
+    # Imported here, as signing needs py-clob-client
+    from src.services.order_executor import OrderExecutor
+    order_executor = OrderExecutor()
+    if not order_executor.is_polymarket_available():
+        print("PRESIGN_ORDERS is set but the Polymarket order service is unavailable, not pre-signing orders")
+        return None
+    return order_executor
+
+
+async def run_market_connection(market_slug: str, csv_file_path: Optional[str] = None, order_executor: Optional[Any] = None):
     """
     Run a single market connection asynchronously.
 
     Args:
         market_slug: The market slug identifier
         csv_file_path: Optional path to CSV file for testing. If provided, runs from CSV data instead of websocket.
+        order_executor: Optional OrderExecutor to pre-sign the market's likely orders with, see build_order_executor
     """
+    previous_clock = get_clock()
     try:
         print(f"Starting market connection for {market_slug}")
 
         # Determine if we're running in test mode (from CSV)
         test_mode = csv_file_path is not None
 
-        market_metadata = PolymarketService().get_market_by_slug(market_slug)
+        # Replays run on recorded event time rather than wall time, so they
+        # can go as fast as the events can be handled
+        clock = None
+        if test_mode:
+            clock = VirtualClock(CSVMessageProcessor(csv_file_path, []).first_timestamp() or 0)
+            set_clock(clock)
+
+        market_metadata = await PolymarketService().get_market_by_slug_async(market_slug)
 
         if market_metadata:
-            timestamp = datetime_to_epoch(datetime.now())
+            timestamp = get_clock().timestamp()
             books = [
                 SyntheticOrderBook(market_slug, market_metadata['id'], outcome_name, asset_id, timestamp)
                 for asset_id, outcome_name
@@ -96,12 +220,13 @@ async def run_market_connection(market_slug: str, csv_file_path: Optional[str] =
             ]
 
             book_store = OrderBookStore(market_slug, market_metadata['id'], books)
-            order_store = OrdersStore()
-            message_handler = get_order_message_register(book_store, order_store, test_mode=test_mode)
+            order_store = build_orders_store()
+            strategy_runner = build_strategy_runner()
+            message_handler = get_order_message_register(book_store, order_store, test_mode=test_mode, order_emitter=OrderEmitter(), strategy_runner=strategy_runner, book_encoder=OrderBookDeltaEncoder(), order_executor=order_executor)
 
             # Write metadata at the start of the run (only for live system, not CSV mode)
             if not test_mode:
-                executed_at = datetime.now()
+                executed_at = get_clock().now()
                 write_metadata(
                     market_slug=market_slug,
                     market_id=market_metadata['id'],
@@ -112,8 +237,11 @@ async def run_market_connection(market_slug: str, csv_file_path: Optional[str] =
             if test_mode:
                 # Run from CSV file
                 print(f"Running from CSV file: {csv_file_path}")
-                csv_processor = CSVMessageProcessor(csv_file_path, [message_handler])
+                csv_processor = CSVMessageProcessor(csv_file_path, [message_handler], streaming=True, clock=clock, cache=True)
                 csv_processor.run()
+                strategy_runner.shutdown()
+                # Test mode runs each market on its own loop, whose connections close with it
+                await get_http_client().aclose()
                 print(f"Completed CSV processing for {market_slug}")
             else:
                 # Run from websocket (original behavior)
@@ -124,6 +252,8 @@ async def run_market_connection(market_slug: str, csv_file_path: Optional[str] =
     except Exception as e:
         print(f"Error in market connection {market_slug}: {e}")
         traceback.print_exc()
+    finally:
+        set_clock(previous_clock)
 
 
 def extract_market_slug_from_filename(filename: str) -> str:
@@ -159,6 +289,29 @@ def get_csv_file_path(filename: str) -> str:
 
 
 if __name__ == "__main__":
+    # Keep the DAOs' files open and write rows off the event loop; whatever
+    # is still buffered is written on exit. STORAGE_BACKEND=parquet stores
+    # the same datasets as Parquet under data/parquet instead of CSV, and
+    # gzip or zstd as rotating compressed CSV segments, and sqlite in
+    # data/signaldrift.db
+    storage_backend = os.environ.get('STORAGE_BACKEND', 'csv').lower()
+    if storage_backend == 'parquet':
+        csv_writer = BufferedParquetWriter()
+    elif storage_backend in ('gzip', 'zstd'):
+        csv_writer = RotatingCompressedWriter(compression=storage_backend)
+    elif storage_backend == 'sqlite':
+        csv_writer = SQLiteEventStore()
+    else:
+        csv_writer = BufferedCSVWriter()
+    set_csv_writer(csv_writer)
+    atexit.register(csv_writer.close)
+
+    # Market events also go to binary event files for replay and analysis,
+    # buffered and written off the event loop like the CSVs
+    event_file_writer = EventFileWriter()
+    set_event_file_writer(event_file_writer)
+    atexit.register(event_file_writer.close)
+
     # Check if CSV file is provided via environment variable or command line
     csv_filename = os.environ.get('CSV_FILE')
 
@@ -171,8 +324,8 @@ if __name__ == "__main__":
             print(f"Running in test mode from CSV file: {csv_file_path}")
             print(f"Market slug: {market_slug}")
 
-            # Validate file exists
-            if not os.path.exists(csv_file_path):
+            # Validate file exists, either whole or as compressed segments
+            if not segment_paths(csv_file_path):
                 print(f"Error: CSV file not found: {csv_file_path}")
                 print(f"Make sure the file exists in the data directory.")
                 sys.exit(1)
@@ -219,12 +372,17 @@ if __name__ == "__main__":
             "mlb-cin-bos-2025-07-01"
         ]
 
+        # One executor, and its signing pool, pre-signs for every market
+        order_executor = build_order_executor()
+        if order_executor is not None:
+            atexit.register(order_executor.close)
+
         # Create async tasks for all market connections
         async def run_all_connections():
             # Create all market connection tasks
             tasks = []
             for market_slug in market_slugs:
-                task = asyncio.create_task(run_market_connection(market_slug))
+                task = asyncio.create_task(run_market_connection(market_slug, order_executor=order_executor))
                 tasks.append(task)
 
             print(f"Started {len(tasks)} market connections")
@@ -240,6 +398,8 @@ if __name__ == "__main__":
                         task.cancel()
                 # Wait for all tasks to finish cancellation
                 await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                await get_http_client().aclose()
 
         # Run the async function
         asyncio.run(run_all_connections())
@@ -0,0 +1,267 @@
+"""
+A local stand-in for the Polymarket CLOB's order endpoints, to measure and
+tune order submission without touching the real exchange.
+
+It answers POST /order and POST /orders like the CLOB does, after a
+configurable latency. A configurable share of requests fails with a 500,
+and each order is filled with a configurable probability. Unfilled FOK and
+FAK orders are killed, while other order types rest on the book. Also
+served are the endpoints py-clob-client calls before it can place orders:
+API key creation and derivation, tick size, neg risk and fee rate. So
+PolymarketOrderService and OrderExecutor run against it unchanged, as do
+PolymarketService.place_*.
+
+Point them at it through POLYMARKET_CLOB_API:
+
+    python -m src.mock_clob --port 8080 --latency-ms 50 --error-rate 0.01 --fill-rate 0.9
+    POLYMARKET_CLOB_API=http://127.0.0.1:8080 make start
+
+Any private key and proxy address work, no signature is checked.
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+from src.config import config
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+API_CREDS = {
+    'apiKey': 'mock-clob-api-key',
+    'secret': base64.urlsafe_b64encode(b'mock-clob-secret').decode(),
+    'passphrase': 'mock-clob-passphrase',
+}
+
+KILLED_ORDER_TYPES = ('FOK', 'FAK')
+
+
+@dataclass
+class MockClobSettings:
+    latency_ms: float = 0.0
+    """Delay before each request is answered"""
+    jitter_ms: float = 0.0
+    """Up to this much more delay, drawn uniformly for each request"""
+    error_rate: float = 0.0
+    """Share of order requests answered with a 500"""
+    fill_rate: float = 1.0
+    """Share of orders filled in full; the others are killed or rest on the book"""
+    seed: Optional[int] = None
+    max_batch_orders: int = config.CLOB_MAX_BATCH_ORDERS
+    """Orders accepted per POST /orders request; larger batches get a 400"""
+
+
+@dataclass
+class MockClobStats:
+    requests: int = 0
+    """Order requests, to /order and /orders"""
+    errors: int = 0
+    orders: int = 0
+    filled: int = 0
+    connections: Set[Tuple[str, int]] = field(default_factory=set)
+    """Client addresses order requests came from, one per connection"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keeps connections open between requests, like the CLOB
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes, which Nagle's algorithm would hold back for the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/auth/derive-api-key':
+            self._answer(200, API_CREDS)
+        elif path == '/tick-size':
+            self._answer(200, {'minimum_tick_size': 0.01})
+        elif path == '/neg-risk':
+            self._answer(200, {'neg_risk': True})
+        elif path == '/fee-rate':
+            self._answer(200, {'base_fee': 0})
+        else:
+            self._answer(404, {'error': f"Not found: {path}"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        if path == '/auth/api-key':
+            self._answer(200, API_CREDS)
+            return
+        if path not in ('/order', '/orders'):
+            self._answer(404, {'error': f"Not found: {path}"})
+            return
+
+        status, result = self.server.exchange.place(path, body, self.client_address)
+        self._answer(status, result)
+
+    def _answer(self, status: int, result: Any):
+        payload = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    exchange: 'MockClobServer'
+
+
+class MockClobServer:
+    """
+    Serves the mock CLOB on a background thread, each request on its own
+    thread so concurrent requests overlap as they would on the exchange.
+    Port 0 picks a free port; `url` is where it listens.
+    """
+
+    def __init__(self, settings: Optional[MockClobSettings] = None, host: str = '127.0.0.1', port: int = 0):
+        self.settings = settings if settings is not None else MockClobSettings()
+        self.stats = MockClobStats()
+        self._random = random.Random(self.settings.seed)
+        self._order_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.exchange = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockClobServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-clob', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def join(self):
+        """Blocks until the server is stopped"""
+        self._thread.join()
+
+    def __enter__(self) -> 'MockClobServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def place(self, path: str, body: bytes, client_address: Tuple[str, int]) -> Tuple[int, Any]:
+        """The status and response of an order request, answered after the configured latency"""
+        settings = self.settings
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.connections.add(client_address)
+            delay = settings.latency_ms + self._random.uniform(0, settings.jitter_ms)
+            failed = self._random.random() < settings.error_rate
+            if failed:
+                self.stats.errors += 1
+
+        time.sleep(delay / 1000)
+
+        if failed:
+            return 500, {'error': "Internal server error"}
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {'error': "Invalid JSON body"}
+
+        if path == '/order':
+            if not isinstance(payload, dict) or 'order' not in payload:
+                return 400, {'error': "Invalid order payload"}
+            return 200, self._fill(payload)
+
+        if not isinstance(payload, list) or not all(isinstance(p, dict) and 'order' in p for p in payload):
+            return 400, {'error': "Invalid orders payload"}
+        max_batch_orders = self.settings.max_batch_orders
+        if len(payload) > max_batch_orders:
+            return 400, {'error': f"Too many orders in payload: {len(payload)}, max allowed: {max_batch_orders}"}
+        return 200, [self._fill(order_payload) for order_payload in payload]
+
+    def _fill(self, order_payload: Dict[str, Any]) -> Dict[str, Any]:
+        order = order_payload['order']
+        with self._lock:
+            order_id = f"0x{next(self._order_ids):064x}"
+            filled = self._random.random() < self.settings.fill_rate
+            self.stats.orders += 1
+            if filled:
+                self.stats.filled += 1
+
+        if filled:
+            return {
+                'success': True,
+                'errorMsg': '',
+                'orderID': order_id,
+                'status': 'matched',
+                'makingAmount': str(order.get('makerAmount', '')),
+                'takingAmount': str(order.get('takerAmount', '')),
+                'transactionsHashes': [order_id],
+            }
+        if order_payload.get('orderType') in KILLED_ORDER_TYPES:
+            return {
+                'success': False,
+                'errorMsg': "order couldn't be fully filled. FOK orders are fully filled or killed.",
+                'orderID': order_id,
+                'status': 'unmatched',
+                'transactionsHashes': [],
+            }
+        return {
+            'success': True,
+            'errorMsg': '',
+            'orderID': order_id,
+            'status': 'live',
+            'transactionsHashes': [],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Polymarket CLOB's order endpoints")
+    parser.add_argument("--host", default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on, 0 for any free one (default: 8080)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before each request is answered")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Up to this much more delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of order requests answered with a 500")
+    parser.add_argument("--fill-rate", type=float, default=1.0, help="Share of orders filled")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible errors and fills")
+    parser.add_argument("--max-batch-orders", type=int, default=config.CLOB_MAX_BATCH_ORDERS,
+                        help=f"Orders accepted per batch request (default: CLOB_MAX_BATCH_ORDERS, {config.CLOB_MAX_BATCH_ORDERS})")
+    args = parser.parse_args()
+
+    settings = MockClobSettings(args.latency_ms, args.jitter_ms, args.error_rate, args.fill_rate, args.seed, args.max_batch_orders)
+    server = MockClobServer(settings, args.host, args.port)
+    print(f"Mock CLOB listening on {server.url}")
+    print(f"Point services at it with POLYMARKET_CLOB_API={server.url}")
+    try:
+        server.start()
+        server.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats
+        print(f"\n{stats.requests} order requests ({stats.errors} failed), {stats.orders} orders ({stats.filled} filled) "
+              f"over {len(stats.connections)} connections")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
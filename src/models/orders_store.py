@@ -0,0 +1,127 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from src.models import Order
+
+
+class OrdersStore:
+    """
+    Bounded in-memory store of the orders emitted during a session.
+
+    Holds at most `max_orders` orders and, when `max_age` (ms) is set, only
+    orders within `max_age` of the newest one. Older orders are evicted in
+    arrival order and handed to `spill` (e.g. a DAO writer) if one is given.
+
+    Adding is append only. The asset, time and state indexes catch up with
+    new orders on the next lookup, so lookups are O(log n + k) without
+    slowing down the message handler.
+    """
+
+    def __init__(self,
+                 max_orders: Optional[int] = 10_000,
+                 max_age: Optional[int] = None,
+                 spill: Optional[Callable[[List[Order]], None]] = None):
+        self.max_orders = max_orders
+        self.max_age = max_age
+        self.spill = spill
+
+        # Every order gets a sequence number; _orders[i] has seq _first_seq + i - _head
+        self._orders: List[Order] = []
+        self._states: List[Optional[Hashable]] = []
+        self._head = 0
+        self._first_seq = 0
+        self._indexed_seq = 0
+        self._index_base_seq = 0
+        self._newest_timestamp: Optional[int] = None
+
+        self._by_asset: Dict[str, List[int]] = {}
+        self._by_state: Dict[Optional[Hashable], List[int]] = {}
+        self._by_time: List[Tuple[int, int]] = []
+
+    @property
+    def orders(self) -> List[Order]:
+        return self._orders[self._head:]
+
+    def __len__(self) -> int:
+        return len(self._orders) - self._head
+
+    def add_order(self, order: Order, state: Optional[Hashable] = None):
+        self.add_orders([order], state)
+
+    def add_orders(self, orders: List[Order], state: Optional[Hashable] = None):
+        self._orders.extend(orders)
+        self._states.extend([state] * len(orders))
+
+        if self.max_age is not None and orders:
+            newest = max(order.timestamp for order in orders)
+            if self._newest_timestamp is None or newest > self._newest_timestamp:
+                self._newest_timestamp = newest
+
+        self._evict()
+
+    def lookup_asset(self, asset_id: str) -> List[Order]:
+        self._catch_up()
+        return self._resolve(self._by_asset.get(asset_id, []))
+
+    def lookup_state(self, state: Optional[Hashable]) -> List[Order]:
+        self._catch_up()
+        return self._resolve(self._by_state.get(state, []))
+
+    def lookup_time(self, start: int, end: int) -> List[Order]:
+        """Orders with start <= timestamp <= end, in timestamp order"""
+        self._catch_up()
+        lo = bisect_left(self._by_time, (start, -1))
+        hi = bisect_right(self._by_time, (end, float('inf')))
+        return [self._get(seq) for _, seq in self._by_time[lo:hi] if seq >= self._first_seq]
+
+    def _get(self, seq: int) -> Order:
+        return self._orders[self._head + seq - self._first_seq]
+
+    def _resolve(self, seqs: List[int]) -> List[Order]:
+        # Drop evicted sequence numbers from the front of the index as we go
+        live = bisect_left(seqs, self._first_seq)
+        del seqs[:live]
+        return [self._get(seq) for seq in seqs]
+
+    def _catch_up(self):
+        # Rebuild from the live orders once evicted entries outnumber them
+        stale = min(self._indexed_seq, self._first_seq) - self._index_base_seq
+        if stale > len(self) + 64:
+            self._by_asset, self._by_state, self._by_time = {}, {}, []
+            self._indexed_seq = self._index_base_seq = self._first_seq
+
+        end_seq = self._first_seq + len(self)
+        if self._indexed_seq < self._first_seq:
+            self._indexed_seq = self._first_seq
+        for seq in range(self._indexed_seq, end_seq):
+            index = self._head + seq - self._first_seq
+            order = self._orders[index]
+            self._by_asset.setdefault(order.asset_id, []).append(seq)
+            self._by_state.setdefault(self._states[index], []).append(seq)
+            insort(self._by_time, (order.timestamp, seq))
+        self._indexed_seq = end_seq
+
+    def _evict(self):
+        evict_to = self._head
+        if self.max_orders is not None:
+            evict_to = max(evict_to, len(self._orders) - self.max_orders)
+
+        if self.max_age is not None and self._newest_timestamp is not None:
+            cutoff = self._newest_timestamp - self.max_age
+            while evict_to < len(self._orders) and self._orders[evict_to].timestamp < cutoff:
+                evict_to += 1
+
+        if evict_to <= self._head:
+            return
+
+        evicted = self._orders[self._head:evict_to]
+        self._first_seq += evict_to - self._head
+        self._head = evict_to
+
+        # Compact once the evicted prefix is most of the list
+        if self._head > len(self._orders) // 2:
+            del self._orders[:self._head]
+            del self._states[:self._head]
+            self._head = 0
+
+        if self.spill is not None:
+            self.spill(evicted)
@@ -1,4 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_left, insort
+import numpy as np
 from src.models import OrderSide
 from dataclasses import dataclass, asdict
 
@@ -27,20 +29,52 @@ class SyntheticOrderBook:
     def set_timestamp(self, timestamp: int):
         self.timestamp = timestamp
 
+    @property
+    def orders_lookup(self) -> Dict[float, SyntheticOrder]:
+        return self._orders_lookup
+
+    @orders_lookup.setter
+    def orders_lookup(self, orders_lookup: Dict[float, SyntheticOrder]):
+        self._orders_lookup = orders_lookup
+        # Prices kept in ascending order so the top of the book can be read
+        # without sorting every level on each update
+        self._prices = sorted(orders_lookup)
+        self._depth: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
     @property
     def orders(self) -> List[SyntheticOrder]:
         return list(self.orders_lookup.values())
 
     def sorted_orders(self) -> List[SyntheticOrder]:
-        return sorted(self.orders, key=lambda order: order.price)
+        return [self._orders_lookup[price] for price in self._prices]
+
+    def top_orders(self, depth: int) -> List[SyntheticOrder]:
+        """Returns the `depth` cheapest orders, sorted by price"""
+        return [self._orders_lookup[price] for price in self._prices[:depth]]
+
+    def depth_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (prices, cumulative sizes, cumulative costs) of the asks in
+        ascending price order. Computed once per book change.
+        """
+        if self._depth is None:
+            prices = np.fromiter(self._prices, dtype=float, count=len(self._prices))
+            sizes = np.fromiter((self._orders_lookup[price].size for price in self._prices), dtype=float, count=len(self._prices))
+            self._depth = (prices, np.cumsum(sizes), np.cumsum(prices * sizes))
+
+        return self._depth
 
     def add_entries(self, orders: List[SyntheticOrder]):
         for order in orders:
             if order.side == OrderSide.SELL:
+                self._depth = None
                 if order.size == 0.0:
-                    self.orders_lookup.pop(order.price, None)
+                    if self._orders_lookup.pop(order.price, None) is not None:
+                        del self._prices[bisect_left(self._prices, order.price)]
                 else:
-                    self.orders_lookup[order.price] = order
+                    if order.price not in self._orders_lookup:
+                        insort(self._prices, order.price)
+                    self._orders_lookup[order.price] = order
 
     def replace_entries(self, orders: List[SyntheticOrder]):
         self.orders_lookup = {
@@ -49,6 +83,13 @@ class SyntheticOrderBook:
             if order.size > 0
         }
 
+    def snapshot(self) -> 'SyntheticOrderBook':
+        """Copy of the book that later updates to this one won't touch"""
+        book = SyntheticOrderBook(self.market_slug, self.market_id, self.outcome_name, self.asset_id, self.timestamp)
+        book._orders_lookup = dict(self._orders_lookup)
+        book._prices = list(self._prices)
+        return book
+
     def asdict_rows(self) -> List[Dict[str, Any]]:
         """Creates dict for reach order"""
         return [{**order.asdict(),
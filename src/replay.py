@@ -0,0 +1,248 @@
+"""
+Replays the recorded market events of several markets as one session, the
+way the live runner in main.py sees them: every market's events are merged
+into a single stream in timestamp order and each message goes through that
+market's handler, book store and strategies.
+
+Usage:
+    make replay DATE=20250701
+    python -m src.replay 20250701
+    python -m src.replay 'data/2025062*_polymarket-market-events.csv'
+"""
+
+import argparse
+import glob
+import heapq
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from src.main import get_order_message_register, build_orders_store
+from src.models import SyntheticOrderBook, OrderBookStore, OrdersStore
+from src.strategies import OrderEmitter, StrategyRunner, ArbScanner, ArbOpportunity
+from src.daos import OrderBookDeltaEncoder
+from src.utils import CSVMessageProcessor, VirtualClock, set_clock, get_clock
+from src.utils.compressed_files import iter_csv_rows
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+EVENTS_SUFFIX = '_polymarket-market-events.csv'
+METADATA_SUFFIX = '_market-metadata.csv'
+
+_DATE = re.compile(r'^\d{8}$')
+
+
+def find_event_files(pattern: str, data_dir: str = DATA_DIR) -> List[str]:
+    """
+    Market event files matching a date, e.g. 20250701, or a glob. Globs
+    without a directory are matched inside data_dir. Test mode outputs
+    (..._test.csv) are never included.
+    """
+    if _DATE.match(pattern):
+        pattern = os.path.join(data_dir, f"{pattern}_*{EVENTS_SUFFIX}")
+    elif not os.path.dirname(pattern):
+        pattern = os.path.join(data_dir, pattern)
+
+    return sorted(path for path in glob.glob(pattern) if path.endswith(EVENTS_SUFFIX))
+
+
+def market_slug_from_path(csv_file_path: str) -> str:
+    """data/20250701_mlb-cin-bos-2025-07-01_polymarket-market-events.csv -> mlb-cin-bos-2025-07-01"""
+    return os.path.basename(csv_file_path)[:-len(EVENTS_SUFFIX)].split('_', 1)[1]
+
+
+def market_book_store(csv_file_path: str, outcomes: int = 2) -> OrderBookStore:
+    """
+    Builds a market's book store from its own event rows, so no market
+    metadata has to be fetched: reads rows until `outcomes` assets are seen.
+    Older files don't record outcome names or market IDs; they are taken
+    from the market metadata file alongside when there is one, else the
+    asset ID is used as the outcome name and the market ID is left None.
+    """
+    market_slug = market_slug_from_path(csv_file_path)
+    market_id = None
+    books: Dict[str, SyntheticOrderBook] = {}
+
+    outcome_names: Dict[str, str] = {}
+    metadata_path = csv_file_path[:-len(EVENTS_SUFFIX)] + METADATA_SUFFIX
+    if os.path.exists(metadata_path):
+        for row in iter_csv_rows(metadata_path, quotechar='|'):
+            outcome_names[row['asset_id']] = row['outcome_name']
+            market_id = int(row['market_id'])
+
+    for row in iter_csv_rows(csv_file_path, quotechar='|'):
+        if not row.get('asset_id') or not row.get('timestamp'):
+            continue
+        # Older files have empty or float formatted market IDs
+        if market_id is None and row.get('market_id'):
+            market_id = int(float(row['market_id']))
+        if row['asset_id'] not in books:
+            outcome_name = row.get('outcome_name') or outcome_names.get(row['asset_id'], row['asset_id'])
+            books[row['asset_id']] = SyntheticOrderBook(market_slug, market_id, outcome_name, row['asset_id'], int(row['timestamp']))
+        if len(books) == outcomes:
+            break
+
+    for book in books.values():
+        book.market_id = market_id
+
+    return OrderBookStore(market_slug, market_id, list(books.values()))
+
+
+def merge_message_groups(processors: List[CSVMessageProcessor]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    K-way merges the websocket messages of each message group of several
+    files by timestamp, yielding (index of the processor, messages). Groups
+    with equal timestamps come out in processor order.
+    """
+    streams = [_tagged(index, processor.websocket_message_groups()) for index, processor in enumerate(processors)]
+    return heapq.merge(*streams, key=lambda item: item[1][0]['timestamp'])
+
+
+def _tagged(index: int, groups: Iterator[List[Dict[str, Any]]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    for group in groups:
+        yield index, group
+
+
+@dataclass
+class ReplayStats:
+    message_groups: Dict[str, int] = field(default_factory=dict)
+    arb_message_groups: Dict[str, int] = field(default_factory=dict)
+    """Message groups of the session after which the market's best asks summed below $1"""
+    best_arb: Optional[ArbOpportunity] = None
+    """The arb with the highest expected profit seen across every market"""
+    first_timestamp: Optional[int] = None
+    last_timestamp: Optional[int] = None
+    seconds: float = 0.0
+
+    @property
+    def total_message_groups(self) -> int:
+        return sum(self.message_groups.values())
+
+
+class MultiMarketReplay:
+    """
+    Drives the book stores and strategies of several markets from their
+    recorded event files in one chronological session.
+
+    Each market gets the same handler, order emitter and book encoder as
+    in run_market_connection, and writes its outputs in test mode. The
+    session runs on a VirtualClock advanced to each message group's
+    timestamp, so orders and output files carry event time. Only
+    one message group per file is held in memory besides the reorder
+    window of each file. Each file's messages are cached next to it, so
+    replaying it again skips parsing it.
+
+    The best asks of every two-outcome market are also kept in an
+    ArbScanner, which scans all the markets for arbs after each message
+    group in one vectorized pass.
+
+    Args:
+        csv_file_paths: Market event files, see find_event_files
+        strategy_runner_factory: Called with each market slug to build that
+            market's StrategyRunner; without one, markets run calculate_orders
+    """
+
+    def __init__(self,
+                 csv_file_paths: List[str],
+                 strategy_runner_factory: Optional[Callable[[str], StrategyRunner]] = None,
+                 reorder_window_ms: int = 1000):
+        self.processors: List[CSVMessageProcessor] = []
+        self.scanner = ArbScanner()
+        self.book_stores: List[OrderBookStore] = []
+        self.order_stores: List[OrdersStore] = []
+        self.handlers: List[Callable] = []
+        self.clock = VirtualClock()
+
+        for csv_file_path in csv_file_paths:
+            book_store = market_book_store(csv_file_path)
+            if book_store.market_id is None:
+                logger.warning(f"Skipping {csv_file_path}: no market ID, see utils/fix_missing_market_id.py")
+                continue
+
+            order_store = build_orders_store()
+            strategy_runner = strategy_runner_factory(book_store.market_slug) if strategy_runner_factory else None
+
+            self.processors.append(CSVMessageProcessor(csv_file_path, [], streaming=True, reorder_window_ms=reorder_window_ms, cache=True))
+            self.book_stores.append(book_store)
+            self.order_stores.append(order_store)
+            if len(book_store.books) == self.scanner.num_outcomes:
+                self.scanner.register(book_store)
+            self.handlers.append(get_order_message_register(
+                book_store,
+                order_store,
+                test_mode=True,
+                order_emitter=OrderEmitter(),
+                strategy_runner=strategy_runner,
+                book_encoder=OrderBookDeltaEncoder()
+            ))
+
+    def run(self) -> ReplayStats:
+        stats = ReplayStats(message_groups={book_store.market_slug: 0 for book_store in self.book_stores},
+                            arb_message_groups={market_slug: 0 for market_slug, _, _ in self.scanner.markets})
+        start = time.perf_counter()
+
+        previous_clock = get_clock()
+        set_clock(self.clock)
+        try:
+            for index, messages in merge_message_groups(self.processors):
+                book_store = self.book_stores[index]
+                timestamp = messages[0]['timestamp']
+                self.clock.advance_to(timestamp)
+                self.handlers[index](messages)
+
+                if book_store.market_slug in stats.arb_message_groups:
+                    self.scanner.update(book_store)
+                    self._record_arbs(stats, self.scanner.scan())
+
+                stats.message_groups[book_store.market_slug] += 1
+                if stats.first_timestamp is None:
+                    stats.first_timestamp = timestamp
+                stats.last_timestamp = timestamp
+        finally:
+            set_clock(previous_clock)
+
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    def _record_arbs(stats: ReplayStats, opportunities: List[ArbOpportunity]):
+        for opportunity in opportunities:
+            stats.arb_message_groups[opportunity.market_slug] += 1
+        # Ranked by expected profit, highest first
+        if opportunities and (stats.best_arb is None or opportunities[0].expected_profit > stats.best_arb.expected_profit):
+            stats.best_arb = opportunities[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the recorded events of several markets as one session")
+    parser.add_argument("pattern", help="A date (YYYYMMDD) or a glob of market event files")
+    parser.add_argument(
+        "--data-dir",
+        default=DATA_DIR,
+        help="Directory dates and bare globs are matched in (default: data)"
+    )
+    args = parser.parse_args()
+
+    csv_file_paths = find_event_files(args.pattern, args.data_dir)
+    if not csv_file_paths:
+        print(f"No market event files match {args.pattern}")
+        return
+
+    print(f"Replaying {len(csv_file_paths)} markets")
+    stats = MultiMarketReplay(csv_file_paths).run()
+
+    for market_slug, message_groups in stats.message_groups.items():
+        print(f"  {market_slug}: {message_groups} message groups, arb open after {stats.arb_message_groups.get(market_slug, 0)}")
+    print(f"Replayed {stats.total_message_groups} message groups in {stats.seconds:.2f}s")
+    if stats.best_arb is not None:
+        best_arb = stats.best_arb
+        print(f"Best arb: {best_arb.market_slug}, edge {best_arb.edge:.4f} on {best_arb.size:g} shares, "
+              f"expected profit {best_arb.expected_profit:.2f}")
+
+
+if __name__ == "__main__":
+    main()
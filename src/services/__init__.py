@@ -1,5 +1,6 @@
+from .http_client import HttpClient, get_http_client, set_http_client
 from .polymarket_service import PolymarketService
 from .polymarket_clob_client import PolymarketClobClient
 from .polymarket_websocket_events_service import PolymarketUserEventsService, PolymarketMarketEventsService
 
-__all__ = ['PolymarketService', 'PolymarketClobClient', 'PolymarketMarketEventsService', 'PolymarketUserEventsService']
+__all__ = ['HttpClient', 'get_http_client', 'set_http_client', 'PolymarketService', 'PolymarketClobClient', 'PolymarketMarketEventsService', 'PolymarketUserEventsService']
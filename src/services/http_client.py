@@ -0,0 +1,133 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import logging
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP connections shared by the REST services.
+
+    Connections to a host are kept open between requests, so only the first
+    request pays DNS, TCP and TLS setup. Requests from coroutines go through
+    an httpx.AsyncClient and never block the event loop; those from plain
+    code go through a pooled httpx.Client. At most max_concurrency requests
+    of either kind are in flight at once, the rest wait their turn rather
+    than opening more connections.
+
+    An AsyncClient's connections belong to the event loop they were opened
+    on, so each loop gets its own, e.g. every asyncio.run of a replay, and
+    they can only be closed while it runs. Await aclose() before a loop
+    finishes; it closes the clients of every loop still running.
+    """
+
+    def __init__(self,
+                 max_connections: int = config.HTTP_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = config.HTTP_KEEPALIVE_EXPIRY,
+                 max_concurrency: int = config.HTTP_MAX_CONCURRENCY,
+                 timeout: float = config.HTTP_TIMEOUT,
+                 connect_timeout: float = config.HTTP_CONNECT_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]] = {}
+
+    def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends a request on a pooled connection, waiting for a free slot first"""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+            client = self._client
+
+        with self._slots:
+            return client.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request('POST', url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends a request on a pooled connection of the running loop, waiting for a free slot first"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            async_client = self._async_clients.get(loop)
+            if async_client is None:
+                self._drop_closed_loops()
+                async_client = (httpx.AsyncClient(limits=self.limits, timeout=self.timeout), asyncio.Semaphore(self.max_concurrency))
+                self._async_clients[loop] = async_client
+        client, slots = async_client
+
+        async with slots:
+            return await client.request(method, url, **kwargs)
+
+    async def aget(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.arequest('GET', url, **kwargs)
+
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.arequest('POST', url, **kwargs)
+
+    async def aclose(self):
+        """
+        Closes the async clients of the running loop and of every other loop
+        still running. Those of loops that aren't running are kept until
+        aclose() is awaited on them.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._drop_closed_loops()
+            closing = [(client_loop, client) for client_loop, (client, _) in self._async_clients.items()
+                       if client_loop is loop or client_loop.is_running()]
+            for client_loop, _ in closing:
+                del self._async_clients[client_loop]
+
+        for client_loop, client in closing:
+            if client_loop is loop:
+                await client.aclose()
+            else:
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), client_loop))
+
+    def close(self):
+        """Closes the connections of the blocking client"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+    def _drop_closed_loops(self):
+        """Forgets the clients of finished loops, whose connections went with them"""
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            logger.warning("Dropping the HTTP client of a closed event loop, aclose() wasn't awaited before it finished")
+            del self._async_clients[loop]
+
+
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """The client services share, created with the configured limits on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+
+def set_http_client(http_client: Optional[HttpClient]):
+    """Shares another client between services, e.g. with other limits; None goes back to the default"""
+    global _http_client
+    _http_client = http_client
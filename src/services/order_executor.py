@@ -5,7 +5,7 @@ This module provides a high-level interface for executing trading orders
 across different platforms, starting with Polymarket.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Hashable, Optional
 import logging
 from src.models import Order
 from services.polymarket_batch_order import PolymarketOrderService
@@ -53,6 +53,41 @@ class OrderExecutor:
         logger.info(f"Executing {len(orders)} orders on Polymarket")
         return self.polymarket_service.execute_orders_from_list(orders, neg_risk=neg_risk)
     
+    def presign_polymarket_orders(self, orders: List[Order], neg_risk: bool = True, source: Optional[Hashable] = None):
+        """
+        Sign Polymarket orders likely to be executed soon ahead of time.
+        
+        Args:
+            orders: List of Order objects, e.g. from likely_orders()
+            neg_risk: Whether this is a negative risk market (binary yes/no)
+            source: What the orders were derived from, e.g. a market slug;
+                its earlier pre-signs that are still queued are dropped
+            
+        Raises:
+            RuntimeError: If Polymarket service is not available
+        """
+        if not self.polymarket_service:
+            raise RuntimeError("Polymarket service is not available. Check environment variables.")
+        
+        self.polymarket_service.presign_orders(orders, neg_risk=neg_risk, source=source)
+    
+    def get_polymarket_batch_stats(self) -> Dict[str, Any]:
+        """
+        Get outcomes and latencies of the order batches submitted so far.
+        
+        Raises:
+            RuntimeError: If Polymarket service is not available
+        """
+        if not self.polymarket_service:
+            raise RuntimeError("Polymarket service is not available. Check environment variables.")
+        
+        return self.polymarket_service.batch_stats.asdict()
+    
+    def close(self):
+        """Stops the services' threads."""
+        if self.polymarket_service:
+            self.polymarket_service.close()
+    
     def is_polymarket_available(self) -> bool:
         """Check if Polymarket service is available."""
         return self.polymarket_service is not None
@@ -0,0 +1,123 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+import logging
+from config import config
+from src.models import Order, OrderSide
+
+logger = logging.getLogger(__name__)
+
+# What a signature covers: the same order signed twice is interchangeable
+SigningKey = Tuple[str, OrderSide, float, float, bool]
+
+
+def signing_key(order: Order, neg_risk: bool) -> SigningKey:
+    return (order.asset_id, order.side, order.price, order.size, neg_risk)
+
+
+class OrderSigner:
+    """
+    Signs orders on a pool of worker threads, so the orders of a batch are
+    signed concurrently rather than one after another.
+
+    Orders likely to be placed soon can be pre-signed in the background.
+    Placing one of them later takes its signature instead of signing it
+    again, so signing is off the path from an opportunity to its
+    submission. Each pre-signed order is used at most once. Only the most
+    recent max_presigned are kept, as orders at older prices are unlikely
+    to come back.
+
+    Pre-signing has its own pool, so orders being placed never wait behind
+    speculative ones. Pre-signs from the same source, e.g. a market's
+    books, that are still queued when the source pre-signs again are
+    dropped, as newer books superseded them.
+    """
+
+    def __init__(self,
+                 sign: Callable[[Order, bool], Any],
+                 max_workers: int = config.ORDER_SIGNING_WORKERS,
+                 max_presigned: int = config.ORDER_MAX_PRESIGNED,
+                 max_presign_workers: int = config.ORDER_PRESIGNING_WORKERS):
+        """
+        Args:
+            sign: Signs one order, e.g. with ClobClient.create_order
+            max_workers: Orders signed at once
+            max_presigned: Pre-signed orders kept until they are used
+            max_presign_workers: Orders pre-signed at once
+        """
+        self._sign = sign
+        self.max_presigned = max_presigned
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='order-signer')
+        self.presign_executor = ThreadPoolExecutor(max_workers=max_presign_workers, thread_name_prefix='order-presigner')
+        self.presigned: 'OrderedDict[SigningKey, Future]' = OrderedDict()
+        self._presigned_by_source: Dict[Hashable, Set[SigningKey]] = {}
+        self.presigned_hits = 0
+        self.lock = threading.Lock()
+
+    def sign(self, orders: List[Order], neg_risk: bool) -> List[Any]:
+        """
+        Signed orders in the same order, taking pre-signed ones where there
+        are. Raises the first signing error.
+        """
+        futures = []
+        for order in orders:
+            future = self._take_presigned(order, neg_risk)
+            if future is None:
+                future = self.executor.submit(self._sign, order, neg_risk)
+            futures.append(future)
+
+        return [future.result() for future in futures]
+
+    def presign(self, orders: List[Order], neg_risk: bool, source: Optional[Hashable] = None):
+        """
+        Starts signing orders in the background for a later sign() to take.
+        Those the source pre-signed before and that haven't started signing
+        yet are dropped, unless they are among the orders.
+        """
+        keys = [signing_key(order, neg_risk) for order in orders]
+        with self.lock:
+            if source is not None:
+                for key in self._presigned_by_source.get(source, set()).difference(keys):
+                    future = self.presigned.get(key)
+                    if future is not None and future.cancel():
+                        del self.presigned[key]
+                self._presigned_by_source[source] = set(keys)
+
+            for order, key in zip(orders, keys):
+                if key in self.presigned:
+                    self.presigned.move_to_end(key)
+                    continue
+
+                self.presigned[key] = self.presign_executor.submit(self._sign, order, neg_risk)
+                while len(self.presigned) > self.max_presigned:
+                    _, evicted = self.presigned.popitem(last=False)
+                    evicted.cancel()
+
+    def clear(self):
+        """Drops every pre-signed order"""
+        with self.lock:
+            for future in self.presigned.values():
+                future.cancel()
+            self.presigned.clear()
+            self._presigned_by_source.clear()
+
+    def close(self):
+        self.clear()
+        self.presign_executor.shutdown(wait=True)
+        self.executor.shutdown(wait=True)
+
+    def _take_presigned(self, order: Order, neg_risk: bool) -> Optional[Future]:
+        with self.lock:
+            future = self.presigned.pop(signing_key(order, neg_risk), None)
+
+        if future is None or future.cancelled():
+            return None
+        if future.done() and future.exception() is not None:
+            # Signed again, in case what failed then was transient
+            logger.warning(f"Pre-signing order for {order.market_slug} failed: {future.exception()}")
+            return None
+
+        with self.lock:
+            self.presigned_hits += 1
+        return future
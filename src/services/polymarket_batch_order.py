@@ -1,25 +1,76 @@
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType, PostOrdersArgs, PartialCreateOrderOptions
 from py_clob_client.order_builder.constants import BUY, SELL
-from typing import List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Hashable, List, Dict, Any, Optional
+import threading
+import time
 import logging
 from config import config
 from src.models import Order, OrderType as InternalOrderType, OrderSide
+from services.order_signer import OrderSigner
+from services.rate_limiter import TokenBucket
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass
+class BatchStats:
+    """Outcomes and latencies of the order batches a service has submitted"""
+    batches: int = 0
+    failed_batches: int = 0
+    orders: int = 0
+    accepted_orders: int = 0
+    """Orders the exchange reported as successfully placed"""
+    rate_limited_ms: float = 0.0
+    """Time batches spent waiting on the rate limiter"""
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=10000))
+    """Round trip of the most recent batches that reached the exchange"""
+
+    def record(self, result: Dict[str, Any], orders: int):
+        self.batches += 1
+        self.orders += orders
+        if not result["success"]:
+            self.failed_batches += 1
+        self.accepted_orders += result["orders_accepted"]
+        self.rate_limited_ms += result["rate_limited_ms"]
+        if result["latency_ms"] is not None:
+            self.latencies_ms.append(result["latency_ms"])
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        latencies = sorted(self.latencies_ms)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+    def asdict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "orders": self.orders,
+            "accepted_orders": self.accepted_orders,
+            "rate_limited_ms": self.rate_limited_ms,
+            "p50_latency_ms": self.latency_percentile(50),
+            "p99_latency_ms": self.latency_percentile(99),
+        }
+
 
 class PolymarketOrderService:
     """
     Provides ability to submit orders to Polymarket using the official py-clob-client.
 
     Handles conversion from internal Order objects to Polymarket API calls.
-    Supports batch order submission with automatic batching for >5 orders.
+    Supports batch order submission, splitting orders into batches of
+    max_batch_size (by default CLOB_MAX_BATCH_ORDERS) sent up to max_concurrent_batches at once.
     """
 
-    def __init__(self):
+    def __init__(self, max_batch_size: int = config.CLOB_MAX_BATCH_ORDERS, max_concurrent_batches: Optional[int] = None):
         """Initialize the Polymarket order service with configuration from environment variables."""
+        self.max_batch_size = max_batch_size
+        if max_concurrent_batches is None:
+            max_concurrent_batches = config.CLOB_MAX_CONCURRENT_BATCHES
         self.host = config.POLYMARKET_CLOB_API
         self.chain_id = 137  # Polygon chain ID
         self.private_key = config.POLYMARKET_PRIVATE_KEY
@@ -40,6 +91,15 @@ class PolymarketOrderService:
         # Set up API credentials
         api_creds = self.client.create_or_derive_api_creds()
         self.client.set_api_creds(api_creds)
+
+        # Signs the orders of a batch concurrently and keeps pre-signed ones
+        self.signer = OrderSigner(self._sign_order)
+
+        # Batches go out concurrently, as fast as the CLOB's rate limits allow
+        self.batch_executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix='order-batches')
+        self.rate_limiter = TokenBucket(config.CLOB_ORDERS_RATE_LIMIT, config.CLOB_ORDERS_BURST)
+        self.batch_stats = BatchStats()
+        self.stats_lock = threading.Lock()
         
         logger.info("PolymarketOrderService initialized successfully")
 
@@ -69,6 +129,31 @@ class PolymarketOrderService:
             token_id=order.asset_id
         )
     
+    def _sign_order(self, order: Order, neg_risk: bool) -> Any:
+        """Create and sign an order, which runs on the signer's worker threads."""
+        return self.client.create_order(
+            self._convert_order_to_polymarket(order),
+            PartialCreateOrderOptions(neg_risk=neg_risk)
+        )
+
+    def presign_orders(self, orders: List[Order], neg_risk: bool = True, source: Optional[Hashable] = None):
+        """
+        Sign orders likely to be placed soon in the background, e.g. the
+        other leg of an arb at its current best ask, so placing them later
+        doesn't wait for signing.
+
+        Args:
+            orders: Orders to sign; placing an order with the same asset, side, price and size uses its signature
+            neg_risk: Whether this is a negative risk market (binary yes/no)
+            source: What the orders were derived from, e.g. a market; its earlier pre-signs still queued are dropped
+        """
+        self.signer.presign(orders, neg_risk, source)
+
+    def close(self):
+        """Stops the signing and batch submission threads, waiting for work in progress"""
+        self.signer.close()
+        self.batch_executor.shutdown(wait=True)
+
     def place_single_order(self, order: Order, neg_risk: bool = True, order_type: OrderType = OrderType.FOK) -> Optional[Dict[str, Any]]:
         """
         Place a single order on Polymarket.
@@ -82,14 +167,8 @@ class PolymarketOrderService:
             Dictionary containing order execution result
         """
         try:
-            # Convert internal order to Polymarket format
-            order_args = self._convert_order_to_polymarket(order)
-            
-            # Create and sign the order
-            signed_order = self.client.create_order(
-                order_args, 
-                PartialCreateOrderOptions(neg_risk=neg_risk)
-            )
+            # Create and sign the order, unless it was pre-signed
+            signed_order, = self.signer.sign([order], neg_risk)
             
             # Submit the order
             result = self.client.post_order(signed_order, order_type)
@@ -116,79 +195,89 @@ class PolymarketOrderService:
             order_type: Polymarket OrderType (GTC, FOK, etc.)
 
         Returns:
-            List of results for each batch (max 4 orders per batch)
+            List of results for each batch (max max_batch_size orders per batch), in order
 
         Note:
-            Automatically splits orders into batches of 4
+            Automatically splits orders into batches of max_batch_size, which are
+            submitted concurrently so they all go out within about one
+            round trip, subject to the rate limiter
         """
         if not orders:
             return []
         
-        results = []
-        
-        # Split orders into batches of 4
-        for i in range(0, len(orders), 4):
-            batch = orders[i:i+4]
-            batch_result = self._place_order_batch(batch, neg_risk, order_type)
-            results.append(batch_result)
-        
-        return results
+        batches = [orders[i:i + self.max_batch_size] for i in range(0, len(orders), self.max_batch_size)]
+        if len(batches) == 1:
+            return [self._place_order_batch(batches[0], neg_risk, order_type)]
+
+        futures = [self.batch_executor.submit(self._place_order_batch, batch, neg_risk, order_type) for batch in batches]
+        return [future.result() for future in futures]
     
     def _place_order_batch(self, orders: List[Order], neg_risk: bool, order_type: OrderType) -> Dict[str, Any]:
         """
-        Place a single batch of orders (max 4).
+        Place a single batch of orders (max max_batch_size).
         
         Args:
-            orders: List of Order objects (max 4)
+            orders: List of Order objects (max max_batch_size)
             neg_risk: Whether this is a negative risk market
             order_type: Polymarket OrderType
             
         Returns:
-            Batch execution result
+            Batch execution result, with how long the batch waited on the
+            rate limiter and took to submit (None when it never was)
         """
+        result = self._submit_order_batch(orders, neg_risk, order_type)
+
+        with self.stats_lock:
+            self.batch_stats.record(result, len(orders))
+
+        return result
+
+    def _submit_order_batch(self, orders: List[Order], neg_risk: bool, order_type: OrderType) -> Dict[str, Any]:
+        rate_limited_ms = 0.0
         try:
-            if len(orders) > 4:
-                error_msg = "Maximum of 4 orders per batch request"
+            if len(orders) > self.max_batch_size:
+                error_msg = f"Maximum of {self.max_batch_size} orders per batch request"
                 logger.error(error_msg)
-                return {
-                    "success": False,
-                    "errorMsg": error_msg,
-                    "orders_processed": 0,
-                    "results": []
-                }
-
-            # Convert orders to PostOrdersArgs
-            post_orders_args = []
-            for order in orders:
-                order_args = self._convert_order_to_polymarket(order)
-                signed_order = self.client.create_order(
-                    order_args, 
-                    PartialCreateOrderOptions(neg_risk=neg_risk)
-                )
-                post_orders_args.append(PostOrdersArgs(
-                    order=signed_order,
-                    orderType=order_type
-                ))
-
-            # Submit batch
+                return self._failed_batch(error_msg, rate_limited_ms)
+
+            # Sign the orders concurrently, taking pre-signed ones, then convert to PostOrdersArgs
+            post_orders_args = [
+                PostOrdersArgs(order=signed_order, orderType=order_type)
+                for signed_order in self.signer.sign(orders, neg_risk)
+            ]
+
+            # Submit batch once the rate limits allow
+            rate_limited_ms = self.rate_limiter.acquire() * 1000
+            start = time.perf_counter()
             result = self.client.post_orders(post_orders_args)
+            latency_ms = (time.perf_counter() - start) * 1000
             
-            logger.info(f"Successfully placed batch of {len(orders)} orders: {result}")
+            logger.info(f"Successfully placed batch of {len(orders)} orders in {latency_ms:.1f}ms: {result}")
             return {
                 "success": True,
                 "orders_processed": len(orders),
+                "orders_accepted": sum(1 for r in result if isinstance(r, dict) and r.get("success")) if isinstance(result, list) else 0,
                 "results": result,
-                "errorMsg": None
+                "errorMsg": None,
+                "latency_ms": latency_ms,
+                "rate_limited_ms": rate_limited_ms
             }
 
         except Exception as e:
             logger.error(f"Error placing order batch: {e}")
-            return {
-                "success": False,
-                "errorMsg": str(e),
-                "orders_processed": 0,
-                "results": []
-            }
+            return self._failed_batch(str(e), rate_limited_ms)
+
+    @staticmethod
+    def _failed_batch(error_msg: str, rate_limited_ms: float) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "errorMsg": error_msg,
+            "orders_processed": 0,
+            "orders_accepted": 0,
+            "results": [],
+            "latency_ms": None,
+            "rate_limited_ms": rate_limited_ms
+        }
 
     def execute_orders_from_list(self, orders: List[Order], neg_risk: bool = True) -> Dict[str, Any]:
         """
@@ -209,9 +298,11 @@ class PolymarketOrderService:
                 "results": []
             }
         
-        logger.info(f"Executing {len(orders)} orders in batches of 4")
+        logger.info(f"Executing {len(orders)} orders in batches of {self.max_batch_size}")
         
+        start = time.perf_counter()
         results = self.place_multiple_orders(orders, neg_risk=neg_risk)
+        elapsed_ms = (time.perf_counter() - start) * 1000
         
         # Summarize results
         total_success = sum(1 for r in results if r.get("success", False))
@@ -223,5 +314,7 @@ class PolymarketOrderService:
             "batches_processed": len(results),
             "successful_batches": total_success,
             "failed_batches": len(results) - total_success,
+            "accepted_orders": sum(r.get("orders_accepted", 0) for r in results),
+            "elapsed_ms": elapsed_ms,
             "results": results
         }
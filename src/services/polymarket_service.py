@@ -1,18 +1,22 @@
-import requests
+import httpx
 import json
 from datetime import datetime
-from typing import Dict, Optional, Any, List, Callable
+from typing import Dict, Optional, Any, List, Callable, Union
 import logging
 import asyncio
 import websockets
 from config import config
+from .http_client import HttpClient, get_http_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
 class PolymarketService:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None, max_batch_orders: int = config.CLOB_MAX_BATCH_ORDERS):
+        # Pooled keep-alive connections, shared with every other service by default
+        self.http = http_client if http_client is not None else get_http_client()
+        # Batch requests of more orders are refused without being sent
+        self.max_batch_orders = max_batch_orders
         self.gamma_api_base = config.POLYMARKET_GAMMA_API
         self.clob_api_base = config.POLYMARKET_CLOB_API if hasattr(config, 'POLYMARKET_CLOB_API') else "https://clob.polymarket.com"
         self.headers = {}
@@ -89,24 +93,20 @@ class PolymarketService:
     def get_market_by_slug(self, market_slug: str) -> Optional[Dict[str, Any]]:
         """Get market information using the Gamma API."""
         try:
-            url = f"{self.gamma_api_base}/markets"
-            params = {
-                'slug': market_slug,
-                'active': True,
-                'closed': False
-            }
-
-            response = requests.get(url, params=params, headers=self.headers)
-            response.raise_for_status()
+            response = self.http.get(f"{self.gamma_api_base}/markets", params=self._market_params(market_slug), headers=self.headers)
+            return self._first_market(response)
 
-            markets = response.json()
-
-            if not markets:
-                return None
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error fetching market data: {e}")
+            return None
 
-            return markets[0]  # Return the first matching market
+    async def get_market_by_slug_async(self, market_slug: str) -> Optional[Dict[str, Any]]:
+        """Same as get_market_by_slug, without blocking the event loop."""
+        try:
+            response = await self.http.aget(f"{self.gamma_api_base}/markets", params=self._market_params(market_slug), headers=self.headers)
+            return self._first_market(response)
 
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching market data: {e}")
             return None
 
@@ -128,38 +128,24 @@ class PolymarketService:
             - errorMsg: Error message if applicable
         """
         try:
-            url = f"{self.clob_api_base}/order"
-
-            payload = {
-                "order": order_data["order"],
-                "owner": order_data["owner"],
-                "orderType": order_type
-            }
-
-            headers = {**self.headers, "Content-Type": "application/json"}
-
-            response = requests.post(url, json=payload, headers=headers)
-            response.raise_for_status()
+            response = self.http.post(f"{self.clob_api_base}/order", json=self._order_payload(order_data, order_type), headers=self._json_headers())
+            return self._order_result(response, "order")
 
-            result = response.json()
-
-            if result.get("success"):
-                logger.info(f"Successfully placed order: {result.get('orderId')}")
-            else:
-                logger.error(f"Order placement failed: {result.get('errorMsg')}")
+        except Exception as e:
+            logger.error(f"Error placing single order: {e}")
+            return self._failed_order(str(e))
 
-            return result
+    async def place_single_order_async(self, order_data: Dict[str, Any], order_type: str = "GTC") -> Optional[Dict[str, Any]]:
+        """Same as place_single_order, without blocking the event loop."""
+        try:
+            response = await self.http.apost(f"{self.clob_api_base}/order", json=self._order_payload(order_data, order_type), headers=self._json_headers())
+            return self._order_result(response, "order")
 
         except Exception as e:
             logger.error(f"Error placing single order: {e}")
-            return {
-                "success": False,
-                "errorMsg": str(e),
-                "orderId": None,
-                "orderHashes": None
-            }
+            return self._failed_order(str(e))
 
-    def place_multiple_orders(self, orders_data: List[Dict[str, Any]], order_type: str = "GTC") -> Optional[Dict[str, Any]]:
+    def place_multiple_orders(self, orders_data: List[Dict[str, Any]], order_type: str = "GTC") -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
         """
         Place multiple orders in a batch on Polymarket.
 
@@ -175,54 +161,100 @@ class PolymarketService:
             - orderId: ID of the batch order
             - orderHashes: Settlement transaction hashes
             - errorMsg: Error message if applicable
+            or, as the CLOB answers batches it accepted, a list with the
+            result of each order (success, orderID, status, errorMsg)
 
         Note:
-            Maximum of 5 orders per batch request
+            Maximum of max_batch_orders (by default CLOB_MAX_BATCH_ORDERS) orders per batch request
         """
         try:
-            if len(orders_data) > 5:
-                error_msg = "Maximum of 5 orders per batch request"
-                logger.error(error_msg)
-                return {
-                    "success": False,
-                    "errorMsg": error_msg,
-                    "orderId": None,
-                    "orderHashes": None
-                }
+            if len(orders_data) > self.max_batch_orders:
+                return self._batch_too_large()
 
-            url = f"{self.clob_api_base}/orders"
+            payload = [self._order_payload(order_data, order_type) for order_data in orders_data]
+            response = self.http.post(f"{self.clob_api_base}/orders", json=payload, headers=self._json_headers())
+            return self._order_result(response, "batch order")
 
-            # Format orders for batch request
-            formatted_orders = []
-            for order_data in orders_data:
-                formatted_orders.append({
-                    "order": order_data["order"],
-                    "owner": order_data["owner"],
-                    "orderType": order_type
-                })
+        except Exception as e:
+            logger.error(f"Error placing multiple orders: {e}")
+            return self._failed_order(str(e))
 
-            headers = {**self.headers, "Content-Type": "application/json"}
+    async def place_multiple_orders_async(self, orders_data: List[Dict[str, Any]], order_type: str = "GTC") -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Same as place_multiple_orders, without blocking the event loop."""
+        try:
+            if len(orders_data) > self.max_batch_orders:
+                return self._batch_too_large()
 
-            response = requests.post(url, json=formatted_orders, headers=headers)
-            response.raise_for_status()
+            payload = [self._order_payload(order_data, order_type) for order_data in orders_data]
+            response = await self.http.apost(f"{self.clob_api_base}/orders", json=payload, headers=self._json_headers())
+            return self._order_result(response, "batch order")
 
-            result = response.json()
+        except Exception as e:
+            logger.error(f"Error placing multiple orders: {e}")
+            return self._failed_order(str(e))
+
+    @staticmethod
+    def _market_params(market_slug: str) -> Dict[str, Any]:
+        return {
+            'slug': market_slug,
+            'active': True,
+            'closed': False
+        }
 
-            if result.get("success"):
-                logger.info(f"Successfully placed batch order: {result.get('orderId')}")
-            else:
-                logger.error(f"Batch order placement failed: {result.get('errorMsg')}")
+    @staticmethod
+    def _first_market(response: httpx.Response) -> Optional[Dict[str, Any]]:
+        response.raise_for_status()
 
-            return result
+        markets = response.json()
 
-        except Exception as e:
-            logger.error(f"Error placing multiple orders: {e}")
-            return {
-                "success": False,
-                "errorMsg": str(e),
-                "orderId": None,
-                "orderHashes": None
-            }
+        if not markets:
+            return None
+
+        return markets[0]  # Return the first matching market
+
+    def _json_headers(self) -> Dict[str, str]:
+        return {**self.headers, "Content-Type": "application/json"}
+
+    @staticmethod
+    def _order_payload(order_data: Dict[str, Any], order_type: str) -> Dict[str, Any]:
+        return {
+            "order": order_data["order"],
+            "owner": order_data["owner"],
+            "orderType": order_type
+        }
+
+    @staticmethod
+    def _order_result(response: httpx.Response, description: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        response.raise_for_status()
+
+        result = response.json()
+
+        if isinstance(result, list):
+            placed = sum(1 for order_result in result if order_result.get("success"))
+            logger.info(f"Placed {placed} of {len(result)} orders of {description}")
+            for order_result in result:
+                if not order_result.get("success"):
+                    logger.error(f"Order placement failed: {order_result.get('errorMsg')}")
+        elif result.get("success"):
+            logger.info(f"Successfully placed {description}: {result.get('orderId')}")
+        else:
+            logger.error(f"{description.capitalize()} placement failed: {result.get('errorMsg')}")
+
+        return result
+
+    def _batch_too_large(self) -> Dict[str, Any]:
+        error_msg = f"Maximum of {self.max_batch_orders} orders per batch request"
+        logger.error(error_msg)
+        return self._failed_order(error_msg)
+
+    @staticmethod
+    def _failed_order(error_msg: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "errorMsg": error_msg,
+            "orderId": None,
+            "orderHashes": None
+        }
 
     async def connect_websocket(self) -> bool:
         """Connect to Polymarket WebSocket API."""
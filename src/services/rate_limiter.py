@@ -0,0 +1,45 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: up to `capacity` requests go out at once, after
+    which they are let through at `rate` per second.
+
+    A caller that finds too few tokens reserves them anyway, taking the bucket
+    below zero, and sleeps until they would have refilled. Callers are thus
+    let through in the order they asked, without polling.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Invalid token bucket: rate {rate}/s, capacity {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes `tokens`, waiting for them if needed; returns the seconds waited"""
+        if tokens > self.capacity:
+            raise ValueError(f"Can't take {tokens} tokens from a bucket of {self.capacity}")
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
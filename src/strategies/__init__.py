@@ -1,3 +1,19 @@
-from .polymarket_arb import calculate_orders
+from .polymarket_arb import calculate_orders, likely_orders, ArbParameters
+from .arb_scanner import ArbScanner, ArbOpportunity
+from .arb_sizing import ArbSizer, SizedArb
+from .order_emitter import OrderEmitter, OrderIntent, IntentStatus
+from .strategy_runner import StrategyRunner, ExecutionMode, StrategyStats
 
-__all__ = ['calculate_orders']
+__all__ = ['calculate_orders',
+           'likely_orders',
+           'ArbParameters',
+           'ArbScanner',
+           'ArbOpportunity',
+           'ArbSizer',
+           'SizedArb',
+           'OrderEmitter',
+           'OrderIntent',
+           'IntentStatus',
+           'StrategyRunner',
+           'ExecutionMode',
+           'StrategyStats']
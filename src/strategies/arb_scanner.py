@@ -0,0 +1,120 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from src.models import OrderBookStore, SyntheticOrderBook
+
+
+@dataclass
+class ArbOpportunity:
+    """
+    Arbitrage available at the top of a market's books
+
+    Attributes:
+        edge: 1 - sum of best asks across outcomes
+        size: Shares executable at the best ask on every outcome
+        expected_profit: edge * size
+    """
+    market_slug: str
+    market_id: int
+    asset_ids: Tuple[str, ...]
+    prices: Tuple[float, ...]
+    edge: float
+    size: float
+    expected_profit: float
+
+    def asdict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ArbScanner:
+    """
+    Keeps the best ask and best ask size of every outcome of every registered
+    market in two (markets x outcomes) matrices, so arbitrage across all
+    markets is computed in one vectorized pass instead of running
+    calculate_orders per market.
+
+    Outcomes without a best ask hold price inf and size 0, which keeps their
+    market out of the results.
+    """
+
+    def __init__(self, num_outcomes: int = 2, capacity: int = 64):
+        self.num_outcomes = num_outcomes
+        self.prices = np.full((capacity, num_outcomes), np.inf)
+        self.sizes = np.zeros((capacity, num_outcomes))
+        self.markets: List[Tuple[str, int, Tuple[str, ...]]] = []
+        self.cells: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def register(self, book_store: OrderBookStore) -> int:
+        """Adds a market's books to the scanner, returning its row"""
+        asset_ids = tuple(book_store.asset_ids)
+        if len(asset_ids) != self.num_outcomes:
+            raise ValueError(f"{book_store.market_slug} has {len(asset_ids)} outcomes, scanner expects {self.num_outcomes}")
+
+        row = len(self.markets)
+        if row == self.prices.shape[0]:
+            self._grow()
+
+        self.markets.append((book_store.market_slug, book_store.market_id, asset_ids))
+        for col, asset_id in enumerate(asset_ids):
+            self.cells[asset_id] = (row, col)
+
+        self.update(book_store)
+        return row
+
+    def update_book(self, book: SyntheticOrderBook):
+        row, col = self.cells[book.asset_id]
+        top = book.top_orders(1)
+        if top:
+            self.prices[row, col] = top[0].price
+            self.sizes[row, col] = top[0].size
+        else:
+            self.prices[row, col] = np.inf
+            self.sizes[row, col] = 0.0
+
+    def update(self, book_store: OrderBookStore):
+        for book in book_store.books:
+            self.update_book(book)
+
+    def scan(self, min_edge: float = 0.0) -> List[ArbOpportunity]:
+        """
+        Returns markets whose best asks sum below 1 - min_edge, ranked by
+        expected profit (highest first).
+        """
+        count = len(self.markets)
+        prices = self.prices[:count]
+        sizes = self.sizes[:count]
+
+        edges = 1.0 - prices.sum(axis=1)
+        executable = sizes.min(axis=1)
+        # Empty or one-sided markets have edge -inf and size 0, whose product is nan
+        with np.errstate(invalid='ignore'):
+            profits = np.where(executable > 0, edges * executable, 0.0)
+
+        rows = np.flatnonzero((edges > min_edge) & (executable > 0))
+        rows = rows[np.argsort(-profits[rows], kind='stable')]
+
+        opportunities = []
+        for row in rows:
+            market_slug, market_id, asset_ids = self.markets[row]
+            opportunities.append(ArbOpportunity(
+                market_slug=market_slug,
+                market_id=market_id,
+                asset_ids=asset_ids,
+                prices=tuple(prices[row].tolist()),
+                edge=float(edges[row]),
+                size=float(executable[row]),
+                expected_profit=float(profits[row])
+            ))
+
+        return opportunities
+
+    def _grow(self):
+        capacity = self.prices.shape[0] * 2
+        prices = np.full((capacity, self.num_outcomes), np.inf)
+        sizes = np.zeros((capacity, self.num_outcomes))
+        prices[:len(self.markets)] = self.prices[:len(self.markets)]
+        sizes[:len(self.markets)] = self.sizes[:len(self.markets)]
+        self.prices, self.sizes = prices, sizes
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import math
+import numpy as np
+from src.models import SyntheticOrderBook, Order
+from src.strategies.polymarket_arb import OrderBuilder
+from src.utils.clock import get_clock
+
+
+@dataclass
+class SizedArb:
+    """
+    Profit-maximizing arb across two books
+
+    Attributes:
+        size: Shares bought on each outcome
+        price_a: Worst (highest) ask filled on book a
+        price_b: Worst (highest) ask filled on book b
+        cost: Cost of both legs including fees
+        profit: Payout of `size` less cost and slippage buffer
+    """
+    size: float
+    price_a: float
+    price_b: float
+    cost: float
+    profit: float
+
+
+class ArbSizer:
+    """
+    Sizes an arb by walking the cumulative depth of both ask ladders rather
+    than pairing one level at a time, and emits a single order per outcome
+    priced at the worst level it fills.
+
+    Buying q shares of both outcomes pays out q. The cost of each leg is
+    piecewise linear in q with breakpoints at the cumulative level sizes, so
+    profit (payout less cost, fees and slippage) is concave and its maximum
+    sits on one of those breakpoints.
+
+    Args:
+        fee_rate: Fee charged as a fraction of notional on each leg
+        slippage: Buffer in price per share on each leg, taken out of profit
+        min_profit: Orders are only emitted above this profit
+        size_fraction: Fraction of the optimal size to trade
+        max_size: Cap on shares bought per outcome
+    """
+
+    def __init__(self,
+                 fee_rate: float = 0.0,
+                 slippage: float = 0.0,
+                 min_profit: float = 0.0,
+                 size_fraction: float = 1.0,
+                 max_size: Optional[float] = None):
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.min_profit = min_profit
+        self.size_fraction = size_fraction
+        self.max_size = max_size
+
+    def __call__(self, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> List[Order]:
+        sized = self.size(book_a, book_b)
+        if sized is None:
+            return []
+
+        timestamp = get_clock().timestamp()
+        orderBuilder_a = OrderBuilder(book_a.market_slug, book_a.market_id, book_a.outcome_name, book_a.asset_id)
+        orderBuilder_b = OrderBuilder(book_b.market_slug, book_b.market_id, book_b.outcome_name, book_b.asset_id)
+
+        return [
+            orderBuilder_a(sized.price_a, sized.size, timestamp),
+            orderBuilder_b(sized.price_b, sized.size, timestamp)
+        ]
+
+    def size(self, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> Optional[SizedArb]:
+        prices_a, cum_sizes_a, cum_costs_a = book_a.depth_arrays()
+        prices_b, cum_sizes_b, cum_costs_b = book_b.depth_arrays()
+
+        if not len(prices_a) or not len(prices_b):
+            return None
+
+        limit = min(cum_sizes_a[-1], cum_sizes_b[-1])
+        if self.max_size is not None:
+            limit = min(limit, self.max_size)
+
+        candidates = np.union1d(cum_sizes_a, cum_sizes_b)
+        candidates = np.append(candidates[candidates < limit], limit)
+
+        profits = self._profit(candidates, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b)
+        best = int(np.argmax(profits))
+        if profits[best] <= self.min_profit:
+            return None
+
+        size = math.floor(candidates[best] * self.size_fraction)
+        if size < 1:
+            return None
+
+        cost = float(self._cost(size, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b))
+        profit = float(self._profit(size, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b))
+        if profit <= self.min_profit:
+            return None
+
+        return SizedArb(
+            size=size,
+            price_a=float(prices_a[np.searchsorted(cum_sizes_a, size)]),
+            price_b=float(prices_b[np.searchsorted(cum_sizes_b, size)]),
+            cost=cost,
+            profit=profit
+        )
+
+    def _cost(self, size, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b):
+        cost_a = np.interp(size, np.concatenate(([0.0], cum_sizes_a)), np.concatenate(([0.0], cum_costs_a)))
+        cost_b = np.interp(size, np.concatenate(([0.0], cum_sizes_b)), np.concatenate(([0.0], cum_costs_b)))
+        return (cost_a + cost_b) * (1 + self.fee_rate)
+
+    def _profit(self, size, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b):
+        cost = self._cost(size, cum_sizes_a, cum_costs_a, cum_sizes_b, cum_costs_b)
+        return size - cost - 2 * self.slippage * size
@@ -0,0 +1,88 @@
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from src.models import Order, OrderSide
+
+
+class IntentStatus(Enum):
+    NEW = "NEW"
+    """No intent was outstanding at this asset, side and price"""
+    CHANGED = "CHANGED"
+    """Intent was outstanding with a different size"""
+    CANCELLED = "CANCELLED"
+    """Intent is no longer signalled by the strategy"""
+
+
+@dataclass
+class OrderIntent:
+    status: IntentStatus
+    order: Order
+
+
+IntentKey = Tuple[str, OrderSide, float]
+
+
+class OrderEmitter:
+    """
+    Tracks the orders a strategy currently wants outstanding in each market
+    and turns each new set of strategy orders into only the differences:
+    new, changed and cancelled intents. While an opportunity persists the
+    strategy keeps returning the same orders, and nothing is emitted.
+
+    Intents are kept per market and strategy, so one strategy's orders never
+    cancel another's, and keyed on (asset_id, side, price). Orders from one
+    strategy call that share a key are merged into a single intent with
+    their sizes summed.
+    """
+
+    def __init__(self):
+        self.intents: Dict[Tuple[str, str], Dict[IntentKey, Order]] = {}
+
+    def update(self, market_slug: str, orders: List[Order], strategy: str = '') -> List[OrderIntent]:
+        """The differences between the strategy's orders in the market and its outstanding intents"""
+        current = self._merge(orders)
+        previous = self.intents.get((market_slug, strategy), {})
+
+        emitted = []
+        for key, order in current.items():
+            outstanding = previous.get(key)
+            if outstanding is None:
+                emitted.append(OrderIntent(IntentStatus.NEW, order))
+            elif outstanding.size != order.size:
+                emitted.append(OrderIntent(IntentStatus.CHANGED, order))
+            else:
+                # Keep the original order so its timestamp reflects when
+                # the intent was first emitted
+                current[key] = outstanding
+
+        for key, order in previous.items():
+            if key not in current:
+                emitted.append(OrderIntent(IntentStatus.CANCELLED, order))
+
+        if current:
+            self.intents[(market_slug, strategy)] = current
+        else:
+            self.intents.pop((market_slug, strategy), None)
+
+        return emitted
+
+    def cancel(self, market_slug: str) -> List[OrderIntent]:
+        """Drops every outstanding intent in a market, of every strategy"""
+        strategies = [strategy for slug, strategy in self.intents if slug == market_slug]
+        return [intent for strategy in strategies for intent in self.update(market_slug, [], strategy)]
+
+    def outstanding(self, market_slug: Optional[str] = None) -> List[Order]:
+        return [
+            order
+            for (slug, _), intents in self.intents.items() if market_slug is None or slug == market_slug
+            for order in intents.values()
+        ]
+
+    def _merge(self, orders: List[Order]) -> Dict[IntentKey, Order]:
+        merged: Dict[IntentKey, Order] = {}
+        for order in orders:
+            key = (order.asset_id, order.side, order.price)
+            existing = merged.get(key)
+            merged[key] = order if existing is None else replace(existing, size=existing.size + order.size)
+
+        return merged
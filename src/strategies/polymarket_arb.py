@@ -1,7 +1,9 @@
-from typing import List
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary, ref
 from src.models import SyntheticOrderBook, Order, OrderType, SyntheticOrder, OrderSide
-from datetime import datetime
-from src.utils.datetime_utils import datetime_to_epoch
+from src.utils.clock import get_clock
 
 class OrderBuilder:
     def __init__(self, market_slug: str, market_id: int, outcome_name: str, asset_id: str):
@@ -26,56 +28,150 @@ class OrderBuilder:
             timestamp = timestamp
         )
 
-def calculate_orders(book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> List[Order]:
-    orders_a = sorted(book_a.orders, key=lambda order: order.price)
-    orders_b = sorted(book_b.orders, key=lambda order: order.price)
-
-    timestamp = datetime_to_epoch(datetime.now())
+@dataclass(frozen=True)
+class ArbParameters:
+    """
+    Tunables of calculate_orders; the defaults are how it has always traded
+
+    Attributes:
+        min_edge: Levels are only paired while their prices sum to less than 1 - min_edge
+        size_fraction: Fraction of the smaller level's size each pair is sized at
+        max_depth: Levels of each ladder the matcher may walk, all of them when None
+    """
+    min_edge: float = 0.0
+    size_fraction: float = 0.5
+    max_depth: Optional[int] = None
+
+
+DEFAULT_PARAMETERS = ArbParameters()
+
+
+class _CachedOrders:
+    """
+    Result of the last evaluation for a pair of books along with the levels
+    the matcher examined to produce it. Every book update replaces the
+    SyntheticOrder at a level, so the level objects double as level versions.
+    """
+    __slots__ = ('book_b', 'depth_a', 'depth_b', 'levels_a', 'levels_b', 'orders')
+
+    def __init__(self, book_b: SyntheticOrderBook, depth_a: int, depth_b: int, levels_a: List[SyntheticOrder], levels_b: List[SyntheticOrder], orders: List[Order]):
+        self.book_b = ref(book_b)
+        self.depth_a = depth_a
+        self.depth_b = depth_b
+        self.levels_a = levels_a
+        self.levels_b = levels_b
+        self.orders = orders
+
+    def is_valid(self, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> bool:
+        return (self.book_b() is book_b
+                and book_a.top_orders(self.depth_a) == self.levels_a
+                and book_b.top_orders(self.depth_b) == self.levels_b)
+
+
+# Shared by every thread calculate_orders runs on: the message handler and
+# StrategyRunner workers. The lock covers the dictionaries only; a pair of
+# books is only ever evaluated by one thread at a time, as workers run on
+# snapshots of the books rather than the books the handler updates.
+_orders_cache: 'WeakKeyDictionary[SyntheticOrderBook, Dict[ArbParameters, _CachedOrders]]' = WeakKeyDictionary()
+_orders_cache_lock = threading.Lock()
+
+def calculate_orders(book_a: SyntheticOrderBook, book_b: SyntheticOrderBook, parameters: ArbParameters = DEFAULT_PARAMETERS) -> List[Order]:
+    """
+    Calculates arb orders across both books. Most updates only touch levels
+    deeper than the matcher ever reads, so the last result for this pair of
+    books and parameters is returned as is (orders keep the timestamp they
+    were first calculated at) until one of the levels it examined changes.
+    """
+    with _orders_cache_lock:
+        cache = _orders_cache.get(book_a)
+        if cache is None:
+            cache = _orders_cache[book_a] = {}
+        cached = cache.get(parameters)
+
+    if cached is not None and cached.is_valid(book_a, book_b):
+        return list(cached.orders)
+
+    orders_a = book_a.sorted_orders()
+    orders_b = book_b.sorted_orders()
+
+    timestamp = get_clock().timestamp()
 
     orderBuilder_a = OrderBuilder(book_a.market_slug, book_a.market_id, book_a.outcome_name, book_a.asset_id)
     orderBuilder_b = OrderBuilder(book_b.market_slug, book_b.market_id, book_b.outcome_name, book_b.asset_id)
 
-    return _recurs_build_orders(orders_a, orderBuilder_a, orders_b, orderBuilder_b, timestamp)
-
-def _recurs_build_orders(orders_a: List[SyntheticOrder], orderBuilder_a: OrderBuilder, orders_b: List[SyntheticOrder], orderBuilder_b: OrderBuilder, timestamp) -> List[Order]:
+    orders, depth_a, depth_b = _match_orders(orders_a, orderBuilder_a, orders_b, orderBuilder_b, timestamp, parameters)
+
+    with _orders_cache_lock:
+        cache[parameters] = _CachedOrders(book_b, depth_a, depth_b, orders_a[:depth_a], orders_b[:depth_b], orders)
+
+    return list(orders)
+
+def likely_orders(book_a: SyntheticOrderBook, book_b: SyntheticOrderBook, parameters: ArbParameters = DEFAULT_PARAMETERS) -> List[Order]:
+    """
+    The orders calculate_orders would return for the best asks of both books
+    if their prices summed to an arb. When a price move opens one, the leg
+    that didn't move is most likely among them, so these are the orders worth
+    signing ahead of time.
+    """
+    return calculate_orders(book_a, book_b, replace(parameters, min_edge=-1.0, max_depth=1))
+
+def _match_orders(orders_a: List[SyntheticOrder], orderBuilder_a: OrderBuilder, orders_b: List[SyntheticOrder], orderBuilder_b: OrderBuilder, timestamp: int, parameters: ArbParameters = DEFAULT_PARAMETERS) -> Tuple[List[Order], int, int]:
+    """
+    Walks both ask ladders (sorted by ascending price) with one pointer each,
+    pairing the cheapest remaining level on each side while their prices sum
+    to less than $1 less the minimum edge. Each pair is sized at a fraction
+    (by default half) of the smaller level and the smaller level is
+    consumed, leaving its size subtracted from the other. The walk stops
+    after max_depth levels of either ladder.
+
+    Levels whose sized fraction rounds below 1 are consumed without emitting
+    an order so the walk always advances and terminates.
+
+    Input lists are never mutated; remaining sizes of the current levels are
+    tracked locally.
+
+    Returns the orders along with how many levels of each ladder were
+    examined. A side that ran out of levels reports one more than its length
+    so a level added to it later counts as a change, unless that is past
+    max_depth.
+    """
     orders = []
 
-    if orders_a and orders_b:
-        a = orders_a[0]
-        b = orders_b[0]
-
-        total = a.price + b.price
-        if total < 1:
-            if a.size < b.size and round(a.size/2) >= 1:
-                size = round(a.size/2)
-                # TODO: Figure out how to remove all the duplicate extend _build_order calls for each conditional
-                orders.extend([
-                    orderBuilder_a(a.price, size, timestamp),
-                    orderBuilder_b(b.price, size, timestamp)
-                ])
-
-                orders_a = orders_a[1:]
-                orders_b[0] = SyntheticOrder(side=b.side, price=b.price, size=b.size - a.size)
-            elif a.size > b.size and round(b.size/2) >= 1:
-                size = round(b.size/2)
-                orders.extend([
-                    orderBuilder_a(a.price, size, timestamp),
-                    orderBuilder_b(b.price, size, timestamp)
-                ])
-
-                orders_a[0] = SyntheticOrder(side=a.side, price=a.price, size=a.size - b.size)
-                orders_b = orders_b[1:]
-            elif a.size == b.size and round(a.size/2) >= 1:
-                size = round(a.size/2)
-                orders.extend([
-                    orderBuilder_a(a.price, size, timestamp),
-                    orderBuilder_b(b.price, size, timestamp)
-                ])
-
-                orders_a = orders_a[1:]
-                orders_b = orders_b[1:]
-
-            orders.extend(_recurs_build_orders(orders_a, orderBuilder_a, orders_b, orderBuilder_b, timestamp))
-
-    return orders
+    i, j = 0, 0
+    len_a, len_b = len(orders_a), len(orders_b)
+    max_price = 1 - parameters.min_edge
+    size_fraction = parameters.size_fraction
+    max_depth = parameters.max_depth if parameters.max_depth is not None else max(len_a, len_b) + 1
+
+    if not len_a:
+        return orders, 1, 0
+    if not len_b:
+        return orders, 0, 1
+
+    price_a, size_a = orders_a[0].price, orders_a[0].size
+    price_b, size_b = orders_b[0].price, orders_b[0].size
+
+    while price_a + price_b < max_price:
+        smallest = min(size_a, size_b)
+        size = round(smallest * size_fraction)
+
+        if size >= 1:
+            orders.append(orderBuilder_a(price_a, size, timestamp))
+            orders.append(orderBuilder_b(price_b, size, timestamp))
+
+        size_a -= smallest
+        size_b -= smallest
+
+        if size_a <= 0:
+            i += 1
+            if i == len_a or i == max_depth:
+                break
+            price_a, size_a = orders_a[i].price, orders_a[i].size
+
+        if size_b <= 0:
+            j += 1
+            if j == len_b or j == max_depth:
+                break
+            price_b, size_b = orders_b[j].price, orders_b[j].size
 
+    return orders, min(i + 1, max_depth), min(j + 1, max_depth)
@@ -0,0 +1,185 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+from src.models import SyntheticOrderBook, Order
+
+logger = logging.getLogger(__name__)
+
+Strategy = Callable[[SyntheticOrderBook, SyntheticOrderBook], List[Order]]
+
+
+class ExecutionMode(Enum):
+    INLINE = "INLINE"
+    """Runs in the message handler; its orders are returned from on_book_update"""
+    WORKER = "WORKER"
+    """Runs on its own thread against a snapshot of the books; orders go to on_orders"""
+
+
+@dataclass
+class StrategyStats:
+    calls: int = 0
+    overruns: int = 0
+    errors: int = 0
+    coalesced: int = 0
+    """Book updates folded into a newer one while a worker was still busy"""
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class RegisteredStrategy:
+    def __init__(self, name: str, strategy: Strategy, latency_budget: float, mode: ExecutionMode):
+        self.name = name
+        self.strategy = strategy
+        self.latency_budget = latency_budget
+        self.mode = mode
+        self.stats = StrategyStats()
+        self.consecutive_overruns = 0
+
+        # Worker state
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.lock = threading.Lock()
+        self.running = False
+        self.pending: Optional[Tuple[SyntheticOrderBook, SyntheticOrderBook]] = None
+
+
+class StrategyRunner:
+    """
+    Registry of strategies that all run on each book update.
+
+    Worker strategies are dispatched first, each on its own thread, so a
+    slow one only ever delays itself; while one is busy, newer updates are
+    coalesced into a single pending run on the latest books. Inline
+    strategies then run in registration order.
+
+    Every run is timed against the strategy's latency budget. An inline
+    strategy that overruns `demote_after` times in a row is moved to a
+    worker so it stops delaying the strategies after it.
+
+    Args:
+        on_orders: Called with (strategy name, orders) for worker strategies,
+            from the worker's thread
+        demote_after: Consecutive overruns before an inline strategy is
+            moved to a worker, None to never demote
+    """
+
+    def __init__(self,
+                 on_orders: Optional[Callable[[str, List[Order]], None]] = None,
+                 demote_after: Optional[int] = 3):
+        self.on_orders = on_orders
+        self.demote_after = demote_after
+        self.strategies: Dict[str, RegisteredStrategy] = {}
+
+    def register(self,
+                 name: str,
+                 strategy: Strategy,
+                 latency_budget_ms: float,
+                 mode: ExecutionMode = ExecutionMode.INLINE):
+        if name in self.strategies:
+            raise ValueError(f"Strategy {name} is already registered")
+
+        registered = RegisteredStrategy(name, strategy, latency_budget_ms / 1000, mode)
+        if mode == ExecutionMode.WORKER:
+            self._start_worker(registered)
+        self.strategies[name] = registered
+
+    def unregister(self, name: str):
+        registered = self.strategies.pop(name)
+        if registered.executor is not None:
+            registered.executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, StrategyStats]:
+        return {name: registered.stats for name, registered in self.strategies.items()}
+
+    def on_book_update(self, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> List[Order]:
+        """Runs every strategy on the books, returning the inline strategies' orders"""
+        return [order for orders in self.on_book_update_by_strategy(book_a, book_b).values() for order in orders]
+
+    def on_book_update_by_strategy(self, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> Dict[str, List[Order]]:
+        """
+        Runs every strategy on the books, returning the orders of each inline
+        strategy, even when it returned none. Worker strategies are left out,
+        their orders go to on_orders.
+        """
+        workers = [s for s in self.strategies.values() if s.mode == ExecutionMode.WORKER]
+        if workers:
+            snapshot = (book_a.snapshot(), book_b.snapshot())
+            for registered in workers:
+                self._dispatch(registered, snapshot)
+
+        orders = {}
+        for registered in list(self.strategies.values()):
+            if registered.mode == ExecutionMode.INLINE:
+                orders[registered.name] = self._run(registered, book_a, book_b)
+                self._maybe_demote(registered)
+
+        return orders
+
+    def shutdown(self, wait: bool = True):
+        for registered in self.strategies.values():
+            if registered.executor is not None:
+                registered.executor.shutdown(wait=wait)
+
+    def _run(self, registered: RegisteredStrategy, book_a: SyntheticOrderBook, book_b: SyntheticOrderBook) -> List[Order]:
+        start = time.perf_counter()
+        try:
+            orders = registered.strategy(book_a, book_b)
+        except Exception as e:
+            logger.error(f"Strategy {registered.name} failed: {e}")
+            registered.stats.errors += 1
+            orders = []
+        elapsed = time.perf_counter() - start
+
+        stats = registered.stats
+        stats.calls += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+        if elapsed > registered.latency_budget:
+            stats.overruns += 1
+            registered.consecutive_overruns += 1
+            logger.warning(f"Strategy {registered.name} took {elapsed * 1000:.2f}ms, budget is {registered.latency_budget * 1000:.2f}ms")
+        else:
+            registered.consecutive_overruns = 0
+
+        return orders
+
+    def _maybe_demote(self, registered: RegisteredStrategy):
+        if self.demote_after is not None and registered.consecutive_overruns >= self.demote_after:
+            logger.warning(f"Moving strategy {registered.name} to a worker after {registered.consecutive_overruns} overruns")
+            registered.mode = ExecutionMode.WORKER
+            self._start_worker(registered)
+
+    def _start_worker(self, registered: RegisteredStrategy):
+        registered.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"strategy-{registered.name}")
+
+    def _dispatch(self, registered: RegisteredStrategy, snapshot: Tuple[SyntheticOrderBook, SyntheticOrderBook]):
+        with registered.lock:
+            if registered.running:
+                if registered.pending is not None:
+                    registered.stats.coalesced += 1
+                registered.pending = snapshot
+                return
+            registered.running = True
+
+        registered.executor.submit(self._work, registered, snapshot)
+
+    def _work(self, registered: RegisteredStrategy, snapshot: Optional[Tuple[SyntheticOrderBook, SyntheticOrderBook]]):
+        while snapshot is not None:
+            orders = self._run(registered, *snapshot)
+            if orders and self.on_orders is not None:
+                try:
+                    self.on_orders(registered.name, orders)
+                except Exception as e:
+                    logger.error(f"on_orders failed for strategy {registered.name}: {e}")
+
+            with registered.lock:
+                snapshot, registered.pending = registered.pending, None
+                if snapshot is None:
+                    registered.running = False
@@ -0,0 +1,283 @@
+"""
+Sweeps the arb strategy's parameters (minimum edge, size fraction and max
+depth) over every recorded market.
+
+Each market events file is decoded once into a binary event file in a cache
+directory, the same message cache backtests and replays use, and reused
+until the CSV changes. Workers memory-map
+those files, so every process shares the decoded events through the OS page
+cache instead of parsing CSVs. The books of a market are replayed once and
+every parameter combination is evaluated against them at each update.
+
+Usage:
+    make sweep
+    python -m src.sweep --min-edge 0 0.01 0.02 --size-fraction 0.25 0.5 1 --max-depth 1 3 0
+    python -m src.sweep '20250701' --latency-ms 250 --json sweep.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple
+from src.daos import EventFile
+from src.fill_simulator import FillSimulator, FillStats, order_pnl, order_key
+from src.main import parse_market_events
+from src.models import OrderBookStore
+from src.replay import DATA_DIR, EVENTS_SUFFIX, find_event_files, market_book_store
+from src.strategies import calculate_orders, ArbParameters
+from src.utils import CSVMessageProcessor, VirtualClock, set_clock, get_clock
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+def parameter_grid(min_edges: List[float], size_fractions: List[float], max_depths: List[Optional[int]]) -> List[ArbParameters]:
+    return [ArbParameters(min_edge, size_fraction, max_depth)
+            for min_edge, size_fraction, max_depth in itertools.product(min_edges, size_fractions, max_depths)]
+
+
+def cached_event_file(csv_file_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Path of the decoded events of a market events file: the message cache
+    backtests and replays keep, decoded first when the cache holds none for
+    the CSV as it is now. Rows go through the same streaming reorder as
+    backtests, so sweeps see the same groups. The cache is in cache_dir when
+    given, else in .cache next to the CSV, where replays keep it.
+    """
+    return CSVMessageProcessor(csv_file_path, [], streaming=True).cached_event_file(cache_dir)
+
+
+@dataclass
+class SweepResult:
+    parameters: ArbParameters
+    opportunities: int = 0
+    """Book updates that produced a new, different set of arb orders"""
+    orders: int = 0
+    pnl: float = 0.0
+    """Theoretical profit of the orders of every opportunity, had each pair filled"""
+    fills: Optional[FillStats] = None
+    """How the orders filled, when run with a fill simulator"""
+
+    @property
+    def realized_pnl(self) -> Optional[float]:
+        return self.fills.realized_edge if self.fills is not None else None
+
+    def add(self, other: 'SweepResult'):
+        self.opportunities += other.opportunities
+        self.orders += other.orders
+        self.pnl += other.pnl
+        if other.fills is not None:
+            if self.fills is None:
+                self.fills = FillStats()
+            for name, value in asdict(other.fills).items():
+                setattr(self.fills, name, getattr(self.fills, name) + value)
+
+
+@dataclass
+class SweepReport:
+    results: List[SweepResult]
+    """One per parameter combination, summed over every market"""
+    markets: List[str]
+    skipped: Dict[str, str] = field(default_factory=dict)
+    """Why each market left out of the sweep was, by market slug"""
+    events: int = 0
+    errors: int = 0
+    """Message groups that could not be parsed or applied to the books, and were left out"""
+    decode_seconds: float = 0.0
+    seconds: float = 0.0
+
+    def ranked(self) -> List[SweepResult]:
+        """Best first: by realized PnL when fills were simulated, else theoretical PnL"""
+        return sorted(self.results, key=lambda result: result.realized_pnl if result.fills is not None else result.pnl, reverse=True)
+
+    def asdict(self):
+        return {
+            'markets': self.markets,
+            'skipped': self.skipped,
+            'events': self.events,
+            'errors': self.errors,
+            'decode_seconds': self.decode_seconds,
+            'seconds': self.seconds,
+            'results': [{**asdict(result), 'realized_pnl': result.realized_pnl} for result in self.ranked()],
+        }
+
+
+class _Evaluation:
+    """Running result of one parameter combination over one market"""
+
+    def __init__(self, parameters: ArbParameters, simulator: Optional[FillSimulator]):
+        self.result = SweepResult(parameters)
+        self.simulator = simulator
+        self.last_orders: Tuple = ()
+
+
+def sweep_file(csv_file_path: str,
+               event_file_path: str,
+               parameters: List[ArbParameters],
+               latency_ms: Optional[int] = None) -> Tuple[str, Optional[str], int, int, List[SweepResult]]:
+    """
+    Replays the decoded events of one market through its books, evaluating
+    every parameter combination at each update.
+
+    Returns (market slug, why it was skipped or None, events, errors, results)
+    """
+    book_store = market_book_store(csv_file_path)
+    if book_store.market_id is None:
+        return book_store.market_slug, "no market ID", 0, 0, []
+    if len(book_store.books) != 2:
+        return book_store.market_slug, f"{len(book_store.books)} outcomes", 0, 0, []
+
+    event_file = EventFile(event_file_path)
+    evaluations = [_Evaluation(p, FillSimulator(book_store, latency_ms) if latency_ms is not None else None) for p in parameters]
+    clock = VirtualClock()
+    previous_clock = get_clock()
+    set_clock(clock)
+    try:
+        events, errors = _replay(event_file, book_store, clock, evaluations)
+    finally:
+        set_clock(previous_clock)
+
+    for evaluation in evaluations:
+        if evaluation.simulator is not None:
+            evaluation.result.fills = evaluation.simulator.stats
+
+    return book_store.market_slug, None, events, errors, [evaluation.result for evaluation in evaluations]
+
+
+def _replay(event_file: EventFile,
+            book_store: OrderBookStore,
+            clock: VirtualClock,
+            evaluations: List[_Evaluation]) -> Tuple[int, int]:
+    """
+    Applies each message to the books as the live handler does, then
+    evaluates every combination. Returns (events, message groups that
+    failed to parse or apply), as backtests count them.
+    """
+    book_a, book_b = book_store.books
+
+    events = errors = 0
+    for messages in event_file.messages():
+        timestamp = messages[0]['timestamp']
+        clock.advance_to(timestamp)
+        for evaluation in evaluations:
+            if evaluation.simulator is not None:
+                evaluation.simulator.advance(timestamp)
+
+        # Assets outside the market's books have nothing to update
+        messages = [message for message in messages if message['asset_id'] in book_store.books_lookup]
+        try:
+            market_events = parse_market_events(book_store, messages)
+            book_store.update_book(market_events)
+        except (KeyError, ValueError):
+            errors += 1
+            continue
+        events += len(market_events)
+
+        for evaluation in evaluations:
+            orders = calculate_orders(book_a, book_b, evaluation.result.parameters)
+            key = order_key(orders)
+            if orders and key != evaluation.last_orders:
+                evaluation.result.opportunities += 1
+                evaluation.result.orders += len(orders)
+                evaluation.result.pnl += order_pnl(orders)
+                if evaluation.simulator is not None:
+                    evaluation.simulator.submit(orders, timestamp)
+            evaluation.last_orders = key
+
+    for evaluation in evaluations:
+        if evaluation.simulator is not None:
+            evaluation.simulator.finish()
+
+    return events, errors
+
+
+def run_sweep(csv_file_paths: List[str],
+              parameters: List[ArbParameters],
+              cache_dir: Optional[str] = None,
+              max_workers: Optional[int] = None,
+              latency_ms: Optional[int] = None) -> SweepReport:
+    """
+    Decodes the files not cached yet, then sweeps each file in its own task
+    on a pool of max_workers processes (default: one per CPU)
+    """
+    report = SweepReport([SweepResult(p) for p in parameters], markets=[])
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        start = time.perf_counter()
+        event_file_paths = list(executor.map(partial(cached_event_file, cache_dir=cache_dir), csv_file_paths))
+        report.decode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sweep = partial(sweep_file, parameters=parameters, latency_ms=latency_ms)
+        for market_slug, skipped, events, errors, results in executor.map(sweep, csv_file_paths, event_file_paths):
+            if skipped is not None:
+                report.skipped[market_slug] = skipped
+                continue
+            report.markets.append(market_slug)
+            report.events += events
+            report.errors += errors
+            for total, result in zip(report.results, results):
+                total.add(result)
+        report.seconds = time.perf_counter() - start
+
+    return report
+
+
+def print_report(report: SweepReport, top: Optional[int] = None):
+    print(f"{'min edge':>9} {'size':>6} {'depth':>6} {'opps':>6} {'orders':>7} {'pnl':>10} {'realized':>10}")
+    for result in report.ranked()[:top]:
+        parameters = result.parameters
+        depth = parameters.max_depth if parameters.max_depth is not None else 'all'
+        realized = f"{result.realized_pnl:>10.2f}" if result.fills is not None else f"{'-':>10}"
+        print(f"{parameters.min_edge:>9.3f} {parameters.size_fraction:>6.2f} {depth:>6} {result.opportunities:>6} "
+              f"{result.orders:>7} {result.pnl:>10.2f} {realized}")
+
+    print()
+    for market_slug, skipped in report.skipped.items():
+        print(f"skipped {market_slug}: {skipped}")
+    if report.errors:
+        print(f"{report.errors} message groups could not be applied and were left out")
+    print(f"{len(report.results)} parameter sets over {len(report.markets)} markets, {report.events} events: "
+          f"decoded in {report.decode_seconds:.2f}s, swept in {report.seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the arb strategy's parameters over recorded markets")
+    parser.add_argument(
+        "pattern",
+        nargs='?',
+        default=f"*{EVENTS_SUFFIX}",
+        help="A date (YYYYMMDD) or a glob of market event files (default: every file in data/)"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory dates and bare globs are matched in (default: data)")
+    parser.add_argument("--cache-dir", default=None, help="Where decoded event files are kept (default: .cache in the data dir, next to the files)")
+    parser.add_argument("--min-edge", type=float, nargs='+', default=[0.0, 0.01, 0.02], help="Minimum edges to sweep")
+    parser.add_argument("--size-fraction", type=float, nargs='+', default=[0.25, 0.5, 1.0], help="Size fractions to sweep")
+    parser.add_argument("--max-depth", type=int, nargs='+', default=[1, 3, 0], help="Max depths to sweep, 0 for every level")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--latency-ms", type=int, default=None, help="Simulate fills with this order-to-exchange latency")
+    parser.add_argument("--top", type=int, default=None, help="Only print the best N parameter sets")
+    parser.add_argument("--json", default=None, help="Also save the report as JSON to this path")
+    args = parser.parse_args()
+
+    csv_file_paths = find_event_files(args.pattern, args.data_dir)
+    if not csv_file_paths:
+        print(f"No market event files match {args.pattern}")
+        return
+
+    max_depths = [max_depth or None for max_depth in args.max_depth]
+    parameters = parameter_grid(args.min_edge, args.size_fraction, max_depths)
+    report = run_sweep(csv_file_paths, parameters, args.cache_dir, max_workers=args.workers, latency_ms=args.latency_ms)
+    print_report(report, args.top)
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(report.asdict(), json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
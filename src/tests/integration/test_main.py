@@ -4,11 +4,12 @@ import json
 import threading
 import time
 import asyncio
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from datetime import datetime
 from pathlib import Path
 
 from src.utils.datetime_utils import datetime_to_epoch
+from src.utils.clock import VirtualClock, set_clock, get_clock
 
 from src.main import (
     OrdersStore,
@@ -337,8 +338,8 @@ class TestMarketConnectionIntegration:
     ):
         """Test complete market connection setup with real objects."""
         # Setup mocks
-        mock_service_instance = Mock()
-        mock_service_instance.get_market_by_slug.return_value = mock_market_metadata
+        mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+        mock_service_instance.get_market_by_slug_async.return_value = mock_market_metadata
         mock_polymarket_service.return_value = mock_service_instance
 
         mock_events_instance = Mock()
@@ -350,7 +351,7 @@ class TestMarketConnectionIntegration:
         await run_market_connection(market_slug)
 
         # Verify service calls
-        mock_service_instance.get_market_by_slug.assert_called_once_with(market_slug)
+        mock_service_instance.get_market_by_slug_async.assert_called_once_with(market_slug)
 
         # Verify events service was created with correct parameters
         mock_events_service.assert_called_once()
@@ -377,8 +378,8 @@ class TestMarketConnectionIntegration:
     ):
         """Test error handling when market slug doesn't exist."""
         # Setup service to return None (market not found)
-        mock_service_instance = Mock()
-        mock_service_instance.get_market_by_slug.return_value = None
+        mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+        mock_service_instance.get_market_by_slug_async.return_value = None
         mock_polymarket_service.return_value = mock_service_instance
 
         # Should not raise exception
@@ -387,6 +388,28 @@ class TestMarketConnectionIntegration:
         # Events service should not be called
         mock_events_service.assert_not_called()
 
+    @pytest.mark.asyncio
+    @patch('src.main.CSVMessageProcessor')
+    @patch('src.main.PolymarketService')
+    async def test_test_mode_restores_the_clock(
+        self,
+        mock_polymarket_service,
+        mock_csv_processor
+    ):
+        """Test that a CSV run's virtual clock is only in effect while it runs."""
+        mock_csv_processor.return_value.first_timestamp.return_value = 1751328000000
+        mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+        mock_service_instance.get_market_by_slug_async.return_value = None
+        mock_polymarket_service.return_value = mock_service_instance
+        previous_clock = VirtualClock(1000)
+        set_clock(previous_clock)
+
+        try:
+            await run_market_connection("test-market", csv_file_path="test-market.csv")
+            assert get_clock() is previous_clock
+        finally:
+            set_clock(None)
+
     @pytest.mark.asyncio
     @patch('src.main.PolymarketMarketEventsService')
     @patch('src.main.PolymarketService')
@@ -397,8 +420,8 @@ class TestMarketConnectionIntegration:
     ):
         """Test error handling when service raises exception."""
         # Setup service to raise exception
-        mock_service_instance = Mock()
-        mock_service_instance.get_market_by_slug.side_effect = Exception("Service error")
+        mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+        mock_service_instance.get_market_by_slug_async.side_effect = Exception("Service error")
         mock_polymarket_service.return_value = mock_service_instance
 
         # Should not raise exception (error is caught and logged)
@@ -418,8 +441,8 @@ class TestMarketConnectionIntegration:
     ):
         """Test that real OrderBookStore and SyntheticOrderBooks are created correctly."""
         # Setup mocks
-        mock_service_instance = Mock()
-        mock_service_instance.get_market_by_slug.return_value = mock_market_metadata
+        mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+        mock_service_instance.get_market_by_slug_async.return_value = mock_market_metadata
         mock_polymarket_service.return_value = mock_service_instance
 
         # Capture the handler to test it
@@ -472,8 +495,8 @@ class TestConcurrencyIntegration:
              patch('src.main.PolymarketMarketEventsService') as mock_events:
 
             # Setup service to return valid metadata
-            mock_service_instance = Mock()
-            mock_service_instance.get_market_by_slug.return_value = {
+            mock_service_instance = Mock(get_market_by_slug_async=AsyncMock())
+            mock_service_instance.get_market_by_slug_async.return_value = {
                 'id': 123,
                 'clobTokenIds': '["token-1", "token-2"]',
                 'outcomes': '["YES", "NO"]'
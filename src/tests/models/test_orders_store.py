@@ -0,0 +1,102 @@
+import pytest
+from src.models.orders_store import OrdersStore
+from src.models import Order, OrderType, OrderSide
+
+
+def _order(asset_id, timestamp, price=0.5, size=10):
+    return Order(
+        market_slug="test-market",
+        market_id=123,
+        asset_id=asset_id,
+        outcome_name=asset_id,
+        side=OrderSide.BUY,
+        order_type=OrderType.FOK,
+        price=price,
+        size=size,
+        timestamp=timestamp
+    )
+
+
+class TestOrdersStore:
+
+    def test_add_orders(self):
+        store = OrdersStore()
+        orders = [_order("yes", 1), _order("no", 2)]
+
+        store.add_order(orders[0])
+        store.add_orders(orders[1:])
+
+        assert store.orders == orders
+        assert len(store) == 2
+
+    def test_count_window_spills_oldest(self):
+        spilled = []
+        store = OrdersStore(max_orders=3, spill=spilled.extend)
+        orders = [_order("yes", i) for i in range(5)]
+
+        store.add_orders(orders[:2])
+        store.add_orders(orders[2:])
+
+        assert store.orders == orders[2:]
+        assert spilled == orders[:2]
+
+    def test_time_window_spills_expired(self):
+        spilled = []
+        store = OrdersStore(max_orders=None, max_age=100, spill=spilled.extend)
+
+        store.add_orders([_order("yes", 0), _order("yes", 50)])
+        store.add_order(_order("yes", 120))
+
+        assert [order.timestamp for order in store.orders] == [50, 120]
+        assert [order.timestamp for order in spilled] == [0]
+
+    def test_lookup_asset(self):
+        store = OrdersStore(max_orders=4)
+        store.add_orders([_order("yes", 1), _order("no", 2), _order("yes", 3)])
+
+        assert [order.timestamp for order in store.lookup_asset("yes")] == [1, 3]
+        assert store.lookup_asset("missing") == []
+
+        store.add_orders([_order("yes", 4), _order("no", 5)])
+
+        assert [order.timestamp for order in store.lookup_asset("yes")] == [3, 4]
+        assert [order.timestamp for order in store.lookup_asset("no")] == [2, 5]
+
+    def test_lookup_time(self):
+        store = OrdersStore()
+        store.add_orders([_order("yes", 10), _order("no", 30), _order("yes", 20), _order("no", 40)])
+
+        assert [order.timestamp for order in store.lookup_time(15, 30)] == [20, 30]
+        assert store.lookup_time(41, 50) == []
+
+    def test_lookup_time_excludes_evicted(self):
+        store = OrdersStore(max_orders=2)
+        store.add_orders([_order("yes", 10), _order("no", 20)])
+        assert len(store.lookup_time(0, 100)) == 2
+
+        store.add_order(_order("yes", 30))
+
+        assert [order.timestamp for order in store.lookup_time(0, 100)] == [20, 30]
+
+    def test_lookup_state(self):
+        store = OrdersStore()
+        store.add_order(_order("yes", 1), state="NEW")
+        store.add_order(_order("yes", 2), state="CANCELLED")
+        store.add_order(_order("no", 3))
+
+        assert [order.timestamp for order in store.lookup_state("NEW")] == [1]
+        assert [order.timestamp for order in store.lookup_state("CANCELLED")] == [2]
+        assert [order.timestamp for order in store.lookup_state(None)] == [3]
+
+    def test_memory_stays_bounded(self):
+        store = OrdersStore(max_orders=100)
+
+        for i in range(10_000):
+            store.add_order(_order(f"asset-{i % 7}", i))
+            if i % 500 == 0:
+                store.lookup_time(0, i)
+
+        assert len(store) == 100
+        assert len(store._orders) <= 200
+        assert len(store._by_time) <= 2 * 100 + 64 + 500
+        assert [order.timestamp for order in store.lookup_asset("asset-0")][-1] == 9996
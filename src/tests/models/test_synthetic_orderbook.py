@@ -217,3 +217,49 @@ class TestSyntheticOrderBook:
         # Test replace_entries with empty list
         orderbook.replace_entries([])
         assert len(orderbook.orders_lookup) == 0
+
+    def test_top_orders(self, orderbook):
+        """Test top_orders returns the cheapest levels in price order."""
+        orderbook.add_entries([
+            SyntheticOrder(side=OrderSide.SELL, price=0.6, size=200.0),
+            SyntheticOrder(side=OrderSide.SELL, price=0.5, size=100.0),
+            SyntheticOrder(side=OrderSide.SELL, price=0.7, size=300.0)
+        ])
+        orderbook.add_entries([SyntheticOrder(side=OrderSide.SELL, price=0.5, size=0.0)])
+
+        assert [order.price for order in orderbook.top_orders(1)] == [0.6]
+        assert [order.price for order in orderbook.top_orders(5)] == [0.6, 0.7]
+
+    def test_depth_arrays(self, orderbook):
+        """Test cumulative depth arrays and their invalidation on change."""
+        orderbook.replace_entries([
+            SyntheticOrder(side=OrderSide.SELL, price=0.6, size=200.0),
+            SyntheticOrder(side=OrderSide.SELL, price=0.5, size=100.0)
+        ])
+
+        prices, cum_sizes, cum_costs = orderbook.depth_arrays()
+        assert prices.tolist() == [0.5, 0.6]
+        assert cum_sizes.tolist() == [100.0, 300.0]
+        assert cum_costs.tolist() == pytest.approx([50.0, 170.0])
+        assert orderbook.depth_arrays() is orderbook.depth_arrays()
+
+        orderbook.add_entries([SyntheticOrder(side=OrderSide.SELL, price=0.4, size=10.0)])
+
+        prices, cum_sizes, _ = orderbook.depth_arrays()
+        assert prices.tolist() == [0.4, 0.5, 0.6]
+        assert cum_sizes.tolist() == [10.0, 110.0, 310.0]
+
+    def test_snapshot(self, orderbook):
+        """Test snapshot is unaffected by later updates."""
+        orderbook.add_entries([SyntheticOrder(side=OrderSide.SELL, price=0.5, size=100.0)])
+
+        snapshot = orderbook.snapshot()
+        orderbook.add_entries([
+            SyntheticOrder(side=OrderSide.SELL, price=0.4, size=10.0),
+            SyntheticOrder(side=OrderSide.SELL, price=0.5, size=0.0)
+        ])
+
+        assert [order.price for order in snapshot.sorted_orders()] == [0.5]
+        assert snapshot.asset_id == orderbook.asset_id
+        assert snapshot.timestamp == orderbook.timestamp
+        assert [order.price for order in orderbook.sorted_orders()] == [0.4]
@@ -0,0 +1,149 @@
+import pytest
+import asyncio
+import json
+import threading
+import time
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.services.http_client import HttpClient
+from src.services.polymarket_service import PolymarketService
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every request with JSON, keeping the connection open"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._answer([{'id': '554912', 'slug': 'test-market'}])
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self._answer({'success': True, 'orderId': 'order-123', 'orderHashes': [], 'errorMsg': None})
+
+    def _answer(self, result):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        body = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClient:
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        server.daemon_threads = True
+        server.lock = threading.Lock()
+        server.connections = set()
+        server.in_flight = server.peak_in_flight = 0
+        server.delay = 0.0
+        server.url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def test_reuses_connection(self, server):
+        client = HttpClient()
+
+        for _ in range(5):
+            assert client.get(f"{server.url}/markets").status_code == 200
+        client.close()
+
+        assert len(server.connections) == 1
+
+    def test_async_reuses_connection(self, server):
+        async def run():
+            client = HttpClient()
+            for _ in range(5):
+                response = await client.apost(f"{server.url}/order", json={})
+                assert response.json()['orderId'] == 'order-123'
+            await client.aclose()
+
+        asyncio.run(run())
+
+        assert len(server.connections) == 1
+
+    def test_async_concurrency_is_limited(self, server):
+        server.delay = 0.05
+
+        async def run():
+            client = HttpClient(max_concurrency=2)
+            await asyncio.gather(*(client.aget(f"{server.url}/markets") for _ in range(6)))
+            await client.aclose()
+
+        asyncio.run(run())
+
+        assert server.peak_in_flight == 2
+        assert len(server.connections) == 2
+
+    def test_new_event_loop_gets_new_client(self, server):
+        client = HttpClient()
+
+        asyncio.run(client.aget(f"{server.url}/markets"))
+        assert asyncio.run(client.aget(f"{server.url}/markets")).status_code == 200
+        # Only the last loop's client is kept, the first one's loop is closed
+        assert len(client._async_clients) == 1
+
+    def test_aclose_closes_clients_of_every_running_loop(self, server):
+        client = HttpClient()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(client.aget(f"{server.url}/markets"), other_loop).result()
+        other_client, _ = client._async_clients[other_loop]
+
+        async def run():
+            await client.aget(f"{server.url}/markets")
+            own_client, _ = client._async_clients[asyncio.get_running_loop()]
+            await client.aclose()
+            return own_client
+
+        own_client = asyncio.run(run())
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+        assert own_client.is_closed and other_client.is_closed
+        assert client._async_clients == {}
+
+    def test_timeout(self, server):
+        server.delay = 0.5
+        client = HttpClient(timeout=0.1)
+
+        with pytest.raises(httpx.TimeoutException):
+            client.get(f"{server.url}/markets")
+        client.close()
+
+    def test_service_requests_share_connection(self, server):
+        service = PolymarketService(http_client=HttpClient())
+        service.gamma_api_base = service.clob_api_base = server.url
+        order_data = {'order': {'salt': 1}, 'owner': 'test-api-key'}
+
+        async def run():
+            market = await service.get_market_by_slug_async('test-market')
+            results = [
+                await service.place_single_order_async(order_data),
+                await service.place_multiple_orders_async([order_data, order_data]),
+            ]
+            await service.http.aclose()
+            return market, results
+
+        market, results = asyncio.run(run())
+
+        assert market['id'] == '554912'
+        assert all(result['success'] for result in results)
+        assert len(server.connections) == 1
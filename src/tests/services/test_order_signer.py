@@ -0,0 +1,120 @@
+import pytest
+import threading
+import time
+from src.models import Order, OrderSide, OrderType
+from services.order_signer import OrderSigner
+
+
+def _order(asset_id='token-yes', price=0.45, size=10.0):
+    return Order(
+        market_slug='test-market', market_id=1, asset_id=asset_id, outcome_name='Yes',
+        side=OrderSide.BUY, order_type=OrderType.FOK, price=price, size=size, timestamp=0
+    )
+
+
+class _Signer:
+    """Signs orders slowly, recording how many were signed at once"""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = self.peak_in_flight = 0
+
+    def __call__(self, order, neg_risk):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError("tick size lookup failed")
+        return ('signed', order.asset_id, order.price, order.size, neg_risk)
+
+
+class TestOrderSigner:
+    @pytest.fixture
+    def sign(self):
+        return _Signer()
+
+    @pytest.fixture
+    def signer(self, sign):
+        signer = OrderSigner(sign, max_workers=4, max_presigned=2)
+        yield signer
+        signer.close()
+
+    def test_signs_concurrently_in_order(self, sign, signer):
+        orders = [_order(price=price) for price in (0.41, 0.42, 0.43, 0.44)]
+
+        signed = signer.sign(orders, neg_risk=True)
+
+        assert [s[2] for s in signed] == [0.41, 0.42, 0.43, 0.44]
+        assert sign.peak_in_flight == 4
+
+    def test_uses_presigned_order_once(self, sign, signer):
+        signer.presign([_order()], neg_risk=True)
+
+        assert signer.sign([_order()], neg_risk=True) == [('signed', 'token-yes', 0.45, 10.0, True)]
+        assert sign.calls == 1
+        assert signer.presigned_hits == 1
+
+        signer.sign([_order()], neg_risk=True)
+        assert sign.calls == 2
+
+    def test_presigned_must_match(self, sign, signer):
+        signer.presign([_order()], neg_risk=True)
+
+        signer.sign([_order(size=20.0), _order(), _order()], neg_risk=True)
+
+        assert signer.presigned_hits == 1
+        assert sign.calls == 3
+
+    def test_keeps_most_recent_presigned(self, sign, signer):
+        signer.presign([_order(price=0.41), _order(price=0.42)], neg_risk=True)
+        signer.presign([_order(price=0.41), _order(price=0.43)], neg_risk=True)
+
+        assert [key[2] for key in signer.presigned] == [0.41, 0.43]
+
+    def test_orders_do_not_wait_behind_presigns(self, sign):
+        signer = OrderSigner(sign, max_workers=1, max_presigned=10, max_presign_workers=1)
+        signer.presign([_order(price=0.41), _order(price=0.42), _order(price=0.43)], neg_risk=True)
+
+        start = time.perf_counter()
+        signer.sign([_order(price=0.50)], neg_risk=True)
+        elapsed = time.perf_counter() - start
+        signer.close()
+
+        assert elapsed < 0.1
+
+    def test_newer_books_drop_queued_presigns(self, sign):
+        signer = OrderSigner(sign, max_workers=1, max_presigned=10, max_presign_workers=1)
+        signer.presign([_order(price=0.41), _order(price=0.42)], neg_risk=True, source='test-market')
+        while not sign.in_flight:
+            time.sleep(0.001)
+        signer.presign([_order(price=0.43)], neg_risk=True, source='test-market')
+
+        # 0.41 was already being signed, 0.42 was still queued
+        assert [key[2] for key in signer.presigned] == [0.41, 0.43]
+        for future in list(signer.presigned.values()):
+            future.result()
+        signer.close()
+        assert sign.calls == 2
+
+    def test_failed_presign_is_signed_again(self, sign, signer):
+        sign.fail = True
+        signer.presign([_order()], neg_risk=True)
+        signer.presigned[next(iter(signer.presigned))].exception()
+
+        sign.fail = False
+        assert signer.sign([_order()], neg_risk=True)[0][0] == 'signed'
+        assert signer.presigned_hits == 0
+
+    def test_signing_error_is_raised(self, sign, signer):
+        sign.fail = True
+
+        with pytest.raises(RuntimeError):
+            signer.sign([_order()], neg_risk=True)
+
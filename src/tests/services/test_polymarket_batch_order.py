@@ -0,0 +1,112 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from services.order_signer import OrderSigner
+from services.polymarket_batch_order import PolymarketOrderService, BatchStats
+from services.rate_limiter import TokenBucket
+from src.tests.services.test_order_signer import _order
+
+
+@pytest.fixture
+def service():
+    """A service whose client signs orders as (signed, token ID, price), without credentials"""
+    service = PolymarketOrderService.__new__(PolymarketOrderService)
+    service.client = Mock()
+    service.client.create_order.side_effect = lambda order_args, options: ('signed', order_args.token_id, order_args.price)
+    service.client.post_orders.return_value = [{'success': True}]
+    # 14 orders make four batches, one per batch worker
+    service.max_batch_size = 4
+    service.signer = OrderSigner(service._sign_order, max_workers=2)
+    service.batch_executor = ThreadPoolExecutor(max_workers=4)
+    service.rate_limiter = TokenBucket(rate=1000, capacity=10)
+    service.batch_stats = BatchStats()
+    service.stats_lock = threading.Lock()
+    yield service
+    service.close()
+
+
+class TestPresignedOrders:
+    def test_batch_uses_presigned_orders(self, service):
+        orders = [_order('token-yes', 0.45), _order('token-no', 0.50)]
+        service.presign_orders(orders[1:])
+
+        result = service.place_multiple_orders(orders)
+
+        assert result[0]['success']
+        assert service.client.create_order.call_count == 2
+        assert service.signer.presigned_hits == 1
+        post_orders_args = service.client.post_orders.call_args[0][0]
+        assert [args.order for args in post_orders_args] == [('signed', 'token-yes', 0.45), ('signed', 'token-no', 0.50)]
+
+
+class TestBatchSubmission:
+
+    def _post_orders(self, delay, lock=None, in_flight=None):
+        def post_orders(args):
+            if in_flight is not None:
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(delay)
+            if in_flight is not None:
+                with lock:
+                    in_flight[0] -= 1
+            return [{'success': order.order[2] != 0.13, 'errorMsg': ''} for order in args]
+        return post_orders
+
+    def test_batches_go_out_concurrently(self, service):
+        in_flight = [0, 0]
+        service.client.post_orders.side_effect = self._post_orders(0.1, threading.Lock(), in_flight)
+        orders = [_order(price=round(0.01 * (i + 1), 2)) for i in range(14)]
+
+        start = time.perf_counter()
+        results = service.place_multiple_orders(orders)
+        elapsed = time.perf_counter() - start
+
+        assert in_flight[1] == 4
+        assert elapsed < 0.3
+        assert [r['orders_processed'] for r in results] == [4, 4, 4, 2]
+        # The order at 0.13 is rejected by the exchange
+        assert [r['orders_accepted'] for r in results] == [4, 4, 4, 1]
+        assert all(r['latency_ms'] >= 100 for r in results)
+
+    def test_tracks_batch_outcomes(self, service):
+        service.client.post_orders.side_effect = self._post_orders(0.0)
+        orders = [_order(price=round(0.01 * (i + 1), 2)) for i in range(14)]
+
+        summary = service.execute_orders_from_list(orders)
+
+        # The order at 0.13 is rejected by the exchange
+        assert summary['accepted_orders'] == 13
+        stats = service.batch_stats.asdict()
+        assert (stats['batches'], stats['failed_batches'], stats['orders'], stats['accepted_orders']) == (4, 0, 14, 13)
+        assert stats['p50_latency_ms'] is not None
+
+    def test_failed_batch_is_tracked(self, service):
+        service.client.post_orders.side_effect = Exception("Too many requests")
+
+        results = service.place_multiple_orders([_order()])
+
+        assert results[0]['success'] is False
+        assert results[0]['latency_ms'] is None
+        assert service.batch_stats.failed_batches == 1
+        assert service.batch_stats.latency_percentile(50) is None
+
+    def test_batch_size(self, service):
+        service.client.post_orders.side_effect = self._post_orders(0.0)
+        service.max_batch_size = 6
+
+        results = service.place_multiple_orders([_order(price=round(0.01 * (i + 1), 2)) for i in range(14)])
+
+        assert [r['orders_processed'] for r in results] == [6, 6, 2]
+
+    def test_rate_limited(self, service):
+        service.client.post_orders.side_effect = self._post_orders(0.0)
+        service.rate_limiter = TokenBucket(rate=20, capacity=1)
+
+        results = service.place_multiple_orders([_order(price=round(0.01 * (i + 1), 2)) for i in range(12)])
+
+        assert sum(r['rate_limited_ms'] for r in results) == pytest.approx(50 + 100, abs=30)
+        assert service.batch_stats.rate_limited_ms == pytest.approx(sum(r['rate_limited_ms'] for r in results))
@@ -54,7 +54,7 @@ class TestPolymarketService(unittest.TestCase):
             "errorMsg": "Insufficient balance"
         }
 
-    @patch('src.services.polymarket_service.requests.post')
+    @patch('src.services.polymarket_service.HttpClient.post')
     def test_place_single_order_success(self, mock_post):
         """Test successful single order placement."""
         mock_response = Mock()
@@ -76,7 +76,7 @@ class TestPolymarketService(unittest.TestCase):
         self.assertIn("orderType", call_args.kwargs["json"])
         self.assertEqual(call_args.kwargs["json"]["orderType"], "GTC")
 
-    @patch('src.services.polymarket_service.requests.post')
+    @patch('src.services.polymarket_service.HttpClient.post')
     def test_place_single_order_failure(self, mock_post):
         """Test single order placement with API error."""
         mock_response = Mock()
@@ -91,7 +91,7 @@ class TestPolymarketService(unittest.TestCase):
         self.assertEqual(result["errorMsg"], "Insufficient balance")
         self.assertIsNone(result["orderId"])
 
-    @patch('src.services.polymarket_service.requests.post')
+    @patch('src.services.polymarket_service.HttpClient.post')
     def test_place_single_order_network_error(self, mock_post):
         """Test single order placement with network error."""
         mock_post.side_effect = Exception("Network error")
@@ -103,7 +103,7 @@ class TestPolymarketService(unittest.TestCase):
         self.assertIn("Network error", result["errorMsg"])
         self.assertIsNone(result["orderId"])
 
-    @patch('src.services.polymarket_service.requests.post')
+    @patch('src.services.polymarket_service.HttpClient.post')
     def test_place_multiple_orders_success(self, mock_post):
         """Test successful multiple orders placement."""
         mock_response = Mock()
@@ -135,7 +135,7 @@ class TestPolymarketService(unittest.TestCase):
         self.assertIn("Maximum of 5 orders", result["errorMsg"])
         self.assertIsNone(result["orderId"])
 
-    @patch('src.services.polymarket_service.requests.post')
+    @patch('src.services.polymarket_service.HttpClient.post')
     def test_place_multiple_orders_network_error(self, mock_post):
         """Test multiple orders placement with network error."""
         mock_post.side_effect = Exception("Network error")
@@ -152,7 +152,7 @@ class TestPolymarketService(unittest.TestCase):
         """Test that different order types are handled correctly."""
         order_types = ["GTC", "FOK", "FAK", "GTD"]
         
-        with patch('src.services.polymarket_service.requests.post') as mock_post:
+        with patch('src.services.polymarket_service.HttpClient.post') as mock_post:
             mock_response = Mock()
             mock_response.json.return_value = self.sample_success_response
             mock_response.raise_for_status.return_value = None
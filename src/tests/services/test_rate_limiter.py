@@ -0,0 +1,55 @@
+import pytest
+import threading
+from services.rate_limiter import TokenBucket
+
+
+class _Clock:
+    """Time that only moves when the bucket sleeps or the test advances it"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+
+class TestTokenBucket:
+    @pytest.fixture
+    def clock(self):
+        return _Clock()
+
+    def test_burst_then_rate(self, clock):
+        bucket = TokenBucket(rate=10, capacity=3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3:] == [pytest.approx(0.1), pytest.approx(0.1)]
+        assert clock.now == pytest.approx(0.2)
+
+    def test_refills_up_to_capacity(self, clock):
+        bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire(2)
+
+        clock.now += 10
+
+        assert [bucket.acquire() for _ in range(3)] == [0, 0, pytest.approx(0.1)]
+
+    def test_waiters_reserve_in_turn(self, clock):
+        bucket = TokenBucket(rate=10, capacity=1, clock=clock, sleep=lambda seconds: None)
+        bucket.acquire()
+
+        # Neither waiter has slept yet, so the second waits behind the first
+        assert bucket.acquire() == pytest.approx(0.1)
+        assert bucket.acquire() == pytest.approx(0.2)
+
+    def test_invalid(self, clock):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, capacity=2).acquire(3)
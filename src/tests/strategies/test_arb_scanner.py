@@ -0,0 +1,93 @@
+import math
+import warnings
+import pytest
+
+from src.strategies.arb_scanner import ArbScanner
+from src.models import SyntheticOrderBook, SyntheticOrder, OrderBookStore, OrderSide
+
+
+def _store(market_slug, market_id, asks_a, asks_b):
+    books = [
+        SyntheticOrderBook(market_slug, market_id, "YES", f"{market_slug}-yes", 1000),
+        SyntheticOrderBook(market_slug, market_id, "NO", f"{market_slug}-no", 1000)
+    ]
+    for book, asks in zip(books, [asks_a, asks_b]):
+        book.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in asks])
+    return OrderBookStore(market_slug, market_id, books)
+
+
+class TestArbScanner:
+
+    def test_scan_ranks_by_expected_profit(self):
+        scanner = ArbScanner()
+        scanner.register(_store("market-1", 1, [(0.45, 100)], [(0.50, 10)]))
+        scanner.register(_store("market-2", 2, [(0.40, 100), (0.30, 5)], [(0.50, 200)]))
+        scanner.register(_store("market-3", 3, [(0.60, 100)], [(0.50, 200)]))
+
+        opportunities = scanner.scan()
+
+        assert [o.market_slug for o in opportunities] == ["market-2", "market-1"]
+
+        best = opportunities[0]
+        assert best.market_id == 2
+        assert best.asset_ids == ("market-2-yes", "market-2-no")
+        assert best.prices == (0.30, 0.50)
+        assert best.edge == pytest.approx(0.20)
+        assert best.size == 5
+        assert best.expected_profit == pytest.approx(1.0)
+
+        assert opportunities[1].expected_profit == pytest.approx(0.05 * 10)
+
+    def test_min_edge_filters(self):
+        scanner = ArbScanner()
+        scanner.register(_store("market-1", 1, [(0.45, 100)], [(0.50, 40)]))
+
+        assert scanner.scan(min_edge=0.06) == []
+        assert len(scanner.scan(min_edge=0.04)) == 1
+
+    def test_empty_book_excluded(self):
+        scanner = ArbScanner()
+        scanner.register(_store("market-1", 1, [], [(0.50, 40)]))
+
+        assert scanner.scan() == []
+        assert math.isinf(scanner.prices[0, 0])
+
+    def test_empty_books_scan_without_warnings(self):
+        scanner = ArbScanner()
+        scanner.register(_store("market-1", 1, [], []))
+        scanner.register(_store("market-2", 2, [], [(0.50, 40)]))
+        scanner.register(_store("market-3", 3, [(0.45, 100)], [(0.50, 40)]))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            opportunities = scanner.scan()
+
+        assert [o.market_slug for o in opportunities] == ["market-3"]
+
+    def test_update_book_reflects_new_top(self):
+        scanner = ArbScanner()
+        store = _store("market-1", 1, [(0.55, 100)], [(0.50, 40)])
+        scanner.register(store)
+        assert scanner.scan() == []
+
+        book = store.lookup("market-1-yes")
+        book.add_entries([SyntheticOrder(side=OrderSide.SELL, price=0.40, size=10)])
+        scanner.update_book(book)
+
+        opportunities = scanner.scan()
+        assert len(opportunities) == 1
+        assert opportunities[0].size == 10
+
+    def test_grows_past_capacity(self):
+        scanner = ArbScanner(capacity=2)
+        for i in range(5):
+            scanner.register(_store(f"market-{i}", i, [(0.40, 10 + i)], [(0.50, 100)]))
+
+        assert len(scanner) == 5
+        assert [o.market_id for o in scanner.scan()] == [4, 3, 2, 1, 0]
+
+    def test_register_rejects_wrong_outcome_count(self):
+        scanner = ArbScanner(num_outcomes=3)
+
+        with pytest.raises(ValueError):
+            scanner.register(_store("market-1", 1, [], []))
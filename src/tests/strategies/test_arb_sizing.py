@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import patch
+
+from src.strategies.arb_sizing import ArbSizer
+from src.models import SyntheticOrderBook, SyntheticOrder, OrderSide, OrderType
+
+
+class TestArbSizer:
+
+    @pytest.fixture
+    def books(self):
+        book_a = SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 1000)
+        book_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        return book_a, book_b
+
+    def _fill(self, book, levels):
+        book.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in levels])
+
+    def test_no_arbitrage(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.60, 100)])
+        self._fill(book_b, [(0.45, 100)])
+
+        assert ArbSizer().size(book_a, book_b) is None
+        assert ArbSizer()(book_a, book_b) == []
+
+    def test_empty_book(self, books):
+        book_a, book_b = books
+        self._fill(book_b, [(0.45, 100)])
+
+        assert ArbSizer().size(book_a, book_b) is None
+
+    def test_walks_depth_to_profit_maximizing_size(self, books):
+        """Ladders from POLYMARKET_ARB_STRATEGY.md"""
+        book_a, book_b = books
+        self._fill(book_a, [(0.47, 25), (0.53, 60), (0.54, 10)])
+        self._fill(book_b, [(0.48, 10), (0.49, 60), (0.54, 10)])
+
+        sized = ArbSizer().size(book_a, book_b)
+
+        # Shares 26+ pair 0.53 with 0.49, which no longer sums below $1
+        assert sized.size == 25
+        assert sized.price_a == 0.47
+        assert sized.price_b == 0.49
+        assert sized.cost == pytest.approx(25 * 0.47 + 10 * 0.48 + 15 * 0.49)
+        assert sized.profit == pytest.approx(25 - sized.cost)
+
+    def test_emits_one_order_per_outcome(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.47, 25), (0.53, 60), (0.54, 10)])
+        self._fill(book_b, [(0.48, 10), (0.49, 60), (0.54, 10)])
+
+        with patch('src.strategies.arb_sizing.get_clock') as mock_get_clock:
+            mock_get_clock.return_value.timestamp.return_value = 1234567
+            orders = ArbSizer()(book_a, book_b)
+
+        assert [(order.asset_id, order.price, order.size) for order in orders] == [
+            ("asset-yes", 0.47, 25), ("asset-no", 0.49, 25)
+        ]
+        assert all(order.order_type == OrderType.FOK for order in orders)
+        assert all(order.side == OrderSide.BUY for order in orders)
+        assert all(order.timestamp == 1234567 for order in orders)
+
+    def test_fees_shrink_size(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.40, 10), (0.47, 100)])
+        self._fill(book_b, [(0.50, 100)])
+
+        # 0.47 + 0.50 = 0.97 is profitable without fees but not at 5%
+        assert ArbSizer().size(book_a, book_b).size == 100
+        assert ArbSizer(fee_rate=0.05).size(book_a, book_b).size == 10
+
+    def test_slippage_buffer_removes_thin_edge(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.49, 100)])
+        self._fill(book_b, [(0.50, 100)])
+
+        assert ArbSizer().size(book_a, book_b).size == 100
+        assert ArbSizer(slippage=0.005).size(book_a, book_b) is None
+
+    def test_max_size_and_size_fraction(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.40, 100)])
+        self._fill(book_b, [(0.50, 100)])
+
+        assert ArbSizer(max_size=30).size(book_a, book_b).size == 30
+        assert ArbSizer(size_fraction=0.5).size(book_a, book_b).size == 50
+
+    def test_min_profit(self, books):
+        book_a, book_b = books
+        self._fill(book_a, [(0.45, 10)])
+        self._fill(book_b, [(0.50, 10)])
+
+        assert ArbSizer(min_profit=0.4).size(book_a, book_b).profit == pytest.approx(0.5)
+        assert ArbSizer(min_profit=0.6).size(book_a, book_b) is None
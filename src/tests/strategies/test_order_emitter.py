@@ -0,0 +1,84 @@
+import pytest
+
+from src.strategies.order_emitter import OrderEmitter, IntentStatus
+from src.models import Order, OrderType, OrderSide
+
+
+def _order(asset_id, price, size, timestamp=1000, market_slug="test-market"):
+    return Order(
+        market_slug=market_slug,
+        market_id=123,
+        asset_id=asset_id,
+        outcome_name=asset_id,
+        side=OrderSide.BUY,
+        order_type=OrderType.FOK,
+        price=price,
+        size=size,
+        timestamp=timestamp
+    )
+
+
+class TestOrderEmitter:
+
+    @pytest.fixture
+    def emitter(self):
+        return OrderEmitter()
+
+    def _summary(self, intents):
+        return [(intent.status, intent.order.asset_id, intent.order.price, intent.order.size) for intent in intents]
+
+    def test_new_intents(self, emitter):
+        intents = emitter.update("test-market", [_order("yes", 0.45, 50), _order("no", 0.50, 50)])
+
+        assert self._summary(intents) == [
+            (IntentStatus.NEW, "yes", 0.45, 50),
+            (IntentStatus.NEW, "no", 0.50, 50)
+        ]
+        assert len(emitter.outstanding("test-market")) == 2
+
+    def test_repeated_signal_is_suppressed(self, emitter):
+        emitter.update("test-market", [_order("yes", 0.45, 50, timestamp=1000)])
+
+        intents = emitter.update("test-market", [_order("yes", 0.45, 50, timestamp=2000)])
+
+        assert intents == []
+        assert emitter.outstanding("test-market")[0].timestamp == 1000
+
+    def test_changed_and_cancelled(self, emitter):
+        emitter.update("test-market", [_order("yes", 0.45, 50), _order("no", 0.50, 50), _order("no", 0.51, 10)])
+
+        intents = emitter.update("test-market", [_order("yes", 0.45, 30), _order("no", 0.50, 50)])
+
+        assert self._summary(intents) == [
+            (IntentStatus.CHANGED, "yes", 0.45, 30),
+            (IntentStatus.CANCELLED, "no", 0.51, 10)
+        ]
+        assert sorted(order.size for order in emitter.outstanding("test-market")) == [30, 50]
+
+    def test_duplicate_keys_are_merged(self, emitter):
+        intents = emitter.update("test-market", [_order("yes", 0.47, 5), _order("yes", 0.47, 8)])
+
+        assert self._summary(intents) == [(IntentStatus.NEW, "yes", 0.47, 13)]
+
+    def test_markets_are_independent(self, emitter):
+        emitter.update("market-1", [_order("yes", 0.45, 50, market_slug="market-1")])
+        intents = emitter.update("market-2", [])
+
+        assert intents == []
+        assert len(emitter.outstanding()) == 1
+        assert emitter.outstanding("market-2") == []
+
+    def test_strategies_are_independent(self, emitter):
+        emitter.update("test-market", [_order("yes", 0.45, 50)], "arb")
+        intents = emitter.update("test-market", [], "other")
+
+        assert intents == []
+        assert len(emitter.outstanding("test-market")) == 1
+
+    def test_cancel(self, emitter):
+        emitter.update("test-market", [_order("yes", 0.45, 50)])
+
+        intents = emitter.cancel("test-market")
+
+        assert self._summary(intents) == [(IntentStatus.CANCELLED, "yes", 0.45, 50)]
+        assert emitter.outstanding() == []
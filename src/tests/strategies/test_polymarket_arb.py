@@ -0,0 +1,241 @@
+import pytest
+from unittest.mock import patch
+
+from src.strategies.polymarket_arb import calculate_orders, likely_orders, _match_orders, OrderBuilder, ArbParameters
+from src.models import SyntheticOrderBook, SyntheticOrder, OrderType, OrderSide
+
+
+def _asks(levels):
+    return [SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in levels]
+
+
+class TestMatchOrders:
+
+    @pytest.fixture
+    def builder_a(self):
+        return OrderBuilder("test-market", 123, "YES", "asset-yes")
+
+    @pytest.fixture
+    def builder_b(self):
+        return OrderBuilder("test-market", 123, "NO", "asset-no")
+
+    def _pairs(self, orders):
+        return [(order.asset_id, order.price, order.size) for order in orders]
+
+    def test_no_arbitrage(self, builder_a, builder_b):
+        orders, _, _ = _match_orders(_asks([(0.60, 100)]), builder_a, _asks([(0.45, 100)]), builder_b, 1000)
+        assert orders == []
+
+    def test_empty_ladders(self, builder_a, builder_b):
+        assert _match_orders([], builder_a, _asks([(0.45, 100)]), builder_b, 1000) == ([], 1, 0)
+        assert _match_orders(_asks([(0.45, 100)]), builder_a, [], builder_b, 1000) == ([], 0, 1)
+
+    def test_equal_sizes(self, builder_a, builder_b):
+        orders, _, _ = _match_orders(_asks([(0.45, 100)]), builder_a, _asks([(0.50, 100)]), builder_b, 1000)
+        assert self._pairs(orders) == [("asset-yes", 0.45, 50), ("asset-no", 0.50, 50)]
+        assert all(order.timestamp == 1000 for order in orders)
+        assert all(order.order_type == OrderType.FOK for order in orders)
+        assert all(order.side == OrderSide.BUY for order in orders)
+
+    def test_strategy_doc_example(self, builder_a, builder_b):
+        """Ladders from POLYMARKET_ARB_STRATEGY.md"""
+        orders_a = _asks([(0.47, 25), (0.53, 60), (0.54, 10)])
+        orders_b = _asks([(0.48, 10), (0.49, 60), (0.54, 10)])
+
+        orders, _, _ = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert self._pairs(orders) == [
+            ("asset-yes", 0.47, 5), ("asset-no", 0.48, 5),
+            ("asset-yes", 0.47, 8), ("asset-no", 0.49, 8),
+        ]
+
+    def test_remainder_carries_to_next_level(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 10), (0.45, 30)])
+        orders_b = _asks([(0.50, 30)])
+
+        orders, _, _ = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert self._pairs(orders) == [
+            ("asset-yes", 0.40, 5), ("asset-no", 0.50, 5),
+            ("asset-yes", 0.45, 10), ("asset-no", 0.50, 10),
+        ]
+
+    def test_does_not_mutate_inputs(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 10), (0.45, 30)])
+        orders_b = _asks([(0.50, 30)])
+
+        _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert orders_b[0].size == 30
+        assert len(orders_a) == 2
+
+    def test_sub_unit_levels_terminate(self, builder_a, builder_b):
+        """Levels whose half size rounds below 1 used to recurse forever"""
+        orders_a = _asks([(0.40, 0.5)])
+        orders_b = _asks([(0.40, 0.6), (0.50, 10)])
+
+        assert _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)[0] == []
+
+    def test_sub_unit_level_is_skipped(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 1), (0.45, 20)])
+        orders_b = _asks([(0.50, 40)])
+
+        orders, _, _ = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert self._pairs(orders) == [("asset-yes", 0.45, 10), ("asset-no", 0.50, 10)]
+
+    def test_reports_examined_depth(self, builder_a, builder_b):
+        orders_a = _asks([(0.47, 25), (0.53, 60), (0.54, 10)])
+        orders_b = _asks([(0.48, 10), (0.49, 60), (0.54, 10)])
+
+        _, depth_a, depth_b = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert (depth_a, depth_b) == (2, 2)
+
+    def test_reports_exhausted_side(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 10)])
+        orders_b = _asks([(0.50, 30), (0.55, 10)])
+
+        _, depth_a, depth_b = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert (depth_a, depth_b) == (2, 1)
+
+    def test_min_edge(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 10), (0.45, 30)])
+        orders_b = _asks([(0.50, 30)])
+
+        orders, _, _ = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000, ArbParameters(min_edge=0.08))
+
+        assert self._pairs(orders) == [("asset-yes", 0.40, 5), ("asset-no", 0.50, 5)]
+
+    def test_size_fraction(self, builder_a, builder_b):
+        orders, _, _ = _match_orders(_asks([(0.45, 100)]), builder_a, _asks([(0.50, 100)]), builder_b, 1000,
+                                     ArbParameters(size_fraction=1.0))
+
+        assert self._pairs(orders) == [("asset-yes", 0.45, 100), ("asset-no", 0.50, 100)]
+
+    def test_max_depth(self, builder_a, builder_b):
+        orders_a = _asks([(0.40, 10), (0.45, 30)])
+        orders_b = _asks([(0.50, 30)])
+
+        orders, depth_a, depth_b = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000, ArbParameters(max_depth=1))
+
+        assert self._pairs(orders) == [("asset-yes", 0.40, 5), ("asset-no", 0.50, 5)]
+        # Levels past max_depth are never examined
+        assert (depth_a, depth_b) == (1, 1)
+
+    def test_deep_books(self, builder_a, builder_b):
+        depth = 5000
+        orders_a = _asks([(0.30 + i * 1e-5, 10) for i in range(depth)])
+        orders_b = _asks([(0.40 + i * 1e-5, 10) for i in range(depth)])
+
+        orders, _, _ = _match_orders(orders_a, builder_a, orders_b, builder_b, 1000)
+
+        assert len(orders) == 2 * depth
+
+
+class TestCalculateOrders:
+
+    @pytest.fixture
+    def books(self):
+        book_a = SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 1000)
+        book_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        return book_a, book_b
+
+    @patch('src.strategies.polymarket_arb.get_clock')
+    def test_sorts_books_by_price(self, mock_get_clock, books):
+        mock_get_clock.return_value.timestamp.return_value = 1234567
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.53, 60), (0.47, 25), (0.54, 10)]))
+        book_b.replace_entries(_asks([(0.54, 10), (0.49, 60), (0.48, 10)]))
+
+        orders = calculate_orders(book_a, book_b)
+
+        assert [(order.outcome_name, order.price, order.size) for order in orders] == [
+            ("YES", 0.47, 5), ("NO", 0.48, 5),
+            ("YES", 0.47, 8), ("NO", 0.49, 8),
+        ]
+        assert all(order.timestamp == 1234567 for order in orders)
+        assert all(order.market_slug == "test-market" for order in orders)
+
+    def test_empty_books(self, books):
+        assert calculate_orders(*books) == []
+
+    @patch('src.strategies.polymarket_arb._match_orders', wraps=_match_orders)
+    def test_skips_evaluation_when_examined_levels_unchanged(self, mock_match, books):
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.45, 100), (0.60, 10)]))
+        book_b.replace_entries(_asks([(0.50, 100), (0.70, 10)]))
+
+        first = calculate_orders(book_a, book_b)
+        # Only touches levels past where the matcher stopped
+        book_a.add_entries(_asks([(0.90, 50)]))
+        book_b.add_entries(_asks([(0.80, 25)]))
+        second = calculate_orders(book_a, book_b)
+
+        assert mock_match.call_count == 1
+        assert second == first
+        assert second is not first
+
+    @patch('src.strategies.polymarket_arb._match_orders', wraps=_match_orders)
+    def test_reevaluates_when_examined_level_changes(self, mock_match, books):
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.45, 100), (0.60, 10)]))
+        book_b.replace_entries(_asks([(0.50, 100), (0.70, 10)]))
+
+        calculate_orders(book_a, book_b)
+        book_b.add_entries(_asks([(0.50, 40)]))
+        orders = calculate_orders(book_a, book_b)
+
+        assert mock_match.call_count == 2
+        assert [order.size for order in orders] == [20, 20]
+
+    @patch('src.strategies.polymarket_arb._match_orders', wraps=_match_orders)
+    def test_reevaluates_when_exhausted_side_grows(self, mock_match, books):
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.45, 10)]))
+        book_b.replace_entries(_asks([(0.50, 100)]))
+
+        calculate_orders(book_a, book_b)
+        book_a.add_entries(_asks([(0.46, 10)]))
+        orders = calculate_orders(book_a, book_b)
+
+        assert mock_match.call_count == 2
+        assert len(orders) == 4
+
+    @patch('src.strategies.polymarket_arb._match_orders', wraps=_match_orders)
+    def test_cache_is_per_book_pair(self, mock_match, books):
+        book_a, book_b = books
+        other_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        book_a.replace_entries(_asks([(0.45, 100)]))
+        book_b.replace_entries(_asks([(0.50, 100)]))
+
+        calculate_orders(book_a, book_b)
+        orders = calculate_orders(book_a, other_b)
+
+        assert mock_match.call_count == 2
+        assert orders == []
+
+    @patch('src.strategies.polymarket_arb._match_orders', wraps=_match_orders)
+    def test_cache_is_per_parameters(self, mock_match, books):
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.45, 100)]))
+        book_b.replace_entries(_asks([(0.50, 100)]))
+
+        half = calculate_orders(book_a, book_b)
+        full = calculate_orders(book_a, book_b, ArbParameters(size_fraction=1.0))
+        calculate_orders(book_a, book_b)
+
+        assert mock_match.call_count == 2
+        assert [order.size for order in half] == [50, 50]
+        assert [order.size for order in full] == [100, 100]
+
+    def test_likely_orders(self, books):
+        book_a, book_b = books
+        book_a.replace_entries(_asks([(0.53, 60), (0.55, 100)]))
+        book_b.replace_entries(_asks([(0.49, 40), (0.50, 100)]))
+
+        assert calculate_orders(book_a, book_b) == []
+        assert [(order.outcome_name, order.price, order.size) for order in likely_orders(book_a, book_b)] == [
+            ("YES", 0.53, 20), ("NO", 0.49, 20),
+        ]
@@ -0,0 +1,139 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from src.strategies.strategy_runner import StrategyRunner, ExecutionMode
+from src.models import SyntheticOrderBook, SyntheticOrder, OrderSide, Order
+
+
+class TestStrategyRunner:
+
+    @pytest.fixture
+    def books(self):
+        book_a = SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 1000)
+        book_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        book_a.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=0.45, size=100)])
+        book_b.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=0.50, size=100)])
+        return book_a, book_b
+
+    @pytest.fixture
+    def runner(self):
+        runner = StrategyRunner()
+        yield runner
+        runner.shutdown()
+
+    def test_inline_strategies_return_orders_in_order(self, runner, books):
+        order_1, order_2 = Mock(spec=Order), Mock(spec=Order)
+        runner.register("first", lambda a, b: [order_1], latency_budget_ms=100)
+        runner.register("second", lambda a, b: [order_2], latency_budget_ms=100)
+
+        assert runner.on_book_update(*books) == [order_1, order_2]
+        assert runner.stats()["first"].calls == 1
+        assert runner.stats()["second"].calls == 1
+
+    def test_register_duplicate_name(self, runner):
+        runner.register("arb", lambda a, b: [], latency_budget_ms=1)
+
+        with pytest.raises(ValueError):
+            runner.register("arb", lambda a, b: [], latency_budget_ms=1)
+
+    def test_failing_strategy_does_not_stop_others(self, runner, books):
+        order = Mock(spec=Order)
+
+        def broken(book_a, book_b):
+            raise Exception("Strategy error")
+
+        runner.register("broken", broken, latency_budget_ms=100)
+        runner.register("arb", lambda a, b: [order], latency_budget_ms=100)
+
+        assert runner.on_book_update(*books) == [order]
+        assert runner.stats()["broken"].errors == 1
+
+    def test_overruns_are_counted(self, runner, books):
+        def slow(book_a, book_b):
+            time.sleep(0.005)
+            return []
+
+        runner.demote_after = None
+        runner.register("slow", slow, latency_budget_ms=1)
+
+        runner.on_book_update(*books)
+        runner.on_book_update(*books)
+
+        stats = runner.stats()["slow"]
+        assert stats.calls == 2
+        assert stats.overruns == 2
+        assert stats.max_seconds >= 0.005
+        assert stats.mean_seconds > 0
+
+    def test_slow_inline_strategy_is_demoted(self, books):
+        runner = StrategyRunner(demote_after=2)
+
+        def slow(book_a, book_b):
+            time.sleep(0.005)
+            return []
+
+        runner.register("slow", slow, latency_budget_ms=1)
+        runner.on_book_update(*books)
+        runner.on_book_update(*books)
+        runner.shutdown()
+
+        assert runner.strategies["slow"].mode == ExecutionMode.WORKER
+
+    def test_worker_does_not_delay_inline(self, books):
+        received = []
+        done = threading.Event()
+        release = threading.Event()
+
+        def on_orders(name, orders):
+            received.append((name, orders))
+            done.set()
+
+        def slow(book_a, book_b):
+            release.wait(1)
+            return [Mock(spec=Order)]
+
+        fast_order = Mock(spec=Order)
+        runner = StrategyRunner(on_orders=on_orders)
+        runner.register("slow", slow, latency_budget_ms=1000, mode=ExecutionMode.WORKER)
+        runner.register("fast", lambda a, b: [fast_order], latency_budget_ms=50)
+
+        start = time.perf_counter()
+        orders = runner.on_book_update(*books)
+        elapsed = time.perf_counter() - start
+
+        assert orders == [fast_order]
+        assert elapsed < 0.5
+        assert received == []
+
+        release.set()
+        assert done.wait(1)
+        runner.shutdown()
+        assert received[0][0] == "slow"
+
+    def test_worker_runs_on_snapshot_and_coalesces(self, books):
+        seen = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def worker(book_a, book_b):
+            seen.append(book_a.top_orders(1)[0].price)
+            started.set()
+            release.wait(1)
+            return []
+
+        runner = StrategyRunner()
+        runner.register("worker", worker, latency_budget_ms=1000, mode=ExecutionMode.WORKER)
+        book_a, book_b = books
+
+        runner.on_book_update(book_a, book_b)
+        assert started.wait(1)
+        for price in [0.44, 0.43, 0.42]:
+            book_a.add_entries([SyntheticOrder(side=OrderSide.SELL, price=price, size=10)])
+            runner.on_book_update(book_a, book_b)
+        release.set()
+        runner.shutdown()
+
+        assert seen == [0.45, 0.42]
+        assert runner.stats()["worker"].coalesced == 2
@@ -0,0 +1,90 @@
+import pytest
+import os
+import tempfile
+import shutil
+from src.backtest import backtest_file, run_backtest, order_pnl, BacktestReport, BacktestResult
+from src.models import Order, OrderSide, OrderType
+from src.replay import find_event_files
+from src.tests.test_replay import _write_events
+
+
+def _order(asset_id, price, size):
+    return Order('market-a', 1, asset_id, asset_id, OrderSide.BUY, OrderType.GTC, price, size, 0)
+
+
+class TestBacktest:
+    @pytest.fixture
+    def data_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        data_dir = os.path.join(temp_dir, 'data')
+        os.makedirs(data_dir)
+
+        # One arb at 0.45 + 0.50, gone at 0.55, back at 0.45 + 0.50
+        _write_events(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'), 'market-a', 1, [
+            ('a-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+            ('a-no', 'No', 'book', 0.50, 'ask', 1000),
+            ('a-yes', 'Yes', 'price_change', 0.46, 'SELL', 2000),
+            ('a-no', 'No', 'book', 0.55, 'ask', 3000),
+            ('a-no', 'No', 'book', 0.50, 'ask', 4000),
+        ])
+        _write_events(os.path.join(data_dir, '20250701_market-b_polymarket-market-events.csv'), 'market-b', 2, [
+            ('b-yes', 'Yes', 'book', 0.60, 'ask', 1000),
+            ('b-no', 'No', 'book', 0.60, 'ask', 1000),
+        ])
+        _write_events(os.path.join(data_dir, '20250701_market-c_polymarket-market-events.csv'), 'market-c', '', [
+            ('c-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+        ])
+
+        yield data_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_order_pnl(self):
+        orders = [_order('yes', 0.45, 10), _order('no', 0.50, 10), _order('yes', 0.46, 4), _order('no', 0.50, 4)]
+
+        assert order_pnl(orders) == pytest.approx(10 * 0.05 + 4 * 0.04)
+
+    def test_backtest_file(self, data_dir):
+        result = backtest_file(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'))
+
+        assert result.skipped is None
+        assert result.message_groups == 4
+        assert result.events == 5
+        # The unchanged arb after the 0.46 price change is not counted again
+        assert result.opportunities == 2
+        assert result.orders == 4
+        assert result.pnl == pytest.approx(2 * 50 * 0.05)
+
+    def test_backtest_file_simulates_fills(self, data_dir):
+        result = backtest_file(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'), latency_ms=0)
+
+        assert result.fills.orders == 4
+        # Both opportunities fill against fresh books
+        assert result.fills.filled == 4
+        assert result.fills.theoretical_edge == pytest.approx(result.pnl)
+        assert result.fills.realized_edge == pytest.approx(result.pnl)
+
+    def test_backtest_file_skips_markets_without_market_id(self, data_dir):
+        result = backtest_file(os.path.join(data_dir, '20250701_market-c_polymarket-market-events.csv'))
+
+        assert result.skipped == "no market ID"
+
+    def test_run_backtest(self, data_dir):
+        report = run_backtest(find_event_files('20250701', data_dir), max_workers=2)
+
+        assert [result.market_slug for result in report.results] == ['market-a', 'market-b', 'market-c']
+        assert report.opportunities == 2
+        assert report.pnl == pytest.approx(5.0)
+        assert sum(stats.files for stats in report.workers.values()) == 2
+        assert report.asdict()['results'][1]['opportunities'] == 0
+
+    def test_report_aggregates_by_worker(self):
+        report = BacktestReport([
+            BacktestResult('a.csv', 'a', worker=1, events=100, seconds=1.0),
+            BacktestResult('b.csv', 'b', worker=1, events=300, seconds=1.0),
+            BacktestResult('c.csv', 'c', worker=2, events=50, seconds=0.5),
+            BacktestResult('d.csv', 'd', worker=2, skipped="no market ID"),
+        ], seconds=2.0)
+
+        assert report.workers[1].events_per_second == 200
+        assert report.workers[2].files == 1
+        assert report.events == 450
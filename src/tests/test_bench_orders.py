@@ -0,0 +1,35 @@
+import pytest
+from src.benchmarks.bench_orders import SCENARIOS, bench_scenario, make_orders
+from src.mock_clob import MockClobSettings
+
+
+class TestBenchOrders:
+    def test_orders_are_distinct(self):
+        orders = make_orders(400)
+
+        assert len({(order.asset_id, order.price, order.size) for order in orders}) == 400
+
+    @pytest.mark.parametrize('scenario', list(SCENARIOS))
+    def test_scenario(self, scenario):
+        result = bench_scenario(scenario, MockClobSettings(seed=0), orders=12, concurrency=2, rate_limit=1000, burst=10)
+
+        assert (result.scenario, result.orders, result.failed_requests, result.accepted) == (scenario, 12, 0, 12)
+        assert result.requests == 3
+        assert result.orders_per_second > 0
+        assert result.p50_ms <= result.p99_ms
+
+    @pytest.mark.parametrize('scenario', list(SCENARIOS))
+    def test_batch_size(self, scenario):
+        result = bench_scenario(scenario, MockClobSettings(seed=0, max_batch_orders=6), orders=12, concurrency=2, rate_limit=1000, burst=10, batch_size=6)
+
+        assert (result.requests, result.failed_requests, result.accepted) == (2, 0, 12)
+
+    def test_batches_over_the_exchange_limit_fail(self):
+        result = bench_scenario('place_orders', MockClobSettings(max_batch_orders=5), orders=12, batch_size=6)
+
+        assert (result.failed_requests, result.accepted) == (2, 0)
+
+    def test_failures_are_counted(self):
+        result = bench_scenario('place_orders', MockClobSettings(error_rate=1.0), orders=10)
+
+        assert (result.failed_requests, result.accepted) == (2, 0)
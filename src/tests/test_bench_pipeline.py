@@ -0,0 +1,70 @@
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+from src.benchmarks.bench_pipeline import STAGES, StageResult, load_markets, bench_stage, compare, _prepare_pipeline
+from src.daos import OrderBookDeltaEncoder
+from src.strategies import OrderEmitter, StrategyRunner
+from src.replay import find_event_files
+from src.tests.test_replay import _write_events
+
+
+class TestBenchPipeline:
+    @pytest.fixture
+    def markets(self):
+        temp_dir = tempfile.mkdtemp()
+        _write_events(os.path.join(temp_dir, '20250701_market-a_polymarket-market-events.csv'), 'market-a', 1, [
+            ('a-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+            ('a-no', 'No', 'book', 0.50, 'ask', 1000),
+            ('a-yes', 'Yes', 'price_change', 0.46, 'SELL', 2000),
+            ('a-no', 'No', 'price_change', 0.49, 'SELL', 3000),
+        ])
+        _write_events(os.path.join(temp_dir, '20250701_market-c_polymarket-market-events.csv'), 'market-c', '', [
+            ('c-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+        ])
+
+        yield load_markets(find_event_files('20250701', temp_dir))
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_load_markets(self, markets):
+        market, = markets
+
+        assert len(market.message_groups) == 3
+        assert market.message_groups[0][0]['asset_id'] == 'a-yes'
+
+    @pytest.mark.parametrize('stage', list(STAGES))
+    def test_bench_stage(self, markets, stage):
+        cwd = os.getcwd()
+
+        result = bench_stage(stage, markets)
+
+        assert result.items > 0
+        assert 0 < result.p50_us <= result.max_us
+        assert result.peak_memory_kb > 0
+        assert os.getcwd() == cwd
+
+    def test_pipeline_builds_handler_like_main(self, markets):
+        with patch('src.benchmarks.bench_pipeline.get_order_message_register') as mock_register:
+            _prepare_pipeline(markets)
+
+        kwargs = mock_register.call_args.kwargs
+        assert isinstance(kwargs['order_emitter'], OrderEmitter)
+        assert isinstance(kwargs['strategy_runner'], StrategyRunner)
+        assert isinstance(kwargs['book_encoder'], OrderBookDeltaEncoder)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'stages': {
+            'update_book': {'throughput': 1000.0, 'peak_memory_kb': 100.0},
+            'calculate_orders': {'throughput': 1000.0, 'peak_memory_kb': 100.0},
+        }}
+        results = [
+            StageResult('update_book', items=850, unit='events', seconds=1.0, p50_us=1, p90_us=1, p99_us=1, max_us=1, peak_memory_kb=110),
+            StageResult('calculate_orders', items=700, unit='updates', seconds=1.0, p50_us=1, p90_us=1, p99_us=1, max_us=1, peak_memory_kb=150),
+            StageResult('json_decode', items=1, unit='messages', seconds=1.0, p50_us=1, p90_us=1, p99_us=1, max_us=1),
+        ]
+
+        regressions = compare(results, baseline, threshold=0.2)
+
+        assert list(regressions) == ['calculate_orders']
+        assert len(regressions['calculate_orders']) == 2
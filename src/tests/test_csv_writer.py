@@ -0,0 +1,167 @@
+import pytest
+import os
+import csv
+import tempfile
+import shutil
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from daos.csv_writer import BufferedCSVWriter, set_csv_writer, get_csv_writer
+from daos.order_dao import write_orders, FIELD_NAMES
+from models import Order, OrderType, OrderSide
+
+
+class TestBufferedCSVWriter:
+    @pytest.fixture
+    def temp_data_dir(self):
+        """Create a temporary data directory for testing."""
+        original_dir = os.getcwd()
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+
+        yield os.path.join(temp_dir, 'data')
+
+        os.chdir(original_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def writer(self):
+        writer = BufferedCSVWriter(max_rows=1000, flush_interval=60)
+        set_csv_writer(writer)
+        yield writer
+        set_csv_writer(None)
+        writer.close()
+
+    @pytest.fixture
+    def mock_order(self):
+        order = Mock(spec=Order)
+        order.asdict.return_value = {
+            'market_slug': 'test-market',
+            'market_id': 12345,
+            'asset_id': '1',
+            'outcome_name': 'Team A',
+            'side': OrderSide.BUY,
+            'order_type': OrderType.GTC,
+            'price': 0.45,
+            'size': 100,
+            'timestamp': 1640995200
+        }
+        return order
+
+    def _read(self, csv_filename):
+        with open(csv_filename, 'r') as csvfile:
+            return list(csv.reader(csvfile))
+
+    def test_dao_writes_are_buffered_until_flush(self, temp_data_dir, writer, mock_order):
+        """Test that DAO writes go through the installed writer and only hit disk on flush."""
+        csv_filename = "data/20250701_test-market_orders.csv"
+
+        write_orders("test-market", [mock_order], datetime(2025, 7, 1), test_mode=False)
+        write_orders("test-market", [mock_order], datetime(2025, 7, 1), test_mode=False)
+        assert not os.path.exists(csv_filename)
+
+        writer.flush()
+
+        rows = self._read(csv_filename)
+        assert rows[0] == FIELD_NAMES
+        assert len(rows) == 3
+        assert rows[1][FIELD_NAMES.index('price')] == '0.45'
+
+    def test_file_handle_stays_open_across_flushes(self, temp_data_dir, writer, mock_order):
+        """Test that the header is written once and later flushes append."""
+        csv_filename = "data/20250701_test-market_orders.csv"
+
+        write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+        writer.flush()
+        write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+        writer.flush()
+
+        assert len(writer._files) == 1
+        rows = self._read(csv_filename)
+        assert rows.count(FIELD_NAMES) == 1
+        assert len(rows) == 3
+
+    def test_existing_file_is_appended_without_header(self, temp_data_dir, writer):
+        os.makedirs('data')
+        csv_filename = "data/existing.csv"
+        with open(csv_filename, 'w', newline='') as csvfile:
+            csv.writer(csvfile).writerows([['a', 'b'], ['1', '2']])
+
+        writer.write(csv_filename, ['a', 'b'], [{'a': 3, 'b': 4}])
+        writer.flush()
+
+        assert self._read(csv_filename) == [['a', 'b'], ['1', '2'], ['3', '4']]
+
+    def test_flushes_in_background_on_size(self, temp_data_dir):
+        writer = BufferedCSVWriter(max_rows=2, flush_interval=60)
+        csv_filename = "data/rows.csv"
+
+        writer.write(csv_filename, ['a'], [{'a': 1}, {'a': 2}])
+
+        deadline = time.time() + 2
+        while not os.path.exists(csv_filename) or len(self._read(csv_filename)) < 3:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        writer.close()
+
+    def test_flushes_in_background_on_interval(self, temp_data_dir):
+        writer = BufferedCSVWriter(max_rows=1000, flush_interval=0.05)
+        csv_filename = "data/rows.csv"
+
+        writer.write(csv_filename, ['a'], [{'a': 1}])
+
+        deadline = time.time() + 2
+        while not os.path.exists(csv_filename) or len(self._read(csv_filename)) < 2:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        writer.close()
+
+    def test_close_flushes_remaining_rows(self, temp_data_dir):
+        writer = BufferedCSVWriter(max_rows=1000, flush_interval=60)
+        csv_filename = "data/rows.csv"
+
+        writer.write(csv_filename, ['a', 'b'], [{'a': 1, 'b': 'x'}])
+        writer.close()
+
+        assert self._read(csv_filename) == [['a', 'b'], ['1', 'x']]
+        assert writer._files == {}
+        with pytest.raises(RuntimeError):
+            writer.write(csv_filename, ['a', 'b'], [{'a': 2, 'b': 'y'}])
+
+    def test_concurrent_flushes_write_in_order(self, temp_data_dir):
+        writing = threading.Event()
+        release = threading.Event()
+
+        class SlowWriter(BufferedCSVWriter):
+            def _write_rows(self, csv_filename, field_names, rows):
+                writing.set()
+                release.wait(2)
+                super()._write_rows(csv_filename, field_names, rows)
+
+        writer = SlowWriter(max_rows=1000, flush_interval=60)
+        csv_filename = "data/rows.csv"
+
+        writer.write(csv_filename, ['a'], [{'a': 1}])
+        first = threading.Thread(target=writer.flush)
+        first.start()
+        assert writing.wait(2)
+
+        # The second flush waits for the first before taking the buffer
+        writer.write(csv_filename, ['a'], [{'a': 2}])
+        second = threading.Thread(target=writer.flush)
+        second.start()
+        time.sleep(0.05)
+        assert writer._buffered == 1
+
+        release.set()
+        first.join()
+        second.join()
+        writer.close()
+
+        assert self._read(csv_filename) == [['a'], ['1'], ['2']]
+
+    def test_no_writer_installed_by_default(self):
+        assert get_csv_writer() is None
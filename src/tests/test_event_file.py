@@ -0,0 +1,156 @@
+import pytest
+import os
+import csv
+import tempfile
+import shutil
+import numpy as np
+from datetime import datetime
+from unittest.mock import Mock
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from daos.event_file import (
+    EventFile, EventFileWriter, set_event_file_writer, convert_csv_to_event_file,
+    event_file_path, assets_path, EVENT_DTYPE, HEADER_SIZE
+)
+from daos.market_dao import FIELD_NAMES
+from src.utils.csv_message_processor import CSVMessageProcessor
+
+ASSET_A = "10703298184509502202740464237528733764769030979577941510093170241051283757018"
+ASSET_B = "38398365123618423712063069683745003449993485938549622349203580016542091290432"
+
+
+def _row(asset_id, event_type, price, side, size, timestamp):
+    return {
+        'market_slug': 'test-market',
+        'market_id': 12345,
+        'asset_id': asset_id,
+        'outcome_name': 'Team A' if asset_id == ASSET_A else 'Team B',
+        'event_type': event_type,
+        'price': price,
+        'side': side,
+        'size': size,
+        'hash': 'abc',
+        'timestamp': timestamp
+    }
+
+
+ROWS = [
+    _row(ASSET_A, 'book', 0.45, 'ask', 100.0, 1000),
+    _row(ASSET_A, 'book', 0.44, 'bid', 50.0, 1000),
+    _row(ASSET_B, 'book', 0.56, 'ask', 80.0, 1000),
+    _row(ASSET_A, 'price_change', 0.46, 'SELL', 20.0, 1000),
+    _row(ASSET_A, 'price_change', 0.43, 'BUY', 10.0, 2000),
+    _row(ASSET_B, 'price_change', 0.57, 'BUY', 0.0, 2000),
+]
+
+
+class TestEventFile:
+    @pytest.fixture
+    def csv_filename(self):
+        temp_dir = tempfile.mkdtemp()
+        yield os.path.join(temp_dir, 'data', '20250701_test-market_polymarket-market-events.csv')
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _write(self, csv_filename, batches):
+        writer = EventFileWriter()
+        for batch in batches:
+            writer.write(csv_filename, batch)
+        writer.close()
+        return EventFile(event_file_path(csv_filename))
+
+    def test_writer_round_trip(self, csv_filename):
+        event_file = self._write(csv_filename, [ROWS[:3], ROWS[3:]])
+
+        assert os.path.getsize(event_file.path) == HEADER_SIZE + len(ROWS) * EVENT_DTYPE.itemsize
+        assert len(event_file) == len(ROWS)
+        assert event_file.asset_ids() == [ASSET_A, ASSET_B]
+        assert event_file.assets[1]['outcome_name'] == 'Team B'
+        assert event_file.timestamp.tolist() == [row['timestamp'] for row in ROWS]
+        assert event_file.price.tolist() == [row['price'] for row in ROWS]
+        assert event_file.asset.tolist() == [0, 0, 1, 0, 0, 1]
+        assert event_file.side.tolist() == [1, 0, 1, 1, 0, 0]
+
+    def test_writes_are_buffered_until_flush(self, csv_filename):
+        writer = EventFileWriter(flush_interval=60)
+        try:
+            writer.write(csv_filename, ROWS)
+            assert not os.path.exists(event_file_path(csv_filename))
+
+            writer.flush()
+            assert len(EventFile(event_file_path(csv_filename))) == len(ROWS)
+        finally:
+            writer.close()
+
+    def test_columns_are_views_onto_the_mapped_file(self, csv_filename):
+        event_file = self._write(csv_filename, [ROWS])
+
+        assert isinstance(event_file.records, np.memmap)
+        assert np.shares_memory(event_file.size, event_file.records)
+
+    def test_appends_across_writers(self, csv_filename):
+        self._write(csv_filename, [ROWS[:3]])
+        event_file = self._write(csv_filename, [ROWS[3:]])
+
+        assert len(event_file) == len(ROWS)
+        assert event_file.asset_ids() == [ASSET_A, ASSET_B]
+
+    def test_group_bounds(self, csv_filename):
+        event_file = self._write(csv_filename, [ROWS])
+
+        assert event_file.group_bounds().tolist() == [0, 3, 4, 6]
+
+    def test_messages_match_csv_replay(self, csv_filename):
+        event_file = self._write(csv_filename, [ROWS])
+
+        with open(csv_filename, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELD_NAMES)
+            writer.writeheader()
+            writer.writerows(ROWS)
+
+        processor = CSVMessageProcessor(csv_filename, [])
+        expected = [processor.reconstruct_websocket_messages(group) for group in processor.load_and_group_messages()]
+        for messages in expected:
+            for message in messages:
+                message['hash'] = ''
+
+        assert list(event_file.messages()) == expected
+
+    def test_convert_csv(self, csv_filename):
+        os.makedirs(os.path.dirname(csv_filename))
+        with open(csv_filename, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELD_NAMES)
+            writer.writeheader()
+            writer.writerows(ROWS)
+            writer.writerow(_row(ASSET_B, 'book', 0.55, 'bid', 5, 3000))
+
+        event_file = EventFile(convert_csv_to_event_file(csv_filename))
+
+        assert len(event_file) == len(ROWS) + 1
+        assert event_file.side.tolist()[-1] == 0
+        assert os.path.exists(assets_path(event_file.path))
+
+    def test_write_market_events_with_writer_installed(self, csv_filename, monkeypatch):
+        from daos import market_dao
+
+        monkeypatch.chdir(os.path.dirname(os.path.dirname(csv_filename)))
+        event = Mock()
+        event.asdict_rows.return_value = ROWS[:3]
+        writer = EventFileWriter()
+        set_event_file_writer(writer)
+        try:
+            market_dao.write_marketEvents('test-market', 12345, [event], datetime(2025, 7, 1, 12, 0, 0))
+        finally:
+            set_event_file_writer(None)
+            writer.close()
+
+        event_file = EventFile(event_file_path('data/20250701_test-market_polymarket-market-events.csv'))
+        assert event_file.asset_ids() == [ASSET_A, ASSET_B]
+        assert event_file.price.tolist() == [0.45, 0.44, 0.56]
+
+    def test_rejects_other_files(self, csv_filename):
+        os.makedirs(os.path.dirname(csv_filename))
+        with open(csv_filename, 'wb') as not_an_event_file:
+            not_an_event_file.write(b'timestamp,price\n1,2\n')
+
+        with pytest.raises(ValueError, match="Not an event file"):
+            EventFile(csv_filename)
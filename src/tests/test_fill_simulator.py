@@ -0,0 +1,95 @@
+import pytest
+from src.fill_simulator import FillSimulator
+from src.models import Order, OrderSide, OrderType, OrderBookStore, SyntheticOrderBook, SyntheticOrder
+
+
+def _order(asset_id, price, size, order_type=OrderType.FOK):
+    return Order('market-a', 1, asset_id, asset_id, OrderSide.BUY, order_type, price, size, 0)
+
+
+def _asks(*levels):
+    return [SyntheticOrder(OrderSide.SELL, price, size) for price, size in levels]
+
+
+class TestFillSimulator:
+    @pytest.fixture
+    def book_store(self):
+        book_yes = SyntheticOrderBook('market-a', 1, 'Yes', 'yes', 0)
+        book_no = SyntheticOrderBook('market-a', 1, 'No', 'no', 0)
+        book_yes.replace_entries(_asks((0.45, 10.0), (0.46, 20.0)))
+        book_no.replace_entries(_asks((0.50, 30.0)))
+        return OrderBookStore('market-a', 1, [book_yes, book_no])
+
+    def test_fills_at_arrival(self, book_store):
+        simulator = FillSimulator(book_store, latency_ms=100)
+        simulator.submit([_order('yes', 0.45, 10), _order('no', 0.50, 10)], 1000)
+
+        # Still in flight
+        simulator.advance(1100)
+        assert simulator.fills == []
+
+        # The arb is gone by the time the orders arrive
+        book_store.lookup('yes').replace_entries(_asks((0.48, 10.0)))
+        simulator.advance(1101)
+
+        assert [fill.arrival for fill in simulator.fills] == [1100, 1100]
+        assert [fill.size for fill in simulator.fills] == [0.0, 10.0]
+        assert simulator.stats.killed == 1
+        assert simulator.stats.theoretical_edge == pytest.approx(0.5)
+        # Only the NO leg filled: its cost is lost rather than hedged
+        assert simulator.stats.realized_edge == pytest.approx(-10 * 0.50)
+        assert simulator.stats.unhedged_size == 10.0
+        assert simulator.stats.unhedged_cost == pytest.approx(10 * 0.50)
+
+    def test_walks_the_book(self, book_store):
+        simulator = FillSimulator(book_store)
+        simulator.submit([_order('yes', 0.46, 15), _order('no', 0.50, 15)], 1000)
+        simulator.finish()
+
+        fill_yes, fill_no = simulator.fills
+        assert fill_yes.complete
+        assert fill_yes.price == pytest.approx((10 * 0.45 + 5 * 0.46) / 15)
+        assert simulator.stats.filled == 2
+        assert simulator.stats.realized_edge == pytest.approx(15 - fill_yes.cost - fill_no.cost)
+
+    def test_fills_consume_depth(self, book_store):
+        simulator = FillSimulator(book_store)
+        simulator.submit([_order('yes', 0.45, 8), _order('no', 0.50, 8)], 1000)
+        simulator.submit([_order('yes', 0.45, 8), _order('no', 0.50, 8)], 1000)
+        simulator.finish()
+
+        # Only 2 shares are left at 0.45 for the second pair
+        assert [fill.size for fill in simulator.fills] == [8.0, 8.0, 0.0, 8.0]
+        assert simulator.stats.killed == 1
+
+    def test_replaced_levels_are_refilled(self, book_store):
+        simulator = FillSimulator(book_store)
+        simulator.submit([_order('yes', 0.45, 8), _order('no', 0.50, 8)], 1000)
+        simulator.advance(2000)
+
+        book_store.lookup('yes').add_entries(_asks((0.45, 10.0)))
+        simulator.submit([_order('yes', 0.45, 8), _order('no', 0.50, 8)], 2000)
+        simulator.finish()
+
+        assert [fill.size for fill in simulator.fills] == [8.0, 8.0, 8.0, 8.0]
+
+    def test_non_fok_orders_fill_partially(self, book_store):
+        simulator = FillSimulator(book_store)
+        simulator.submit([_order('yes', 0.45, 15, OrderType.FAK), _order('no', 0.50, 15, OrderType.FAK)], 1000)
+        simulator.finish()
+
+        assert [fill.size for fill in simulator.fills] == [10.0, 15.0]
+        assert simulator.stats.partially_filled == 1
+        assert simulator.stats.realized_edge == pytest.approx(10 * 0.05 - 5 * 0.50)
+        assert simulator.stats.unhedged_size == 5.0
+        assert simulator.stats.unhedged_cost == pytest.approx(5 * 0.50)
+
+    def test_one_legged_fill_is_charged(self, book_store):
+        simulator = FillSimulator(book_store)
+        simulator.submit([_order('yes', 0.45, 10, OrderType.FAK), _order('no', 0.50, 10, OrderType.FAK)], 1000)
+        book_store.lookup('no').replace_entries([])
+        simulator.finish()
+
+        assert [fill.size for fill in simulator.fills] == [10.0, 0.0]
+        assert simulator.stats.realized_edge == pytest.approx(-10 * 0.45)
+        assert (simulator.stats.unhedged_size, simulator.stats.unhedged_cost) == (10.0, pytest.approx(4.5))
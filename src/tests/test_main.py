@@ -1,10 +1,12 @@
 import pytest
+import time
 from unittest.mock import Mock, patch
-from src.main import get_order_message_register, OrdersStore, OrderBookStore
+from src.main import parse_market_events, get_order_message_register, build_strategy_runner, build_order_executor, build_orders_store, OrdersStore, OrderBookStore
+from src.strategies import OrderEmitter, StrategyRunner, ExecutionMode, IntentStatus
 from src.models import SyntheticOrderBook, Order
 from src.models.market_event import MarketEvent, BookEvent, PriceChangeEvent, EventType
 from src.models.synthetic_orderbook import SyntheticOrder
-from src.models.order import OrderSide
+from src.models.order import OrderSide, OrderType
 
 
 class TestGetOrderMessageRegister:
@@ -51,10 +53,10 @@ class TestGetOrderMessageRegister:
     @patch('src.main.write_orderBookStore')
     @patch('src.main.write_orders')
     @patch('src.main.calculate_orders')
-    @patch('src.main.datetime')
+    @patch('src.main.get_clock')
     def test_handler_successful_execution(
         self,
-        mock_datetime,
+        mock_get_clock,
         mock_calculate_orders,
         mock_write_orders,
         mock_write_orderBookStore,
@@ -66,7 +68,7 @@ class TestGetOrderMessageRegister:
         """Test successful execution of the handler."""
         # Setup mocks
         mock_now = Mock()
-        mock_datetime.now.return_value = mock_now
+        mock_get_clock.return_value.now.return_value = mock_now
 
         mock_orders = [Mock(spec=Order), Mock(spec=Order)]
         mock_calculate_orders.return_value = mock_orders
@@ -109,7 +111,8 @@ class TestGetOrderMessageRegister:
             market_slug="test-market",
             orderBook_store=mock_orderbook_store,
             datetime=mock_now,
-            test_mode=False
+            test_mode=False,
+            encoder=None
         )
         mock_write_orders.assert_called_once_with(
             market_slug="test-market",
@@ -157,10 +160,10 @@ class TestGetOrderMessageRegister:
     @patch('src.main.write_orderBookStore')
     @patch('src.main.write_orders')
     @patch('src.main.calculate_orders')
-    @patch('src.main.datetime')
+    @patch('src.main.get_clock')
     def test_handler_with_empty_orders(
         self,
-        mock_datetime,
+        mock_get_clock,
         mock_calculate_orders,
         mock_write_orders,
         mock_write_orderBookStore,
@@ -172,7 +175,7 @@ class TestGetOrderMessageRegister:
         """Test handler when no orders are calculated."""
         # Setup mocks
         mock_now = Mock()
-        mock_datetime.now.return_value = mock_now
+        mock_get_clock.return_value.now.return_value = mock_now
 
         mock_calculate_orders.return_value = []
         mock_orderbook_store.update_book.return_value = mock_orderbook_store
@@ -239,10 +242,10 @@ class TestGetOrderMessageRegister:
     @patch('src.main.write_orderBookStore')
     @patch('src.main.write_orders')
     @patch('src.main.calculate_orders')
-    @patch('src.main.datetime')
+    @patch('src.main.get_clock')
     def test_handler_multiple_messages(
         self,
-        mock_datetime,
+        mock_get_clock,
         mock_calculate_orders,
         mock_write_orders,
         mock_write_orderBookStore,
@@ -253,7 +256,7 @@ class TestGetOrderMessageRegister:
         """Test handler with multiple market messages."""
         # Setup mocks
         mock_now = Mock()
-        mock_datetime.now.return_value = mock_now
+        mock_get_clock.return_value.now.return_value = mock_now
 
         mock_orders = [Mock(spec=Order)]
         mock_calculate_orders.return_value = mock_orders
@@ -310,3 +313,242 @@ class TestGetOrderMessageRegister:
         # Verify orders were added
         assert len(order_store.orders) == 1
         assert order_store.orders == mock_orders
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    def test_handler_with_order_emitter_suppresses_repeats(
+        self,
+        mock_write_orders,
+        mock_write_orderBookStore,
+        mock_write_marketEvents,
+        order_store
+    ):
+        """Test that a persisting opportunity is only stored and written once."""
+        books = [
+            SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 1000),
+            SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        ]
+        store = OrderBookStore("test-market", 123456, books)
+        handler = get_order_message_register(store, order_store, order_emitter=OrderEmitter())
+
+        def book_message(asset_id, price, timestamp):
+            return {
+                "asset_id": asset_id,
+                "event_type": "book",
+                "market": "test-market-address",
+                "asks": [{"price": price, "size": "100"}],
+                "bids": [],
+                "timestamp": timestamp,
+                "hash": f"hash-{asset_id}-{timestamp}"
+            }
+
+        handler([book_message("asset-yes", "0.45", 1), book_message("asset-no", "0.50", 1)])
+        handler([book_message("asset-yes", "0.45", 2)])
+
+        assert len(order_store.orders) == 2
+        first_write, second_write = mock_write_orders.call_args_list
+        assert len(first_write.kwargs["orders"]) == 2
+        assert second_write.kwargs["orders"] == []
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    @patch('src.main.calculate_orders')
+    def test_handler_with_strategy_runner(
+        self,
+        mock_calculate_orders,
+        mock_write_orders,
+        mock_write_orderBookStore,
+        mock_write_marketEvents,
+        mock_orderbook_store,
+        order_store,
+        sample_market_message
+    ):
+        """Test that the handler dispatches to the strategy runner when given one."""
+        mock_orderbook_store.update_book.return_value = mock_orderbook_store
+        mock_book = Mock()
+        mock_book.outcome_name = "YES"
+        mock_orderbook_store.lookup.return_value = mock_book
+
+        mock_orders = [Mock(spec=Order)]
+        strategy_runner = Mock()
+        strategy_runner.on_book_update_by_strategy.return_value = {"arb": mock_orders}
+
+        handler = get_order_message_register(mock_orderbook_store, order_store, strategy_runner=strategy_runner)
+        handler(sample_market_message)
+
+        mock_calculate_orders.assert_not_called()
+        strategy_runner.on_book_update_by_strategy.assert_called_once_with(*mock_orderbook_store.books)
+        assert order_store.orders == mock_orders
+        assert mock_write_orders.call_args.kwargs["orders"] == mock_orders
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    def test_handler_records_worker_strategy_orders(
+        self,
+        mock_write_orders,
+        mock_write_orderBookStore,
+        mock_write_marketEvents,
+        mock_orderbook_store,
+        order_store,
+        sample_market_message
+    ):
+        """Test that orders of worker strategies are stored and written from the worker."""
+        mock_orderbook_store.update_book.return_value = mock_orderbook_store
+        mock_book = Mock()
+        mock_book.outcome_name = "YES"
+        mock_orderbook_store.lookup.return_value = mock_book
+        for book in mock_orderbook_store.books:
+            book.snapshot.return_value = book
+
+        mock_orders = [Mock(spec=Order)]
+        strategy_runner = StrategyRunner()
+        strategy_runner.register("worker", lambda book_a, book_b: mock_orders, latency_budget_ms=1000, mode=ExecutionMode.WORKER)
+
+        handler = get_order_message_register(mock_orderbook_store, order_store, strategy_runner=strategy_runner)
+        handler(sample_market_message)
+        strategy_runner.shutdown()
+
+        assert order_store.orders == mock_orders
+        # The handler writes no orders of its own; the worker may write first
+        written = [c.kwargs["orders"] for c in mock_write_orders.call_args_list]
+        assert sorted(written, key=len) == [[], mock_orders]
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    @patch('src.main.calculate_orders')
+    @patch('src.main.likely_orders')
+    def test_handler_presigns_likely_orders(
+        self,
+        mock_likely_orders,
+        mock_calculate_orders,
+        mock_write_orders,
+        mock_write_orderBookStore,
+        mock_write_marketEvents,
+        mock_orderbook_store,
+        order_store,
+        sample_market_message
+    ):
+        """Test that the handler pre-signs the likely orders of the updated books when given an executor."""
+        mock_orderbook_store.update_book.return_value = mock_orderbook_store
+        mock_book = Mock()
+        mock_book.outcome_name = "YES"
+        mock_orderbook_store.lookup.return_value = mock_book
+        mock_calculate_orders.return_value = []
+        likely = [Mock(spec=Order)]
+        mock_likely_orders.return_value = likely
+        order_executor = Mock()
+
+        handler = get_order_message_register(mock_orderbook_store, order_store, order_executor=order_executor)
+        handler(sample_market_message)
+
+        mock_likely_orders.assert_called_once_with(*mock_orderbook_store.books)
+        order_executor.presign_polymarket_orders.assert_called_once_with(likely, source="test-market")
+
+    def test_build_orders_store_uses_configured_window(self):
+        with patch('src.main.config') as mock_config:
+            mock_config.ORDERS_STORE_MAX_ORDERS = 500
+            mock_config.ORDERS_STORE_MAX_AGE_MS = 60_000
+            order_store = build_orders_store()
+
+        assert (order_store.max_orders, order_store.max_age) == (500, 60_000)
+
+    def test_build_order_executor_is_opt_in(self):
+        with patch('src.main.config') as mock_config:
+            mock_config.PRESIGN_ORDERS = False
+            assert build_order_executor() is None
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    def test_handler_keeps_worker_strategy_intents(
+        self,
+        mock_write_orders,
+        mock_write_orderBookStore,
+        mock_write_marketEvents,
+        mock_orderbook_store,
+        order_store,
+        sample_market_message
+    ):
+        """Test that the handler doesn't cancel the intents a worker strategy emitted."""
+        mock_orderbook_store.update_book.return_value = mock_orderbook_store
+        mock_book = Mock()
+        mock_book.outcome_name = "YES"
+        mock_orderbook_store.lookup.return_value = mock_book
+        for book in mock_orderbook_store.books:
+            book.snapshot.return_value = book
+
+        order = Order(market_slug="test-market", market_id=123456, asset_id="asset-123", outcome_name="YES",
+                      side=OrderSide.BUY, order_type=OrderType.FOK, price=0.45, size=50, timestamp=1000)
+        order_emitter = OrderEmitter()
+        strategy_runner = StrategyRunner()
+        strategy_runner.register("worker", lambda book_a, book_b: [order], latency_budget_ms=1000, mode=ExecutionMode.WORKER)
+
+        worker = strategy_runner.strategies["worker"]
+
+        handler = get_order_message_register(mock_orderbook_store, order_store, order_emitter=order_emitter, strategy_runner=strategy_runner)
+        for _ in range(3):
+            handler(sample_market_message)
+            # Let the worker record its orders before the next message
+            while worker.running:
+                time.sleep(0.001)
+        strategy_runner.shutdown()
+
+        assert len(order_store) == 1
+        assert order_store.lookup_state(IntentStatus.NEW) == [order]
+        assert order_emitter.outstanding("test-market") == [order]
+        written = [o for c in mock_write_orders.call_args_list for o in c.kwargs["orders"]]
+        assert written == [order]
+
+    def test_parse_recorded_message_without_condition_id(self, mock_orderbook_store, sample_market_message):
+        """Test that replayed messages, which don't keep the market's condition ID, parse with the slug instead."""
+        mock_book = Mock()
+        mock_book.outcome_name = "YES"
+        mock_orderbook_store.lookup.return_value = mock_book
+        recorded = {key: value for key, value in sample_market_message[0].items() if key != "market"}
+
+        market_event, = parse_market_events(mock_orderbook_store, [recorded])
+        live_event, = parse_market_events(mock_orderbook_store, sample_market_message)
+
+        assert market_event.market == "test-market"
+        assert live_event.market == "test-market-address"
+
+    @pytest.mark.parametrize("mode", ["inline", "worker"])
+    def test_build_strategy_runner_uses_configured_mode(self, mode):
+        with patch('src.main.config') as mock_config:
+            mock_config.ARB_EXECUTION_MODE = mode
+            mock_config.ARB_LATENCY_BUDGET_MS = 5
+            mock_config.ARB_SIZING = "ladder"
+            strategy_runner = build_strategy_runner()
+
+        registered = strategy_runner.strategies["polymarket_arb"]
+        assert registered.mode == ExecutionMode(mode.upper())
+        assert registered.latency_budget == 0.005
+        strategy_runner.shutdown()
+
+    def test_build_strategy_runner_with_depth_sizing(self):
+        book_a = SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 1000)
+        book_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 1000)
+        book_a.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in [(0.47, 25), (0.53, 60)]])
+        book_b.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in [(0.48, 10), (0.49, 60)]])
+
+        with patch('src.main.config') as mock_config:
+            mock_config.ARB_EXECUTION_MODE = "inline"
+            mock_config.ARB_LATENCY_BUDGET_MS = 5
+            mock_config.ARB_SIZING = "depth"
+            strategy_runner = build_strategy_runner()
+
+        # One order per outcome, sized on both ladders' depth
+        orders = strategy_runner.on_book_update(book_a, book_b)
+        assert [(order.asset_id, order.price, order.size) for order in orders] == [
+            ("asset-yes", 0.47, 25), ("asset-no", 0.49, 25)
+        ]
+
+    def test_build_strategy_runner_rejects_unknown_sizing(self):
+        with patch('src.main.config') as mock_config:
+            mock_config.ARB_SIZING = "kelly"
+            with pytest.raises(ValueError):
+                build_strategy_runner()
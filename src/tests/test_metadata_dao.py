@@ -73,6 +73,26 @@ class TestMetadataDAO:
         if os.path.exists(file_path):
             os.remove(file_path)
     
+    def test_write_metadata_through_shared_writer(self, mock_books):
+        """Test that a shared writer, e.g. Parquet, gets the rows and no plain CSV is set up."""
+        executed_at = datetime(2025, 6, 27, 12, 0, 0)
+        unique_slug = f"mlb-test-shared-writer-{executed_at.timestamp()}"
+        file_path = f"data/20250627_{unique_slug}_market-metadata.csv"
+        csv_writer = Mock()
+
+        with patch('daos.metadata_dao.get_csv_writer', return_value=csv_writer):
+            write_metadata(
+                market_slug=unique_slug,
+                market_id=12345,
+                books=mock_books,
+                executed_at=executed_at
+            )
+
+        assert not os.path.exists(file_path)
+        (written_path, field_names, rows), _ = csv_writer.write.call_args
+        assert (written_path, field_names) == (file_path, FIELD_NAMES)
+        assert [row['asset_id'] for row in rows] == ["1", "2"]
+
     def test_write_metadata_appends_rows(self, mock_books):
         """Test that metadata writer appends correct data."""
         executed_at = datetime(2025, 6, 27, 12, 0, 0)
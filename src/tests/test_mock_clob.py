@@ -0,0 +1,72 @@
+import pytest
+import httpx
+from src.benchmarks.bench_orders import make_orders, targeting, _signed_payloads
+from src.mock_clob import MockClobServer, MockClobSettings
+from services.http_client import HttpClient
+from services.order_executor import OrderExecutor
+from services.polymarket_service import PolymarketService
+
+
+class TestMockClob:
+    @pytest.fixture
+    def settings(self):
+        return MockClobSettings(seed=1)
+
+    @pytest.fixture
+    def server(self, settings):
+        with MockClobServer(settings) as server, targeting(server):
+            yield server
+
+    @pytest.fixture
+    def service(self, server):
+        service = PolymarketService(http_client=HttpClient())
+        yield service
+        service.http.close()
+
+    def test_places_orders(self, server, service):
+        order_data, = _signed_payloads(make_orders(1))
+
+        result = service.place_single_order(order_data, 'FOK')
+        results = service.place_multiple_orders([order_data] * 3, 'FOK')
+
+        assert result['success'] and result['status'] == 'matched'
+        assert [r['status'] for r in results] == ['matched'] * 3
+        assert (server.stats.requests, server.stats.orders, server.stats.filled) == (2, 4, 4)
+        # Both requests went out on the same pooled connection
+        assert len(server.stats.connections) == 1
+
+    @pytest.mark.parametrize('order_type, status, success', [('FOK', 'unmatched', False), ('GTC', 'live', True)])
+    def test_unfilled_orders(self, settings, service, order_type, status, success):
+        settings.fill_rate = 0.0
+        order_data, = _signed_payloads(make_orders(1))
+
+        result = service.place_single_order(order_data, order_type)
+
+        assert (result['status'], result['success']) == (status, success)
+
+    def test_errors(self, settings, server, service):
+        settings.error_rate = 1.0
+        order_data, = _signed_payloads(make_orders(1))
+
+        result = service.place_single_order(order_data, 'FOK')
+
+        assert result['success'] is False
+        assert '500' in result['errorMsg']
+        assert server.stats.errors == 1
+
+    def test_rejects_oversized_batches(self, server):
+        response = httpx.post(f"{server.url}/orders", json=_signed_payloads(make_orders(16)))
+
+        assert response.status_code == 400
+
+    def test_order_executor(self, server):
+        executor = OrderExecutor()
+        assert executor.is_polymarket_available()
+
+        summary = executor.execute_polymarket_orders(make_orders(6))
+
+        assert (summary['batches_processed'], summary['successful_batches'], summary['accepted_orders']) == (2, 2, 6)
+        assert executor.get_polymarket_batch_stats()['orders'] == 6
+        assert server.stats.orders == 6
+        executor.polymarket_service.signer.close()
+        executor.polymarket_service.batch_executor.shutdown()
@@ -8,7 +8,11 @@ from unittest.mock import Mock, patch
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from daos.orderbook_dao import write_orderBookStore, _write_to_csv, _setup_csv, FIELD_NAMES
+from daos.orderbook_dao import OrderBookDeltaEncoder, read_orderBookStore, replay_orderBookStore, DELTA_FIELD_NAMES, KEYFRAME, DELTA
 from models import OrderBookStore, SyntheticOrderBook
+from daos.csv_writer import set_csv_writer
+from daos.rotating_writer import RotatingCompressedWriter
+from src.models import OrderBookStore as BookStore, SyntheticOrderBook as Book, SyntheticOrder, OrderSide
 
 
 class TestOrderBookDAO:
@@ -304,4 +308,158 @@ class TestOrderBookDAO:
             assert len(rows) == 3
             assert rows[0]['asset_id'] == '1'
             assert rows[1]['asset_id'] == '2'
-            assert rows[2]['asset_id'] == '3'
\ No newline at end of file
+            assert rows[2]['asset_id'] == '3'
+
+
+class TestOrderBookDeltaEncoding:
+    @pytest.fixture
+    def temp_data_dir(self):
+        """Create a temporary data directory for testing."""
+        original_dir = os.getcwd()
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.makedirs('data', exist_ok=True)
+
+        yield os.path.join(temp_dir, 'data')
+
+        os.chdir(original_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def store(self):
+        book_a = Book('test-market', 12345, 'Team A', '1', 100)
+        book_b = Book('test-market', 12345, 'Team B', '2', 100)
+        book_a.replace_entries(self._asks([(0.45, 100), (0.46, 50)]))
+        book_b.replace_entries(self._asks([(0.55, 200)]))
+        return BookStore('test-market', 12345, [book_a, book_b])
+
+    def _asks(self, levels):
+        return [SyntheticOrder(side=OrderSide.SELL, price=price, size=size) for price, size in levels]
+
+    def _update(self, book, timestamp, levels):
+        book.set_timestamp(timestamp)
+        book.add_entries(self._asks(levels))
+
+    def _levels(self, book):
+        return [(order.price, order.size) for order in book.sorted_orders()]
+
+    def test_first_update_is_keyframe_then_only_changes(self, store):
+        encoder = OrderBookDeltaEncoder(keyframe_interval=100)
+        book_a = store.books[0]
+
+        rows = encoder.encode(book_a)
+        assert [row['row_type'] for row in rows] == [KEYFRAME, KEYFRAME]
+        assert {row['sequence'] for row in rows} == {0}
+
+        assert encoder.encode(book_a) == []
+
+        self._update(book_a, 200, [(0.45, 0), (0.46, 60), (0.47, 10)])
+        rows = encoder.encode(book_a)
+        assert all(row['row_type'] == DELTA and row['sequence'] == 1 for row in rows)
+        assert sorted((row['price'], row['size']) for row in rows) == [(0.45, 0), (0.46, 60), (0.47, 10)]
+        assert all(row['timestamp'] == 200 for row in rows)
+
+    def test_keyframe_interval(self, store):
+        encoder = OrderBookDeltaEncoder(keyframe_interval=2)
+        book_a = store.books[0]
+
+        encoder.encode(book_a)
+        self._update(book_a, 200, [(0.47, 10)])
+        assert [row['row_type'] for row in encoder.encode(book_a)] == [DELTA]
+        self._update(book_a, 300, [(0.48, 10)])
+        assert [row['row_type'] for row in encoder.encode(book_a)] == [KEYFRAME] * 4
+
+    def test_empty_book_keyframe(self):
+        encoder = OrderBookDeltaEncoder()
+        book = Book('test-market', 12345, 'Team A', '1', 100)
+
+        rows = encoder.encode(book)
+        assert len(rows) == 1
+        assert rows[0]['row_type'] == KEYFRAME
+        assert 'price' not in rows[0]
+
+    def test_write_orderBookStore_with_encoder(self, temp_data_dir, store):
+        test_datetime = datetime(2025, 7, 1, 12, 0, 0)
+        csv_filename = "data/20250701_test-market_synthetic-order-book-delta.csv"
+        encoder = OrderBookDeltaEncoder()
+
+        write_orderBookStore('test-market', store, test_datetime, encoder=encoder)
+        write_orderBookStore('test-market', store, test_datetime, encoder=encoder)
+
+        assert not os.path.exists("data/20250701_test-market_synthetic-order-book.csv")
+        with open(csv_filename, 'r') as f:
+            reader = csv.DictReader(f, quotechar='|')
+            rows = list(reader)
+            assert reader.fieldnames == DELTA_FIELD_NAMES
+            assert len(rows) == 3
+
+    def test_read_reconstructs_book_at_timestamp(self, temp_data_dir, store):
+        test_datetime = datetime(2025, 7, 1, 12, 0, 0)
+        csv_filename = "data/20250701_test-market_synthetic-order-book-delta.csv"
+        encoder = OrderBookDeltaEncoder(keyframe_interval=3)
+        book_a, book_b = store.books
+
+        history = {}
+        updates = [
+            (200, book_a, [(0.45, 0), (0.47, 10)]),
+            (300, book_b, [(0.56, 20)]),
+            (400, book_a, [(0.44, 5)]),
+            (500, book_a, [(0.46, 0), (0.47, 0), (0.44, 0)]),
+            (600, book_a, [(0.40, 1)]),
+        ]
+        write_orderBookStore('test-market', store, test_datetime, encoder=encoder)
+        history[100] = (self._levels(book_a), self._levels(book_b))
+        for timestamp, book, levels in updates:
+            self._update(book, timestamp, levels)
+            write_orderBookStore('test-market', store, test_datetime, encoder=encoder)
+            history[timestamp] = (self._levels(book_a), self._levels(book_b))
+
+        for timestamp, (levels_a, levels_b) in history.items():
+            books = read_orderBookStore(csv_filename, timestamp)
+            assert self._levels(books['1']) == levels_a
+            assert self._levels(books['2']) == levels_b
+
+        books = read_orderBookStore(csv_filename, 450)
+        assert self._levels(books['1']) == history[400][0]
+        assert books['1'].timestamp == 400
+        assert books['1'].outcome_name == 'Team A'
+
+        assert len(list(replay_orderBookStore(csv_filename))) == 2 + len(updates)
+
+    def test_new_day_file_starts_with_keyframe(self, temp_data_dir, store):
+        encoder = OrderBookDeltaEncoder()
+        book_a = store.books[0]
+
+        write_orderBookStore('test-market', store, datetime(2025, 7, 1, 23, 59), encoder=encoder)
+        self._update(book_a, 200, [(0.47, 10)])
+        write_orderBookStore('test-market', store, datetime(2025, 7, 2, 0, 0), encoder=encoder)
+
+        csv_filename = "data/20250702_test-market_synthetic-order-book-delta.csv"
+        with open(csv_filename, 'r') as f:
+            rows = list(csv.DictReader(f, quotechar='|'))
+        assert {row['row_type'] for row in rows} == {KEYFRAME}
+
+        books = read_orderBookStore(csv_filename)
+        assert self._levels(books['1']) == self._levels(book_a)
+        assert self._levels(books['2']) == self._levels(store.books[1])
+
+    def test_replay_reads_compressed_segments(self, temp_data_dir, store):
+        csv_filename = "data/20250701_test-market_synthetic-order-book-delta.csv"
+        encoder = OrderBookDeltaEncoder()
+        book_a = store.books[0]
+
+        writer = RotatingCompressedWriter(compression='gzip', max_segment_bytes=1, flush_interval=60)
+        set_csv_writer(writer)
+        try:
+            write_orderBookStore('test-market', store, datetime(2025, 7, 1), encoder=encoder)
+            writer.flush()
+            self._update(book_a, 200, [(0.47, 10)])
+            write_orderBookStore('test-market', store, datetime(2025, 7, 1), encoder=encoder)
+        finally:
+            set_csv_writer(None)
+            writer.close()
+
+        assert not os.path.exists(csv_filename)
+        books = read_orderBookStore(csv_filename)
+        assert self._levels(books['1']) == self._levels(book_a)
+        assert books['1'].timestamp == 200
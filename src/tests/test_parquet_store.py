@@ -0,0 +1,161 @@
+import pytest
+import os
+import csv
+import tempfile
+import shutil
+from datetime import datetime
+from unittest.mock import Mock
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pyarrow")
+
+from daos.csv_writer import set_csv_writer
+from daos.parquet_store import BufferedParquetWriter, convert_csv, read_dataset, parse_csv_filename
+from daos.order_dao import write_orders
+from daos import market_dao
+from models import Order, OrderType, OrderSide
+
+ASSET_ID = "10703298184509502202740464237528733764769030979577941510093170241051283757018"
+
+
+class TestParquetStore:
+    @pytest.fixture
+    def temp_data_dir(self):
+        """Create a temporary data directory for testing."""
+        original_dir = os.getcwd()
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.makedirs('data', exist_ok=True)
+
+        yield os.path.join(temp_dir, 'data')
+
+        os.chdir(original_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def mock_order(self):
+        order = Mock(spec=Order)
+        order.asdict.return_value = {
+            'market_slug': 'test-market',
+            'market_id': 12345,
+            'asset_id': ASSET_ID,
+            'outcome_name': 'Team A',
+            'side': OrderSide.BUY,
+            'order_type': OrderType.GTC,
+            'price': 0.45,
+            'size': 100,
+            'timestamp': 1640995200
+        }
+        return order
+
+    def test_parse_csv_filename(self):
+        assert parse_csv_filename("data/20250617_mlb-cle-sf-2025-06-17_polymarket-market-events.csv") == \
+            ("20250617", "mlb-cle-sf-2025-06-17", "polymarket-market-events")
+        assert parse_csv_filename("20250617_mlb-cle-sf-2025-06-17_orders_test.csv") == \
+            ("20250617", "mlb-cle-sf-2025-06-17", "orders_test")
+
+        with pytest.raises(ValueError):
+            parse_csv_filename("data/notes.csv")
+
+    def test_writer_stores_dao_rows(self, temp_data_dir, mock_order):
+        """Test that the writer selected in the DAOs stores typed, partitioned rows."""
+        root = os.path.join(temp_data_dir, 'parquet')
+        writer = BufferedParquetWriter(root=root, flush_interval=60)
+        set_csv_writer(writer)
+        try:
+            write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+            writer.flush()
+            write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+        finally:
+            set_csv_writer(None)
+            writer.close()
+
+        assert not os.path.exists("data/20250701_test-market_orders.csv")
+        assert os.listdir(os.path.join(root, 'orders', 'date=20250701', 'market_slug=test-market'))
+
+        orders = read_dataset('orders', root=root)
+        assert len(orders) == 2
+        assert orders['asset_id'][0] == ASSET_ID
+        assert orders['side'][0] == 'BUY'
+        assert orders['price'][0] == 0.45
+        assert orders['timestamp'][0] == 1640995200
+        assert orders['market_slug'][0] == 'test-market'
+        assert orders['date'][0] == '20250701'
+
+    def test_writer_rolls_parts(self, temp_data_dir, mock_order):
+        """Test that full parts are closed and readable while the session is still writing."""
+        root = os.path.join(temp_data_dir, 'parquet')
+        partition = os.path.join(root, 'orders', 'date=20250701', 'market_slug=test-market')
+        writer = BufferedParquetWriter(root=root, flush_interval=60, max_part_rows=2)
+        set_csv_writer(writer)
+        try:
+            write_orders("test-market", [mock_order, mock_order], datetime(2025, 7, 1))
+            writer.flush()
+            write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+            writer.flush()
+
+            files = sorted(os.listdir(partition))
+            assert len(files) == 2
+            assert files[0].startswith('.') and files[0].endswith('.inprogress')
+            assert len(read_dataset('orders', root=root)) == 2
+        finally:
+            set_csv_writer(None)
+            writer.close()
+
+        assert len(os.listdir(partition)) == 2
+        assert len(read_dataset('orders', root=root)) == 3
+        assert not any(name.startswith('.') for name in os.listdir(partition))
+
+    def test_writer_closes_old_parts_on_flush(self, temp_data_dir, mock_order):
+        root = os.path.join(temp_data_dir, 'parquet')
+        writer = BufferedParquetWriter(root=root, flush_interval=60, max_part_seconds=0)
+        set_csv_writer(writer)
+        try:
+            write_orders("test-market", [mock_order], datetime(2025, 7, 1))
+            writer.flush()
+            assert writer._files == {}
+            assert len(read_dataset('orders', root=root)) == 1
+        finally:
+            set_csv_writer(None)
+            writer.close()
+
+    def test_convert_csv(self, temp_data_dir):
+        """Test converting a CSV written by the DAO, including missing columns and malformed rows."""
+        csv_filename = "data/20250617_mlb-cle-sf-2025-06-17_polymarket-market-events.csv"
+        with open(csv_filename, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            # Older files have no outcome_name column
+            writer.writerow(['market_slug', 'asset_id', 'market_id', 'event_type', 'price', 'side', 'size', 'hash', 'timestamp'])
+            writer.writerow(['mlb-cle-sf-2025-06-17', ASSET_ID, '552801', 'book', '0.99', 'ask', '1500.0', 'abc', '1750212212579'])
+            writer.writerow(['mlb-cle-sf-2025-06-17', ASSET_ID, '', 'price_change', '0.5', 'bid', '10', 'def', '1750212212580'])
+            writer.writerow(['mangled', 'row'])
+
+        root = os.path.join(temp_data_dir, 'parquet')
+        convert_csv(csv_filename, root=root)
+        convert_csv(csv_filename, root=root)
+
+        events = read_dataset('polymarket-market-events', root=root, market_slug='mlb-cle-sf-2025-06-17')
+        assert list(events['event_type']) == ['book', 'price_change']
+        assert events['asset_id'][0] == ASSET_ID
+        assert events['market_id'][0] == 552801
+        assert events['market_id'].isna()[1]
+        assert events['outcome_name'].isna().all()
+        assert events['size'][0] == 1500.0
+
+    def test_read_dataset_filters_partitions(self, temp_data_dir):
+        root = os.path.join(temp_data_dir, 'parquet')
+        for date, market_slug in [("20250617", "market-a"), ("20250617", "market-b"), ("20250618", "market-a")]:
+            csv_filename = f"data/{date}_{market_slug}_polymarket-market-events.csv"
+            with open(csv_filename, 'w', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(market_dao.FIELD_NAMES)
+                writer.writerow([market_slug, 1, ASSET_ID, 'Yes', 'book', 0.5, 'ask', 10, 'abc', 1])
+            convert_csv(csv_filename, root=root)
+
+        assert len(read_dataset('polymarket-market-events', root=root)) == 3
+        assert len(read_dataset('polymarket-market-events', root=root, date="20250617")) == 2
+        assert len(read_dataset('polymarket-market-events', root=root, date="20250617", market_slug="market-a")) == 1
+
+        prices = read_dataset('polymarket-market-events', root=root, columns=['price'])
+        assert list(prices.columns) == ['price']
@@ -0,0 +1,150 @@
+import pytest
+import os
+import csv
+import tempfile
+import shutil
+from datetime import datetime
+from unittest.mock import Mock, patch
+from src.replay import find_event_files, market_book_store, merge_message_groups, MultiMarketReplay
+from src.strategies import StrategyRunner
+from src.utils import CSVMessageProcessor
+
+FIELD_NAMES = ['market_slug', 'market_id', 'asset_id', 'outcome_name', 'event_type', 'price', 'side', 'size', 'hash', 'timestamp']
+
+
+def _write_events(path, market_slug, market_id, rows):
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELD_NAMES)
+        writer.writeheader()
+        for asset_id, outcome_name, event_type, price, side, timestamp in rows:
+            writer.writerow({
+                'market_slug': market_slug,
+                'market_id': market_id,
+                'asset_id': asset_id,
+                'outcome_name': outcome_name,
+                'event_type': event_type,
+                'price': price,
+                'side': side,
+                'size': 100.0,
+                'hash': 'abc',
+                'timestamp': timestamp
+            })
+
+
+class TestMultiMarketReplay:
+    @pytest.fixture
+    def data_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        data_dir = os.path.join(temp_dir, 'data')
+        os.makedirs(data_dir)
+
+        _write_events(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'), 'market-a', 1, [
+            ('a-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+            ('a-no', 'No', 'book', 0.56, 'ask', 1000),
+            ('a-yes', 'Yes', 'price_change', 0.44, 'SELL', 3000),
+        ])
+        _write_events(os.path.join(data_dir, '20250701_market-b_polymarket-market-events.csv'), 'market-b', 2, [
+            ('b-yes', 'Yes', 'book', 0.30, 'ask', 2000),
+            ('b-no', 'No', 'book', 0.71, 'ask', 2000),
+            ('b-no', 'No', 'price_change', 0.69, 'SELL', 4000),
+        ])
+        _write_events(os.path.join(data_dir, '20250701_market-a_polymarket-market-events_test.csv'), 'market-a', 1, [])
+        _write_events(os.path.join(data_dir, '20250702_market-c_polymarket-market-events.csv'), 'market-c', 3, [])
+
+        yield data_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_find_event_files_by_date(self, data_dir):
+        paths = find_event_files('20250701', data_dir)
+
+        assert [os.path.basename(path) for path in paths] == [
+            '20250701_market-a_polymarket-market-events.csv',
+            '20250701_market-b_polymarket-market-events.csv',
+        ]
+
+    def test_find_event_files_by_glob(self, data_dir):
+        assert len(find_event_files('*_polymarket-market-events*.csv', data_dir)) == 3
+        assert len(find_event_files(os.path.join(data_dir, '*market-b*'), data_dir)) == 1
+
+    def test_market_book_store(self, data_dir):
+        book_store = market_book_store(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'))
+
+        assert book_store.market_slug == 'market-a'
+        assert book_store.market_id == 1
+        assert book_store.asset_ids == ['a-yes', 'a-no']
+        assert book_store.lookup('a-no').outcome_name == 'No'
+
+    def test_market_book_store_reads_metadata(self, data_dir):
+        path = os.path.join(data_dir, '20250701_market-d_polymarket-market-events.csv')
+        _write_events(path, 'market-d', '', [
+            ('d-yes', '', 'book', 0.45, 'ask', 1000),
+            ('d-no', '', 'book', 0.56, 'ask', 1000),
+        ])
+        with open(os.path.join(data_dir, '20250701_market-d_market-metadata.csv'), 'w', newline='') as csvfile:
+            csvfile.write('market_slug,market_id,asset_id,outcome_name,executed_at_timestamp,game_start_timestamp\n')
+            csvfile.write('market-d,4,d-yes,Reds,1000,\n')
+            csvfile.write('market-d,4,d-no,Red Sox,1000,\n')
+
+        book_store = market_book_store(path)
+
+        assert book_store.market_id == 4
+        assert [book.outcome_name for book in book_store.books] == ['Reds', 'Red Sox']
+
+    def test_merge_message_groups_is_chronological(self, data_dir):
+        processors = [CSVMessageProcessor(path, []) for path in find_event_files('20250701', data_dir)]
+
+        merged = list(merge_message_groups(processors))
+
+        assert [(index, group[0]['timestamp']) for index, group in merged] == [(0, 1000), (1, 2000), (0, 3000), (1, 4000)]
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    def test_run_drives_every_market(self, mock_write_orders, mock_write_orderBookStore, mock_write_marketEvents, data_dir):
+        factory = Mock(side_effect=lambda market_slug: StrategyRunner())
+        replay = MultiMarketReplay(find_event_files('20250701', data_dir), strategy_runner_factory=factory)
+
+        stats = replay.run()
+
+        assert [call.args[0] for call in factory.call_args_list] == ['market-a', 'market-b']
+        assert stats.message_groups == {'market-a': 2, 'market-b': 2}
+        assert (stats.first_timestamp, stats.last_timestamp) == (1000, 4000)
+        assert [call.kwargs['market_slug'] for call in mock_write_marketEvents.call_args_list] == ['market-a', 'market-b', 'market-a', 'market-b']
+
+        # market-b's asks sum to 0.99 after its last message
+        assert stats.arb_message_groups == {'market-a': 0, 'market-b': 1}
+        assert (stats.best_arb.market_slug, stats.best_arb.edge) == ('market-b', pytest.approx(0.01))
+
+        book_a, book_b = replay.book_stores
+        assert book_a.lookup('a-yes').timestamp == 3000
+        assert [order.price for order in book_b.lookup('b-no').sorted_orders()] == [0.69, 0.71]
+
+    @patch('src.main.write_marketEvents')
+    @patch('src.main.write_orderBookStore')
+    @patch('src.main.write_orders')
+    def test_run_uses_event_time(self, mock_write_orders, mock_write_orderBookStore, mock_write_marketEvents, data_dir):
+        _write_events(os.path.join(data_dir, '20250702_market-c_polymarket-market-events.csv'), 'market-c', 3, [
+            ('c-yes', 'Yes', 'book', 0.45, 'ask', 1751414400000),
+            ('c-no', 'No', 'book', 0.50, 'ask', 1751414400000),
+            ('c-no', 'No', 'price_change', 0.49, 'SELL', 1751414460000),
+        ])
+
+        replays = [MultiMarketReplay(find_event_files('20250702', data_dir)) for _ in range(2)]
+        for replay in replays:
+            replay.run()
+
+        assert [call.kwargs['datetime'] for call in mock_write_marketEvents.call_args_list[:2]] == [
+            datetime.fromtimestamp(1751414400), datetime.fromtimestamp(1751414460)
+        ]
+        orders = [[order.asdict() for order in replay.order_stores[0].orders] for replay in replays]
+        assert {order['timestamp'] for order in orders[0]} == {1751414400000, 1751414460000}
+        # Replays are reproducible
+        assert orders[0] == orders[1]
+
+    def test_skips_markets_without_market_id(self, data_dir):
+        path = os.path.join(data_dir, '20250701_market-e_polymarket-market-events.csv')
+        _write_events(path, 'market-e', '', [('e-yes', 'Yes', 'book', 0.45, 'ask', 1000)])
+
+        replay = MultiMarketReplay(find_event_files('20250701', data_dir))
+
+        assert [book_store.market_slug for book_store in replay.book_stores] == ['market-a', 'market-b']
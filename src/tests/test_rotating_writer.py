@@ -0,0 +1,147 @@
+import pytest
+import os
+import csv
+import gzip
+import json
+import tempfile
+import shutil
+from datetime import datetime
+from unittest.mock import Mock
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from daos.csv_writer import set_csv_writer
+from daos.rotating_writer import RotatingCompressedWriter
+from daos.market_dao import FIELD_NAMES
+from src.utils.compressed_files import iter_csv_rows, read_segment_index, find_segments, segment_paths
+from src.utils.csv_message_processor import CSVMessageProcessor
+
+
+class TestRotatingCompressedWriter:
+    @pytest.fixture
+    def temp_data_dir(self):
+        """Create a temporary data directory for testing."""
+        original_dir = os.getcwd()
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+
+        yield os.path.join(temp_dir, 'data')
+
+        os.chdir(original_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _rows(self, timestamp, count=2):
+        return [{
+            'market_slug': 'test-market',
+            'market_id': 12345,
+            'asset_id': '1',
+            'outcome_name': 'Team A',
+            'event_type': 'book',
+            'price': 0.45 + i / 100,
+            'size': 100,
+            'side': 'ask',
+            'hash': 'abc',
+            'timestamp': timestamp
+        } for i in range(count)]
+
+    def test_writes_compressed_segment(self, temp_data_dir):
+        csv_filename = "data/20250701_test-market_polymarket-market-events.csv"
+        writer = RotatingCompressedWriter(flush_interval=60)
+
+        writer.write(csv_filename, FIELD_NAMES, self._rows(100))
+        writer.close()
+
+        assert not os.path.exists(csv_filename)
+        segment = "data/20250701_test-market_polymarket-market-events.00000.csv.gz"
+        with gzip.open(segment, 'rt') as f:
+            assert next(csv.reader(f)) == FIELD_NAMES
+
+        rows = list(iter_csv_rows(csv_filename, quotechar='|'))
+        assert len(rows) == 2
+        assert rows[0]['price'] == '0.45'
+
+        assert read_segment_index(csv_filename) == [{
+            'segment': os.path.basename(segment),
+            'first_timestamp': 100,
+            'last_timestamp': 100,
+            'rows': 2,
+            'bytes': os.path.getsize(segment)
+        }]
+
+    def test_rotates_on_size_and_indexes_time_ranges(self, temp_data_dir):
+        csv_filename = "data/20250701_test-market_polymarket-market-events.csv"
+        writer = RotatingCompressedWriter(max_segment_bytes=1, flush_interval=60)
+
+        for timestamp in [100, 200, 300]:
+            writer.write(csv_filename, FIELD_NAMES, self._rows(timestamp))
+            writer.flush()
+        writer.close()
+
+        assert len(segment_paths(csv_filename)) == 3
+        index = read_segment_index(csv_filename)
+        assert [(entry['first_timestamp'], entry['last_timestamp']) for entry in index] == [(100, 100), (200, 200), (300, 300)]
+
+        assert [os.path.basename(path) for path in find_segments(csv_filename, start=150, end=250)] == \
+            ["20250701_test-market_polymarket-market-events.00001.csv.gz"]
+        assert len(list(iter_csv_rows(csv_filename))) == 6
+
+    def test_rotates_on_time(self, temp_data_dir):
+        csv_filename = "data/rows.csv"
+        writer = RotatingCompressedWriter(max_segment_seconds=0, flush_interval=60)
+
+        writer.write(csv_filename, ['a', 'timestamp'], [{'a': 1, 'timestamp': 1}])
+        writer.flush()
+        writer.write(csv_filename, ['a', 'timestamp'], [{'a': 2, 'timestamp': 2}])
+        writer.close()
+
+        assert len(segment_paths(csv_filename)) == 2
+
+    def test_continues_numbering_across_runs(self, temp_data_dir):
+        csv_filename = "data/rows.csv"
+        for value in [1, 2]:
+            writer = RotatingCompressedWriter(flush_interval=60)
+            writer.write(csv_filename, ['a'], [{'a': value}])
+            writer.close()
+
+        assert [os.path.basename(path) for path in segment_paths(csv_filename)] == ["rows.00000.csv.gz", "rows.00001.csv.gz"]
+        assert [row['a'] for row in iter_csv_rows(csv_filename)] == ['1', '2']
+
+    def test_open_segment_is_readable(self, temp_data_dir):
+        csv_filename = "data/rows.csv"
+        writer = RotatingCompressedWriter(flush_interval=60)
+
+        writer.write(csv_filename, ['a'], [{'a': 1}, {'a': 2}])
+        writer.flush()
+        try:
+            assert [row['a'] for row in iter_csv_rows(csv_filename)] == ['1', '2']
+        finally:
+            writer.close()
+
+    def test_zstd(self, temp_data_dir):
+        pytest.importorskip("zstandard")
+        csv_filename = "data/rows.csv"
+        writer = RotatingCompressedWriter(compression='zstd', flush_interval=60)
+
+        writer.write(csv_filename, ['a'], [{'a': 1}])
+        writer.close()
+
+        assert segment_paths(csv_filename) == ["data/rows.00000.csv.zst"]
+        assert [row['a'] for row in iter_csv_rows(csv_filename)] == ['1']
+
+    def test_unknown_compression(self):
+        with pytest.raises(ValueError):
+            RotatingCompressedWriter(compression='lz4')
+
+    def test_csv_message_processor_reads_segments(self, temp_data_dir):
+        csv_filename = "data/20250701_test-market_polymarket-market-events.csv"
+        writer = RotatingCompressedWriter(max_segment_bytes=1, flush_interval=60)
+        for timestamp in [100, 200]:
+            writer.write(csv_filename, FIELD_NAMES, self._rows(timestamp))
+            writer.flush()
+        writer.close()
+
+        handler = Mock()
+        CSVMessageProcessor(csv_filename, [handler]).run()
+
+        assert handler.call_count == 2
+        assert [call[0][0][0]['timestamp'] for call in handler.call_args_list] == [100, 200]
+        assert len(handler.call_args_list[0][0][0][0]['asks']) == 2
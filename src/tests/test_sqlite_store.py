@@ -0,0 +1,129 @@
+import pytest
+import os
+import sqlite3
+import tempfile
+import shutil
+import multiprocessing
+from datetime import datetime
+from unittest.mock import Mock
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from daos.csv_writer import set_csv_writer
+from daos.sqlite_store import SQLiteEventStore, query, connect
+from daos.order_dao import write_orders
+from daos.market_dao import FIELD_NAMES
+from models import Order, OrderType, OrderSide
+
+ASSET_ID = "10703298184509502202740464237528733764769030979577941510093170241051283757018"
+
+
+def _write_events(db_path, timestamps):
+    store = SQLiteEventStore(db_path=db_path, flush_interval=60)
+    for timestamp in timestamps:
+        store.write("data/20250701_test-market_polymarket-market-events.csv", FIELD_NAMES, [{
+            'market_slug': 'test-market', 'market_id': 1, 'asset_id': ASSET_ID, 'outcome_name': 'Yes',
+            'event_type': 'book', 'price': 0.5, 'side': 'ask', 'size': 10, 'hash': 'abc', 'timestamp': timestamp
+        }])
+        store.flush()
+    store.close()
+
+
+class TestSQLiteEventStore:
+    @pytest.fixture
+    def db_path(self):
+        temp_dir = tempfile.mkdtemp()
+        yield os.path.join(temp_dir, 'data', 'signaldrift.db')
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _events(self, asset_id, timestamps):
+        return [{
+            'market_slug': 'test-market',
+            'market_id': 12345,
+            'asset_id': asset_id,
+            'outcome_name': 'Team A',
+            'event_type': 'price_change',
+            'price': 0.45,
+            'side': 'ask',
+            'size': 100,
+            'hash': 'abc',
+            'timestamp': timestamp
+        } for timestamp in timestamps]
+
+    def test_dao_writes_go_to_sqlite(self, db_path):
+        order = Mock(spec=Order)
+        order.asdict.return_value = {
+            'market_slug': 'test-market',
+            'market_id': 12345,
+            'asset_id': ASSET_ID,
+            'outcome_name': 'Team A',
+            'side': OrderSide.BUY,
+            'order_type': OrderType.GTC,
+            'price': 0.45,
+            'size': 100,
+            'timestamp': 1640995200
+        }
+        store = SQLiteEventStore(db_path=db_path, flush_interval=60)
+        set_csv_writer(store)
+        try:
+            write_orders("test-market", [order], datetime(2025, 7, 1))
+            write_orders("test-market", [order], datetime(2025, 7, 2), test_mode=True)
+        finally:
+            set_csv_writer(None)
+            store.close()
+
+        orders = query('orders', db_path=db_path, date='20250701')
+        assert len(orders) == 1
+        assert orders[0]['asset_id'] == ASSET_ID
+        assert orders[0]['side'] == 'BUY'
+        assert orders[0]['price'] == 0.45
+        assert orders[0]['timestamp'] == 1640995200
+
+        assert query('orders', db_path=db_path, date='20250702') == []
+        assert len(query('orders_test', db_path=db_path, date='20250702')) == 1
+
+    def test_query_by_asset_and_time(self, db_path):
+        store = SQLiteEventStore(db_path=db_path, flush_interval=60)
+        csv_filename = "data/20250701_test-market_polymarket-market-events.csv"
+        store.write(csv_filename, FIELD_NAMES, self._events('1', [300, 100, 200]))
+        store.write(csv_filename, FIELD_NAMES, self._events('2', [150]))
+        store.close()
+
+        events = query('polymarket-market-events', db_path=db_path, asset_id='1', start=150, end=300)
+        assert [event['timestamp'] for event in events] == [200, 300]
+        assert len(query('polymarket-market-events', db_path=db_path, market_slug='test-market')) == 4
+
+    def test_wal_mode_and_indexes(self, db_path):
+        SQLiteEventStore(db_path=db_path, flush_interval=60).close()
+
+        connection = sqlite3.connect(db_path)
+        try:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM polymarket_market_events WHERE market_slug = ? AND asset_id = ? AND timestamp BETWEEN ? AND ?",
+                ['m', 'a', 1, 2]
+            ).fetchall()
+            assert 'polymarket_market_events_market_asset_time' in str([tuple(row) for row in plan])
+        finally:
+            connection.close()
+
+    def test_flush_is_one_transaction(self, db_path):
+        store = SQLiteEventStore(db_path=db_path, flush_interval=60)
+        store.write("data/20250701_test-market_polymarket-market-events.csv", FIELD_NAMES, self._events('1', [100]))
+
+        # Nothing is visible to other connections until the flush commits
+        assert query('polymarket-market-events', db_path=db_path) == []
+        store.flush()
+        assert len(query('polymarket-market-events', db_path=db_path)) == 1
+        store.close()
+
+    def test_concurrent_writers(self, db_path):
+        connect(db_path).close()
+        processes = [multiprocessing.Process(target=_write_events, args=(db_path, range(start, start + 20)))
+                     for start in [0, 1000]]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            assert process.exitcode == 0
+
+        assert len(query('polymarket-market-events', db_path=db_path)) == 40
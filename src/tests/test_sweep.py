@@ -0,0 +1,122 @@
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+from src.backtest import backtest_file
+from src.daos import EventFile
+from src.main import parse_market_events
+from src.replay import find_event_files
+from src.strategies import ArbParameters
+from src.sweep import cached_event_file, parameter_grid, sweep_file, run_sweep
+from src.tests.test_replay import _write_events
+
+
+class TestSweep:
+    @pytest.fixture
+    def data_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        data_dir = os.path.join(temp_dir, 'data')
+        os.makedirs(data_dir)
+
+        # An arb at 0.45 + 0.50, gone at 0.55, back at 0.47 + 0.50
+        _write_events(os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv'), 'market-a', 1, [
+            ('a-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+            ('a-no', 'No', 'book', 0.50, 'ask', 1000),
+            ('a-no', 'No', 'book', 0.55, 'ask', 3000),
+            ('a-yes', 'Yes', 'book', 0.47, 'ask', 4000),
+            ('a-no', 'No', 'book', 0.50, 'ask', 4000),
+        ])
+        _write_events(os.path.join(data_dir, '20250701_market-c_polymarket-market-events.csv'), 'market-c', '', [
+            ('c-yes', 'Yes', 'book', 0.45, 'ask', 1000),
+        ])
+
+        yield data_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def csv_file_path(self, data_dir):
+        return os.path.join(data_dir, '20250701_market-a_polymarket-market-events.csv')
+
+    def test_parameter_grid(self):
+        grid = parameter_grid([0.0, 0.01], [0.5], [1, None])
+
+        assert grid == [
+            ArbParameters(0.0, 0.5, 1), ArbParameters(0.0, 0.5, None),
+            ArbParameters(0.01, 0.5, 1), ArbParameters(0.01, 0.5, None),
+        ]
+
+    def test_cached_event_file_is_decoded_once(self, data_dir, csv_file_path):
+        cache_dir = os.path.join(data_dir, '.cache')
+
+        path = cached_event_file(csv_file_path, cache_dir)
+        decoded_at = os.path.getmtime(path)
+        assert cached_event_file(csv_file_path, cache_dir) == path
+        assert os.path.getmtime(path) == decoded_at
+        assert sorted(os.listdir(cache_dir)) == [
+            '20250701_market-a_polymarket-market-events.streaming-1000.events.assets.json',
+            '20250701_market-a_polymarket-market-events.streaming-1000.events.bin',
+            '20250701_market-a_polymarket-market-events.streaming-1000.events.sources.json',
+        ]
+
+        # The CSV changed since
+        with open(csv_file_path, 'a') as csvfile:
+            csvfile.write('\n')
+        cached_event_file(csv_file_path, cache_dir)
+        assert os.path.getmtime(path) > decoded_at
+
+    def test_cached_event_file_without_events(self, data_dir):
+        csv_file_path = os.path.join(data_dir, '20250701_market-b_polymarket-market-events.csv')
+        _write_events(csv_file_path, 'market-b', 2, [])
+
+        path = cached_event_file(csv_file_path, os.path.join(data_dir, '.cache'))
+
+        event_file = EventFile(path)
+        assert len(event_file) == 0
+        assert event_file.asset_ids() == []
+
+    def test_default_parameters_match_backtest(self, data_dir, csv_file_path):
+        backtest = backtest_file(csv_file_path, latency_ms=0)
+
+        market_slug, skipped, events, errors, (result,) = sweep_file(
+            csv_file_path, cached_event_file(csv_file_path, os.path.join(data_dir, '.cache')), [ArbParameters()], latency_ms=0
+        )
+
+        assert (market_slug, skipped, errors) == ('market-a', None, 0)
+        assert events == backtest.events
+        assert result.opportunities == backtest.opportunities
+        assert result.pnl == pytest.approx(backtest.pnl)
+        assert result.fills == backtest.fills
+
+    def test_cache_is_kept_next_to_the_files_by_default(self, data_dir, csv_file_path):
+        path = cached_event_file(csv_file_path)
+
+        assert os.path.dirname(path) == os.path.join(data_dir, '.cache')
+
+    def test_failed_message_groups_are_counted(self, data_dir, csv_file_path):
+        calls = []
+
+        def fail_first(book_store, messages):
+            calls.append(messages)
+            if len(calls) == 1:
+                raise ValueError("bad message")
+            return parse_market_events(book_store, messages)
+
+        with patch('src.sweep.parse_market_events', side_effect=fail_first):
+            market_slug, skipped, events, errors, (result,) = sweep_file(csv_file_path, cached_event_file(csv_file_path), [ArbParameters()])
+
+        assert (market_slug, skipped, errors) == ('market-a', None, 1)
+        assert len(calls) > 1
+
+    def test_run_sweep(self, data_dir):
+        parameters = parameter_grid([0.0, 0.04], [0.5, 1.0], [None])
+
+        report = run_sweep(find_event_files('20250701', data_dir), parameters, os.path.join(data_dir, '.cache'), max_workers=2)
+
+        assert report.markets == ['market-a']
+        assert report.skipped == {'market-c': "no market ID"}
+        assert [(result.parameters, result.opportunities) for result in report.results] == [
+            (parameters[0], 2), (parameters[1], 2), (parameters[2], 1), (parameters[3], 1)
+        ]
+        assert report.results[1].pnl == pytest.approx(2 * report.results[0].pnl)
+        assert report.ranked()[0].parameters == ArbParameters(0.0, 1.0, None)
@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime
+from src.utils.clock import Clock, WallClock, VirtualClock, set_clock, get_clock
+from src.models import SyntheticOrderBook, SyntheticOrder, OrderSide
+from src.strategies import calculate_orders
+
+
+class TestClock:
+    @pytest.fixture(autouse=True)
+    def reset_clock(self):
+        yield
+        set_clock(None)
+
+    def test_wall_clock_by_default(self):
+        assert isinstance(get_clock(), WallClock)
+        assert abs(get_clock().timestamp() - datetime.now().timestamp() * 1000) < 1000
+
+    def test_virtual_clock_only_moves_forward(self):
+        clock = VirtualClock(1751328000000)
+
+        clock.advance_to(1751328005000)
+        clock.advance_to(1751328001000)
+
+        assert clock.timestamp() == 1751328005000
+        assert clock.now() == datetime.fromtimestamp(1751328005)
+
+    def test_clock_needs_now(self):
+        class NoNow(Clock):
+            pass
+
+        with pytest.raises(TypeError):
+            NoNow()
+
+    def test_set_clock_none_goes_back_to_wall_time(self):
+        set_clock(VirtualClock())
+        set_clock(None)
+
+        assert isinstance(get_clock(), WallClock)
+
+    def test_strategies_stamp_orders_with_the_clock(self):
+        book_a = SyntheticOrderBook("test-market", 123, "YES", "asset-yes", 0)
+        book_b = SyntheticOrderBook("test-market", 123, "NO", "asset-no", 0)
+        book_a.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=0.45, size=10)])
+        book_b.replace_entries([SyntheticOrder(side=OrderSide.SELL, price=0.50, size=10)])
+        set_clock(VirtualClock(1751328000000))
+
+        orders = calculate_orders(book_a, book_b)
+
+        assert [order.timestamp for order in orders] == [1751328000000, 1751328000000]
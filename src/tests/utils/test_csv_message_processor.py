@@ -2,8 +2,10 @@ import pytest
 import os
 import tempfile
 import csv
+import gzip
 from unittest.mock import Mock, patch
 from src.utils.csv_message_processor import CSVMessageProcessor
+from src.utils.clock import VirtualClock
 
 
 class TestCSVMessageProcessor:
@@ -214,4 +216,143 @@ class TestCSVMessageProcessor:
             # Should only process the valid row
             assert mock_handler.call_count == 1
         finally:
-            os.unlink(csv_file)
\ No newline at end of file
+            os.unlink(csv_file)
+
+    def test_run_reads_gzip_file(self):
+        """Test that a gzip compressed CSV is read transparently."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.5', 'size': '100', 'side': 'ask'},
+        ]
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv.gz')
+        temp_file.close()
+        with gzip.open(temp_file.name, 'wt', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        try:
+            mock_handler = Mock()
+            CSVMessageProcessor(temp_file.name, [mock_handler]).run()
+
+            assert mock_handler.call_count == 1
+            assert mock_handler.call_args[0][0][0]['asks'] == [{'price': '0.5', 'size': '100.0'}]
+        finally:
+            os.unlink(temp_file.name)
+
+    def test_stream_message_groups_matches_load(self):
+        """Test that streaming yields the same groups as loading, including slightly out of order rows."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803262060', 'event_type': 'price_change', 'price': '0.6', 'size': '10', 'side': 'ask'},
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': '0.4', 'size': '200', 'side': 'bid'},
+            {'timestamp': '1750803262055', 'event_type': 'price_change', 'price': '0.45', 'size': '20', 'side': 'bid'},
+            {'timestamp': '1750803265000', 'event_type': 'price_change', 'price': '0.7', 'size': '30', 'side': 'ask'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            processor = CSVMessageProcessor(csv_file, [], reorder_window_ms=100)
+
+            streamed = list(processor.stream_message_groups())
+
+            assert streamed == processor.load_and_group_messages()
+            assert [len(group) for group in streamed] == [2, 1, 1, 1]
+            assert [group[0]['timestamp'] for group in streamed] == [1750803262050, 1750803262055, 1750803262060, 1750803265000]
+        finally:
+            os.unlink(csv_file)
+
+    def test_stream_message_groups_is_lazy(self):
+        """Test that a group is yielded once a row beyond the reorder window is read, not at the end of the file."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803263050', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            processor = CSVMessageProcessor(csv_file, [], reorder_window_ms=100)
+
+            with patch('src.utils.csv_message_processor.logger') as mock_logger:
+                groups = processor.stream_message_groups()
+                first = next(groups)
+                # The row with no timestamp after it has not been read yet
+                mock_logger.warning.assert_not_called()
+
+            assert first[0]['timestamp'] == 1750803262050
+            assert len(list(groups)) == 1
+        finally:
+            os.unlink(csv_file)
+
+    def test_stream_message_groups_late_rows(self):
+        """Test that rows later than the reorder window are yielded as their own group."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803263050', 'event_type': 'book', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': '0.4', 'size': '200', 'side': 'bid'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            processor = CSVMessageProcessor(csv_file, [], reorder_window_ms=100)
+
+            streamed = list(processor.stream_message_groups())
+
+            assert [group[0]['timestamp'] for group in streamed] == [1750803262050, 1750803262050, 1750803263050]
+            assert [group[0]['side'] for group in streamed] == ['ask', 'bid', 'ask']
+        finally:
+            os.unlink(csv_file)
+
+    def test_run_streaming(self):
+        """Test that run in streaming mode calls handlers once per group."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.4', 'size': '200', 'side': 'bid'},
+            {'timestamp': '1750803262060', 'event_type': 'price_change', 'asset_id': '123', 'hash': 'def', 'price': '0.6', 'size': '10', 'side': 'ask'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            mock_handler = Mock()
+            CSVMessageProcessor(csv_file, [mock_handler], streaming=True).run()
+
+            assert mock_handler.call_count == 2
+            assert mock_handler.call_args_list[0][0][0][0]['event_type'] == 'book'
+            assert mock_handler.call_args_list[1][0][0][0]['changes'][0]['side'] == 'SELL'
+        finally:
+            os.unlink(csv_file)
+
+    def test_stream_message_groups_skips_malformed_rows(self):
+        """Test that a malformed row is skipped rather than ending the stream."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'price': 'book', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803262060', 'event_type': 'book', 'price': '0.4', 'size': '200', 'side': 'bid'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            streamed = list(CSVMessageProcessor(csv_file, []).stream_message_groups())
+
+            assert [group[0]['timestamp'] for group in streamed] == [1750803262060]
+        finally:
+            os.unlink(csv_file)
+
+    def test_run_advances_clock(self):
+        """Test that run advances a virtual clock to each group's timestamp before calling handlers."""
+        rows = [
+            {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.5', 'size': '100', 'side': 'ask'},
+            {'timestamp': '1750803262060', 'event_type': 'price_change', 'asset_id': '123', 'hash': 'def', 'price': '0.6', 'size': '10', 'side': 'ask'},
+        ]
+        csv_file = self.create_test_csv(rows)
+
+        try:
+            clock = VirtualClock()
+            seen = []
+            processor = CSVMessageProcessor(csv_file, [lambda messages: seen.append(clock.timestamp())], streaming=True, clock=clock)
+
+            assert processor.first_timestamp() == 1750803262050
+            processor.run()
+
+            assert seen == [1750803262050, 1750803262060]
+        finally:
+            os.unlink(csv_file)
@@ -0,0 +1,107 @@
+import pytest
+import os
+import csv
+import tempfile
+import shutil
+from unittest.mock import patch
+from src.utils.csv_message_processor import CSVMessageProcessor
+from src.utils.message_cache import message_cache_path
+
+ROWS = [
+    {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.5', 'size': '100', 'side': 'ask'},
+    {'timestamp': '1750803262050', 'event_type': 'book', 'asset_id': '123', 'hash': 'abc', 'price': '0.4', 'size': '200', 'side': 'bid'},
+    {'timestamp': '1750803262060', 'event_type': 'price_change', 'asset_id': '123', 'hash': 'def', 'price': '0.6', 'size': '10', 'side': 'ask'},
+]
+
+
+def _without_hash(message_groups):
+    """Event files don't keep the hash, so cached messages carry an empty one"""
+    return [[{**message, 'hash': ''} for message in messages] for messages in message_groups]
+
+
+def _write_rows(path, rows):
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class TestMessageCache:
+    @pytest.fixture
+    def csv_file(self):
+        temp_dir = tempfile.mkdtemp()
+        csv_file = os.path.join(temp_dir, 'events.csv')
+        _write_rows(csv_file, ROWS)
+        yield csv_file
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _replay(self, csv_file, **kwargs):
+        return list(CSVMessageProcessor(csv_file, [], streaming=True, cache=True, **kwargs).websocket_message_groups())
+
+    def test_replays_from_cache(self, csv_file):
+        uncached = list(CSVMessageProcessor(csv_file, [], streaming=True).websocket_message_groups())
+
+        first = self._replay(csv_file)
+        assert os.path.exists(message_cache_path(csv_file, 'streaming:1000'))
+
+        with patch('src.utils.csv_message_processor.iter_csv_rows') as mock_iter_csv_rows:
+            second = self._replay(csv_file)
+            mock_iter_csv_rows.assert_not_called()
+
+        assert first == uncached
+        assert second == _without_hash(uncached)
+        assert len(second) == 2
+
+    def test_handlers_do_not_modify_cache(self, csv_file):
+        for messages in CSVMessageProcessor(csv_file, [], streaming=True, cache=True).websocket_message_groups():
+            messages[0]['market'] = 'market-a'
+
+        assert 'market' not in self._replay(csv_file)[0][0]
+
+    def test_invalidated_when_file_changes(self, csv_file):
+        self._replay(csv_file)
+
+        _write_rows(csv_file, ROWS[:1])
+
+        assert len(self._replay(csv_file)) == 1
+
+    def test_kept_when_file_is_only_touched(self, csv_file):
+        self._replay(csv_file)
+        stat = os.stat(csv_file)
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch('src.utils.csv_message_processor.iter_csv_rows') as mock_iter_csv_rows:
+            assert len(self._replay(csv_file)) == 2
+            mock_iter_csv_rows.assert_not_called()
+
+    def test_keyed_by_grouping(self, csv_file):
+        self._replay(csv_file)
+
+        with patch('src.utils.csv_message_processor.iter_csv_rows', wraps=lambda path: iter([])) as mock_iter_csv_rows:
+            self._replay(csv_file, reorder_window_ms=10)
+            mock_iter_csv_rows.assert_called_once()
+
+    def test_partial_replay_leaves_no_cache(self, csv_file):
+        messages = CSVMessageProcessor(csv_file, [], streaming=True, cache=True).websocket_message_groups()
+        next(messages)
+        messages.close()
+
+        assert os.listdir(os.path.dirname(message_cache_path(csv_file, 'streaming:1000'))) == []
+
+    def test_run_from_cache(self, csv_file):
+        self._replay(csv_file)
+        seen = []
+
+        CSVMessageProcessor(csv_file, [seen.append], streaming=True, cache=True).run()
+
+        assert [messages[0]['event_type'] for messages in seen] == ['book', 'price_change']
+
+    def test_sweeps_share_the_cache(self, csv_file):
+        self._replay(csv_file)
+        processor = CSVMessageProcessor(csv_file, [], streaming=True)
+
+        with patch('src.utils.csv_message_processor.iter_csv_rows') as mock_iter_csv_rows:
+            path = processor.cached_event_file()
+            mock_iter_csv_rows.assert_not_called()
+
+        assert path == message_cache_path(csv_file, 'streaming:1000')
@@ -1,4 +1,5 @@
 from .datetime_utils import datetime_to_epoch
 from .csv_message_processor import CSVMessageProcessor
+from .clock import Clock, WallClock, VirtualClock, set_clock, get_clock
 
-__all__ = ['datetime_to_epoch', 'CSVMessageProcessor']
+__all__ = ['datetime_to_epoch', 'CSVMessageProcessor', 'Clock', 'WallClock', 'VirtualClock', 'set_clock', 'get_clock']
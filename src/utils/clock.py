@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+from .datetime_utils import datetime_to_epoch
+
+
+class Clock(ABC):
+    """
+    Where strategies, DAOs and book creation get the current time from, so
+    a replay can run them on recorded event time instead of wall time.
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        pass
+
+    def timestamp(self) -> int:
+        """Epoch time in milliseconds"""
+        return datetime_to_epoch(self.now())
+
+
+class WallClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class VirtualClock(Clock):
+    """
+    A clock that only moves when told to: replays advance it to the
+    timestamp of each event before handling it, so everything stamped
+    during the replay carries event time however fast the replay runs.
+    It never moves backwards.
+    """
+
+    def __init__(self, timestamp: int = 0):
+        self._timestamp = timestamp
+
+    def advance_to(self, timestamp: int):
+        if timestamp > self._timestamp:
+            self._timestamp = timestamp
+
+    def timestamp(self) -> int:
+        return self._timestamp
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._timestamp / 1000)
+
+
+_clock: Clock = WallClock()
+
+
+def set_clock(clock: Optional[Clock]):
+    """Makes `clock` the time source for everything, or goes back to wall time with None"""
+    global _clock
+    _clock = clock if clock is not None else WallClock()
+
+
+def get_clock() -> Clock:
+    return _clock
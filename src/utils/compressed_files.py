@@ -0,0 +1,119 @@
+import csv
+import glob
+import gzip
+import json
+import os
+import re
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def open_text(path: str, mode: str = 'rt') -> IO:
+    """Opens a plain, .gz or .zst file as text"""
+    if path.endswith(EXTENSIONS['gzip']):
+        return gzip.open(path, mode, newline='')
+    if path.endswith(EXTENSIONS['zstd']):
+        if zstandard is None:
+            raise ImportError(f"Reading {path} requires zstandard: pip install zstandard")
+        return zstandard.open(path, mode, newline='')
+    return open(path, mode.replace('t', ''), newline='')
+
+
+def segment_path(csv_filename: str, number: int, compression: str) -> str:
+    """
+    Segment `number` of a rotated file, e.g. segment 3 of
+    data/20250701_slug_orders.csv is data/20250701_slug_orders.00003.csv.gz
+    """
+    stem, extension = os.path.splitext(csv_filename)
+    return f"{stem}.{number:05d}{extension}{EXTENSIONS[compression]}"
+
+
+def index_path(csv_filename: str) -> str:
+    """Index of the time range covered by each closed segment of a rotated file"""
+    return f"{os.path.splitext(csv_filename)[0]}.segments.jsonl"
+
+
+_SEGMENT_NUMBER = re.compile(r'\.(\d{5})\.[^.]+(\.gz|\.zst)?$')
+
+
+def segment_number(path: str) -> int:
+    return int(_SEGMENT_NUMBER.search(os.path.basename(path)).group(1))
+
+
+def segment_paths(csv_filename: str) -> List[str]:
+    """
+    Files holding the rows of `csv_filename`, in order: the file itself if
+    it exists, followed by its rotated segments.
+    """
+    stem, extension = os.path.splitext(csv_filename)
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r'\.\d{5}' + re.escape(extension) + r'(\.gz|\.zst)?$')
+    candidates = glob.glob(f"{glob.escape(stem)}.*{extension}*")
+    segments = sorted((path for path in candidates if pattern.match(os.path.basename(path))), key=segment_number)
+
+    return ([csv_filename] if os.path.exists(csv_filename) else []) + segments
+
+
+def read_segment_index(csv_filename: str) -> List[Dict[str, Any]]:
+    path = index_path(csv_filename)
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'r') as index_file:
+        return [json.loads(line) for line in index_file if line.strip()]
+
+
+def find_segments(csv_filename: str, start: Optional[int] = None, end: Optional[int] = None) -> List[str]:
+    """
+    Segments of a rotated file that may hold rows timestamped between start
+    and end. Segments missing from the index (e.g. the one still being
+    written) are always included.
+    """
+    indexed = {entry['segment']: entry for entry in read_segment_index(csv_filename)}
+
+    paths = []
+    for path in segment_paths(csv_filename):
+        entry = indexed.get(os.path.basename(path))
+        if entry is not None and entry['first_timestamp'] is not None:
+            if start is not None and entry['last_timestamp'] < start:
+                continue
+            if end is not None and entry['first_timestamp'] > end:
+                continue
+        paths.append(path)
+
+    return paths
+
+
+def read_csv_fieldnames(csv_filename: str, **reader_kwargs) -> Optional[List[str]]:
+    paths = segment_paths(csv_filename)
+    if not paths:
+        return None
+
+    with open_text(paths[0]) as csvfile:
+        return csv.DictReader(csvfile, **reader_kwargs).fieldnames
+
+
+def iter_csv_rows(csv_filename: str, paths: Optional[List[str]] = None, **reader_kwargs) -> Iterator[Dict[str, str]]:
+    """
+    Streams the rows of a plain, compressed or rotated CSV file. Each
+    segment has its own header. A segment that is still being written may
+    end mid-stream; its rows are read up to the last complete flush.
+    """
+    for path in paths if paths is not None else segment_paths(csv_filename):
+        with open_text(path) as csvfile:
+            try:
+                yield from csv.DictReader(csvfile, **reader_kwargs)
+            except EOFError:
+                logger.info(f"{path} ends before its end of stream marker, it may still be open")
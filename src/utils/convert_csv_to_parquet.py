@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script to convert the CSV files in data/ into the partitioned Parquet store.
+
+Every market-events, synthetic-order-book, orders and metadata CSV is written
+to <output-dir>/<dataset>/date=<YYYYMMDD>/market_slug=<slug>/ and can then be
+read with daos.parquet_store.read_dataset. The CSV files are left in place.
+"""
+
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Add src to path to import daos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from daos.parquet_store import convert_csv, parse_csv_filename, PARQUET_ROOT
+
+
+def convert_directory(data_dir: str, output_dir: str) -> int:
+    """Converts every market data CSV in data_dir, returning the number converted."""
+    converted = 0
+    for csv_path in sorted(Path(data_dir).glob('*.csv')):
+        try:
+            parse_csv_filename(str(csv_path))
+        except ValueError:
+            logger.info(f"Skipping {csv_path.name}")
+            continue
+
+        try:
+            path = convert_csv(str(csv_path), root=output_dir)
+            logger.info(f"Converted {csv_path.name} -> {path}")
+            converted += 1
+        except Exception as e:
+            logger.error(f"Failed to convert {csv_path.name}: {e}")
+
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert market data CSV files to Parquet")
+    parser.add_argument(
+        "--data-dir",
+        default="data",
+        help="Path to data directory (default: data)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=PARQUET_ROOT,
+        help=f"Root of the Parquet store (default: {PARQUET_ROOT})"
+    )
+
+    args = parser.parse_args()
+
+    converted = convert_directory(args.data_dir, args.output_dir)
+    logger.info(f"Converted {converted} files into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
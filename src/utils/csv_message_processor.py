@@ -1,9 +1,13 @@
 import csv
+import heapq
 import json
 import os
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 from datetime import datetime
 import logging
+from .compressed_files import segment_paths, read_csv_fieldnames, iter_csv_rows
+from .clock import VirtualClock
+from .message_cache import MessageCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,36 +16,64 @@ class CSVMessageProcessor:
     """
     Processes CSV files containing historical market events and replays them
     to simulate real-time websocket message flow.
+
+    The file may be gzip or zstd compressed, or rotated into compressed
+    segments by RotatingCompressedWriter, in which case the original .csv
+    path is given.
+
+    With streaming=True the file is read incrementally and message groups
+    are handed to the handlers as soon as they are complete, so memory
+    stays constant however large the file is; see stream_message_groups().
+
+    Given a VirtualClock, run() advances it to each group's timestamp before
+    handing the group to the handlers.
+
+    With cache=True the message groups are decoded into a MessageCache
+    next to the file on the first replay, and later replays of the
+    unchanged file read them from there; see websocket_message_groups().
     """
     
-    def __init__(self, csv_file_path: str, event_handlers: List[Callable[[List[Dict[str, Any]]], None]]):
+    def __init__(self,
+                 csv_file_path: str,
+                 event_handlers: List[Callable[[List[Dict[str, Any]]], None]],
+                 streaming: bool = False,
+                 reorder_window_ms: int = 1000,
+                 clock: Optional[VirtualClock] = None,
+                 cache: bool = False):
         """
         Initialize CSV processor.
         
         Args:
             csv_file_path: Path to the CSV file containing market events
             event_handlers: List of callback functions to process messages
+            streaming: Stream message groups instead of loading the whole file first
+            reorder_window_ms: How far behind the latest timestamp a row may arrive when streaming
+            clock: Clock to advance to the timestamp of each message group as it is replayed
+            cache: Replay from, or save to, the message cache next to the file
         """
         self.csv_file_path = csv_file_path
         self.event_handlers = event_handlers
+        self.streaming = streaming
+        self.reorder_window_ms = reorder_window_ms
+        self.clock = clock
+        self.cache = cache
         self.validate_csv_file()
     
     def validate_csv_file(self) -> None:
         """Validate that CSV file exists and has required columns."""
-        if not os.path.exists(self.csv_file_path):
+        if not segment_paths(self.csv_file_path):
             raise FileNotFoundError(f"CSV file not found: {self.csv_file_path}")
         
         required_columns = {'timestamp', 'event_type'}
         
         try:
-            with open(self.csv_file_path, 'r') as file:
-                reader = csv.DictReader(file)
-                if not reader.fieldnames:
-                    raise ValueError("CSV file is empty or has no headers")
-                
-                missing_columns = required_columns - set(reader.fieldnames)
-                if missing_columns:
-                    raise ValueError(f"CSV file missing required columns: {missing_columns}")
+            fieldnames = read_csv_fieldnames(self.csv_file_path)
+            if not fieldnames:
+                raise ValueError("CSV file is empty or has no headers")
+
+            missing_columns = required_columns - set(fieldnames)
+            if missing_columns:
+                raise ValueError(f"CSV file missing required columns: {missing_columns}")
                     
         except Exception as e:
             raise ValueError(f"Invalid CSV file format: {e}")
@@ -56,12 +88,10 @@ class CSVMessageProcessor:
         messages = []
         
         try:
-            with open(self.csv_file_path, 'r') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Convert string values to appropriate types
-                    processed_row = self._process_csv_row(row)
-                    messages.append(processed_row)
+            for row in iter_csv_rows(self.csv_file_path):
+                # Convert string values to appropriate types
+                processed_row = self._process_csv_row(row)
+                messages.append(processed_row)
                     
         except Exception as e:
             logger.error(f"Error reading CSV file: {e}")
@@ -72,6 +102,114 @@ class CSVMessageProcessor:
         
         return grouped_messages
     
+    def stream_message_groups(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the same groups as load_and_group_messages, in the same order,
+        while only holding the groups within `reorder_window_ms` of the latest
+        timestamp read.
+
+        A group is complete once a row more than the window newer than it has
+        been read. Rows arriving later than that can no longer be merged into
+        their group and are yielded as a group of their own, with a warning.
+        Malformed rows are skipped rather than ending the stream.
+        """
+        # Open groups by key, and a heap of (timestamp, arrival, key) to emit them in order
+        groups: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        pending: List[Tuple[int, int, Tuple[int, str]]] = []
+        arrival = 0
+        latest: Optional[int] = None
+        late_rows = 0
+
+        for row in iter_csv_rows(self.csv_file_path):
+            try:
+                message = self._process_csv_row(row)
+            except ValueError:
+                # e.g. rows mangled by interleaved writes
+                logger.warning(f"Skipping malformed row: {row}")
+                continue
+
+            timestamp = message.get('timestamp')
+            event_type = message.get('event_type')
+
+            if timestamp is None or event_type is None:
+                logger.warning(f"Skipping message with missing timestamp or event_type: {message}")
+                continue
+
+            key = (timestamp, event_type)
+            if key in groups:
+                groups[key].append(message)
+            else:
+                if latest is not None and timestamp < latest - self.reorder_window_ms:
+                    late_rows += 1
+                groups[key] = [message]
+                heapq.heappush(pending, (timestamp, arrival, key))
+                arrival += 1
+
+            if latest is None or timestamp > latest:
+                latest = timestamp
+
+            while pending and pending[0][0] < latest - self.reorder_window_ms:
+                _, _, key = heapq.heappop(pending)
+                yield groups.pop(key)
+
+        while pending:
+            _, _, key = heapq.heappop(pending)
+            yield groups.pop(key)
+
+        if late_rows:
+            logger.warning(f"{late_rows} message groups arrived more than {self.reorder_window_ms}ms out of order")
+
+    def websocket_message_groups(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the reconstructed websocket messages of each message group,
+        in replay order, streamed or loaded as configured. With caching on,
+        they come from the message cache when it is current for the file,
+        without parsing it, and are saved to it otherwise.
+        """
+        message_cache = None
+        if self.cache:
+            message_cache = MessageCache(self.csv_file_path, self.grouping)
+            cached = message_cache.load()
+            if cached is not None:
+                logger.info(f"Replaying cached messages from {message_cache.path}")
+                return cached
+
+        grouped_messages = self._message_groups()
+        if message_cache is not None:
+            grouped_messages = message_cache.save(grouped_messages)
+        return (self.reconstruct_websocket_messages(group) for group in grouped_messages)
+
+    @property
+    def grouping(self) -> str:
+        """How rows are grouped into messages, which keys the message cache"""
+        return f"streaming:{self.reorder_window_ms}" if self.streaming else "sorted"
+
+    def cached_event_file(self, cache_dir: Optional[str] = None) -> str:
+        """
+        Path of the message cache of the file, an event file, decoding the
+        file into it first unless it is current. Kept next to the file, or
+        in cache_dir when given.
+        """
+        message_cache = MessageCache(self.csv_file_path, self.grouping, cache_dir)
+        if not message_cache.is_current():
+            for _ in message_cache.save(self._message_groups()):
+                pass
+        return message_cache.path
+
+    def _message_groups(self):
+        if self.streaming:
+            return self.stream_message_groups()
+
+        grouped_messages = self.load_and_group_messages()
+        logger.info(f"Loaded {len(grouped_messages)} message groups from CSV")
+        return grouped_messages
+
+    def first_timestamp(self) -> Optional[int]:
+        """Timestamp of the first message group, reading no further than it"""
+        for group in self.stream_message_groups():
+            return group[0]['timestamp']
+        return None
+
     def _process_csv_row(self, row: Dict[str, str]) -> Dict[str, Any]:
         """Process a single CSV row and convert types."""
         processed_row = {}
@@ -191,14 +329,11 @@ class CSVMessageProcessor:
         logger.info(f"Starting CSV message processing from {self.csv_file_path}")
         
         try:
-            grouped_messages = self.load_and_group_messages()
-            logger.info(f"Loaded {len(grouped_messages)} message groups from CSV")
-            
             # Process each group sequentially
-            for i, message_group in enumerate(grouped_messages):
+            for i, websocket_messages in enumerate(self.websocket_message_groups()):
                 try:
-                    # Reconstruct websocket messages format (List[Dict])
-                    websocket_messages = self.reconstruct_websocket_messages(message_group)
+                    if self.clock is not None:
+                        self.clock.advance_to(websocket_messages[0]['timestamp'])
                     
                     # Send to all event handlers (same as websocket service)
                     for handler in self.event_handlers:
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import logging
+from .compressed_files import segment_paths
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the cached format changes
+CACHE_VERSION = 2
+CACHE_DIR = '.cache'
+
+# Rows are written to the event file in batches of this many
+_BATCH_ROWS = 10_000
+
+
+def message_cache_path(csv_file_path: str, grouping: str, cache_dir: Optional[str] = None) -> str:
+    """
+    data/<name>.csv -> data/.cache/<name>.<grouping>.events.bin, or under
+    cache_dir when given
+    """
+    directory, filename = os.path.split(csv_file_path)
+    if cache_dir is None:
+        cache_dir = os.path.join(directory, CACHE_DIR)
+    return os.path.join(cache_dir, f"{os.path.splitext(filename)[0]}.{grouping.replace(':', '-')}.events.bin")
+
+
+def sources_path(path: str) -> str:
+    """What a cached event file was decoded from, to tell when it is stale"""
+    return f"{os.path.splitext(path)[0]}.sources.json"
+
+
+class MessageCache:
+    """
+    The message groups of a market events file, decoded once into a binary
+    event file (see daos.event_file) in a .cache directory next to it, so
+    later replays memory-map them instead of parsing and regrouping the CSV.
+    Sweeps read the same files directly.
+
+    Next to the event file, a JSON file records the name, size and
+    modification time of every file holding the source's rows, and a digest
+    of their contents. A source whose size differs is stale. One only
+    touched since keeps its cache as long as its digest matches. `grouping`
+    tells apart caches of the same file grouped differently, e.g. with
+    another reorder window.
+
+    Event files don't keep the event hash, so cached messages carry an
+    empty one.
+    """
+
+    def __init__(self, csv_file_path: str, grouping: str, cache_dir: Optional[str] = None):
+        self.csv_file_path = csv_file_path
+        self.grouping = grouping
+        self.path = message_cache_path(csv_file_path, grouping, cache_dir)
+
+    def is_current(self) -> bool:
+        """Whether the cache was decoded from the source as it is now"""
+        try:
+            with open(sources_path(self.path), 'r') as sources_file:
+                recorded = json.load(sources_file)
+        except (OSError, ValueError):
+            return False
+        if not os.path.exists(self.path):
+            return False
+
+        if recorded.get('version') != CACHE_VERSION or recorded.get('grouping') != self.grouping:
+            return False
+
+        sources = self._sources()
+        if [source[:2] for source in sources] != [source[:2] for source in recorded['sources']]:
+            return False
+        if sources == recorded['sources']:
+            return True
+
+        if self._digest() != recorded['digest']:
+            return False
+        # Only touched: recorded as is now, so the next check needn't read it again
+        self._write_sources(sources_path(self.path), {**recorded, 'sources': sources})
+        return True
+
+    def load(self) -> Optional[Iterator[List[Dict[str, Any]]]]:
+        """The cached websocket messages of each group, or None when there are none for the source as it is now"""
+        # Imported here, as the DAOs import utils
+        from src.daos.event_file import EventFile
+
+        if not self.is_current():
+            return None
+
+        try:
+            return EventFile(self.path).messages()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable message cache {self.path}: {e}")
+            return None
+
+    def save(self, row_groups: Iterable[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Passes the groups of CSV rows through, writing them to the event file
+        as they go. The cache only replaces an older one once every group has
+        been read, so a replay stopped early leaves no partial cache behind.
+        """
+        from src.daos.event_file import EventFileWriter, assets_path, is_event_row
+
+        # Taken before reading, so a file still being appended to reads as changed next time
+        recorded = {'version': CACHE_VERSION, 'grouping': self.grouping, 'sources': self._sources(), 'digest': self._digest()}
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            writer = EventFileWriter(flush_interval=60)
+            writer.create(temp_path)
+        except OSError as e:
+            logger.warning(f"Not caching messages of {self.csv_file_path}: {e}")
+            yield from row_groups
+            return
+
+        complete = False
+        batch = []
+        try:
+            for rows in row_groups:
+                # Rows that aren't book or price change events can't be replayed from an event file
+                batch.extend(row for row in rows if is_event_row(row))
+                if len(batch) >= _BATCH_ROWS:
+                    writer.write_to(temp_path, batch)
+                    batch = []
+                yield rows
+            if batch:
+                writer.write_to(temp_path, batch)
+            complete = True
+        finally:
+            writer.close()
+            temp_paths = [temp_path, assets_path(temp_path)]
+            if complete:
+                os.replace(assets_path(temp_path), assets_path(self.path))
+                os.replace(temp_path, self.path)
+                self._write_sources(sources_path(self.path), recorded)
+            else:
+                for path in temp_paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def _sources(self) -> List[List[Any]]:
+        """[name, size, modification time] of every file holding the source's rows"""
+        sources = []
+        for path in segment_paths(self.csv_file_path):
+            stat = os.stat(path)
+            sources.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+        return sources
+
+    def _digest(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for path in segment_paths(self.csv_file_path):
+            with open(path, 'rb') as source_file:
+                for chunk in iter(lambda: source_file.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _write_sources(path: str, recorded: Dict[str, Any]):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as sources_file:
+            json.dump(recorded, sources_file)
+        os.replace(temp_path, path)
+